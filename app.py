@@ -14,8 +14,12 @@ from flask import Flask, render_template, jsonify, request, send_from_directory
 import config
 from src.game.monopoly import MonopolyGame
 from src.game.contexte import Contexte
+from src.game.context_history import ContextHistory
 from src.game.listeners import MonopolyListeners
+from src.game.polling_policy import PollingPolicy
 from src.core.game_loader import GameLoader
+from src.core.dme_session import DmeSession
+from src.core.memory_reader import MemoryReader
 from services.event_bus import EventBus, EventTypes
 from services.auto_start_manager import AutoStartManager
 from services.health_check_service import HealthCheckService
@@ -42,6 +46,8 @@ app.register_blueprint(create_popup_blueprint(
 # Variables globales pour le jeu
 game = None
 contexte = None
+# Historique indexé du journal du contexte (voir get_context_history)
+context_history = None
 dolphin_process = None
 terminal_output = []
 terminal_lock = threading.Lock()
@@ -71,9 +77,7 @@ def check_and_init_game():
             print("🔄 Tentative d'initialisation du contexte...")
             # Tenter de se connecter à Dolphin Memory Engine
             try:
-                import dolphin_memory_engine as dme
-                dme.hook()
-                if dme.is_hooked():
+                if DmeSession.for_backend(MemoryReader.get_backend()).connect():
                     print("✅ Connecté à Dolphin Memory Engine")
                     # Initialiser le jeu
                     game, contexte = initialize_game()
@@ -119,6 +123,16 @@ def check_dolphin_status():
                 except:
                     pass
 
+def publish_dolphin_state(state, info):
+    """Publie les changements d'état de la connexion à Dolphin (DmeSession) sur l'EventBus"""
+    event_type = {
+        DmeSession.CONNECTED: EventTypes.DOLPHIN_CONNECTED,
+        DmeSession.DISCONNECTED: EventTypes.DOLPHIN_DISCONNECTED,
+        DmeSession.RECONNECTING: EventTypes.DOLPHIN_RECONNECTING,
+    }.get(state)
+    if event_type:
+        event_bus.publish(event_type, info, source='dme_session')
+
 def initialize_game():
     """Initialise le jeu Monopoly et le contexte en utilisant le code existant dans main.py"""
     global game, contexte
@@ -151,8 +165,13 @@ def initialize_game():
         
         # Créer les listeners
         events = MonopolyListeners(game)
-        events.tps = 30
         events.interval_player = .1
+        # Fréquences adaptées à la phase de jeu (section "polling" de monitor_config.json)
+        PollingPolicy.load(os.path.join(config.WORKSPACE_DIR, "monitor_config.json")).attach(events)
+        # Callbacks (Contexte, sauvegardes JSON) exécutés hors du thread de lecture de la RAM
+        events.start_dispatcher()
+        # Rafales de changements (lancer de dés) traitées et sauvegardées en un seul lot
+        events.start_coalescing(0.1, MonopolyListeners.COALESCED_EVENTS)
         
         # Enregistrer les callbacks depuis main.py
         events.on("player_added", main_module.on_player_added)
@@ -201,6 +220,13 @@ def initialize_game():
         
         # Initialiser le contexte
         contexte = Contexte(game, events)
+        
+        # États de la connexion à Dolphin sur l'EventBus (une seule fois par session)
+        try:
+            game.session.off("*", publish_dolphin_state)
+        except ValueError:
+            pass
+        game.session.on("*", publish_dolphin_state)
         print("📊 Contexte initialisé et prêt à enregistrer les événements")
         
         # Démarrer les listeners pour capturer les événements
@@ -302,7 +328,7 @@ def get_context():
     try:
         # Si on a un contexte valide, le retourner directement
         if contexte and hasattr(contexte, 'context'):
-            return jsonify(contexte.context)
+            return jsonify(contexte.snapshot())
         
         # Essayer de charger depuis le fichier si disponible
         context_path = os.path.join(config.CONTEXT_DIR, "game_context.json")
@@ -448,7 +474,7 @@ def manage_players():
             # Mettre à jour le contexte
             if contexte is not None:
                 contexte._update_context()
-                contexte._save_context()
+                contexte._save_context_later()
             
             return jsonify({'success': True})
         except Exception as e:
@@ -511,7 +537,7 @@ def update_player_money():
         # Mettre à jour le contexte si disponible
         if contexte is not None:
             contexte._update_context()
-            contexte._save_context()
+            contexte._save_context_later()
 
         return jsonify({'success': True, 'id': player_identifier, 'money': new_money})
 
@@ -735,6 +761,106 @@ def manage_config():
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
+@app.route('/api/listeners/intervals', methods=['GET', 'POST'])
+def manage_listener_intervals():
+    """Intervalles (secondes) des handlers des listeners, modifiables pendant la partie"""
+    if contexte is None:
+        return jsonify({"error": "Le jeu n'est pas initialisé"}), 503
+    listeners = contexte.listeners
+    
+    if request.method == 'POST':
+        data = request.json or {}
+        try:
+            for name, interval in data.items():
+                listeners.set_interval(name, float(interval))
+        except KeyError as e:
+            return jsonify({"error": f"Handler inconnu: {e.args[0]}"}), 404
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": str(e)}), 400
+    
+    return jsonify({
+        'intervals': listeners.intervals,
+        'stats': listeners.scheduler_stats(),
+        'dispatch': listeners.dispatch_stats()
+    })
+
+@app.route('/api/listeners/stats')
+def get_listener_stats():
+    """Instrumentation des listeners : durées, lectures dme, délais de détection, dépassements"""
+    if contexte is None:
+        return jsonify({"error": "Le jeu n'est pas initialisé"}), 503
+    return jsonify(contexte.listeners.stats())
+
+def get_context_history():
+    """Historique du journal du contexte, indexé au premier appel puis complété à chaque requête"""
+    global context_history
+    directory = contexte.journal.directory if contexte is not None else config.CONTEXT_JOURNAL_DIR
+    if context_history is None or context_history.directory != directory:
+        context_history = ContextHistory(directory)
+    context_history.refresh()
+    return context_history
+
+@app.route('/api/history')
+def get_history_summary():
+    """Nombre de lignes, période, parties (avec leurs tours) et types d'événements de l'historique du contexte"""
+    return jsonify(get_context_history().summary())
+
+@app.route('/api/history/state')
+def get_history_state():
+    """
+    Contexte à la fin d'un tour (?turn=) ou à un instant donné (?timestamp=, secondes epoch),
+    dans une partie (?game=, la dernière par défaut pour ?turn=)
+    """
+    history = get_context_history()
+    turn = request.args.get('turn', type=int)
+    timestamp = request.args.get('timestamp', type=float)
+    game = request.args.get('game')
+    entry = history.entry_at(turn, timestamp, game)
+    if entry is None:
+        return jsonify({"error": "Aucun état pour ce tour ou cet instant"}), 404
+    return jsonify({
+        'entry': entry.to_dict(),
+        'context': history.state_at(turn, timestamp, game)
+    })
+
+@app.route('/api/history/events')
+def get_history_events():
+    """
+    Lignes de l'historique par période (?start=&end=), type (?type=), joueur (?player=),
+    partie (?game=) et tours (?turn_from=&turn_to=)
+    """
+    events = get_context_history().events(
+        start=request.args.get('start', type=float),
+        end=request.args.get('end', type=float),
+        event_type=request.args.get('type'),
+        player=request.args.get('player'),
+        turn_from=request.args.get('turn_from', type=int),
+        turn_to=request.args.get('turn_to', type=int),
+        limit=request.args.get('limit', default=500, type=int),
+        game=request.args.get('game')
+    )
+    return jsonify({
+        'count': len(events),
+        'events': [entry.to_dict() for entry in events]
+    })
+
+@app.route('/api/history/import', methods=['POST'])
+def import_history():
+    """
+    Importe dans le journal l'ancien dossier d'historique (un JSON complet par événement) :
+    contexte/history ou l'un de ses sous-dossiers (?path= relatif)
+    """
+    data = request.json or {}
+    history_root = os.path.realpath(config.CONTEXT_HISTORY_DIR)
+    history_dir = os.path.realpath(os.path.join(history_root, str(data.get('path', ''))))
+    if os.path.commonpath([history_root, history_dir]) != history_root:
+        return jsonify({"error": "Le dossier doit être dans contexte/history"}), 403
+    if not os.path.isdir(history_dir):
+        return jsonify({"error": f"Dossier introuvable: {history_dir}"}), 404
+    history = get_context_history()
+    imported = history.import_history_directory(history_dir, contexte.journal if contexte is not None else None)
+    return jsonify({'imported': imported, 'entries': len(history)})
+
 @app.route('/api/dolphin/status')
 def get_dolphin_status():
     """Renvoie l'état actuel de Dolphin"""
@@ -1158,10 +1284,17 @@ def force_context_update():
                 'error': 'Contexte non initialisé',
                 'hint': 'Lancez d\'abord Dolphin via l\'interface'
             }), 400
+        
+        if game is not None and not game.session.connected:
+            return jsonify({
+                'success': False,
+                'error': 'Dolphin déconnecté, reconnexion en cours',
+                'dolphin': game.session.to_dict()
+            }), 503
             
         # Forcer la mise à jour
         contexte._update_context()
-        contexte._save_context()
+        contexte._save_context_later()
         
         # Afficher des infos de debug
         debug_info = {
@@ -1183,6 +1316,8 @@ def force_context_update():
                         'properties_count': len(player.properties)
                     })
                 except Exception as e:
+                    if DmeSession.is_disconnect_error(e):
+                        game.session.lost(e)
                     debug_info['players'].append({
                         'index': i,
                         'error': str(e)
@@ -1192,7 +1327,7 @@ def force_context_update():
             'success': True,
             'message': 'Contexte mis à jour',
             'debug': debug_info,
-            'context': contexte.context if contexte else None
+            'context': contexte.snapshot() if contexte else None
         })
     except Exception as e:
         return jsonify({
@@ -1222,16 +1357,20 @@ def update_context_periodically():
                 check_and_init_game()
                 continue
             
+            # Pendant une reconnexion à Dolphin, le dernier contexte est conservé
+            if game is not None and not game.session.connected:
+                continue
+            
             if contexte and hasattr(contexte, '_update_context'):
                 contexte._update_context()
-                contexte._save_context()
+                contexte._save_context_later()
                 
                 # Envoyer le contexte au serveur d'actions (port 8004)
                 if hasattr(contexte, 'context'):
                     try:
                         response = requests.post(
                             'http://localhost:8004/context',
-                            json=contexte.context,
+                            json=contexte.snapshot(),
                             timeout=1
                         )
                         # Log seulement la première fois
@@ -1250,7 +1389,7 @@ def run_app():
     """Démarre l'application Flask"""
     # Créer le dossier de contexte s'il n'existe pas
     os.makedirs(config.CONTEXT_DIR, exist_ok=True)
-    os.makedirs(config.CONTEXT_HISTORY_DIR, exist_ok=True)
+    os.makedirs(config.CONTEXT_JOURNAL_DIR, exist_ok=True)
     
     # Vérifier si Dolphin est déjà lancé et initialiser le jeu si possible
     check_and_init_game()
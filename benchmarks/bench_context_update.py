@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark hors ligne de Contexte._update_context : recalcul complet contre mise à jour incrémentale
+
+Une partie est rejouée sur un dump de RAM (voir bench_listener_pipeline.py pour
+l'enregistrer) : à chaque tick, avec une graine fixe, le joueur courant peut se
+déplacer, gagner ou perdre de l'argent, ou une maison est construite ; la plupart
+des ticks ne changent rien, comme les mises à jour périodiques de app.py. Les
+deux modes sont rejoués en parallèle et leurs contextes comparés à chaque tick.
+
+    python benchmarks/bench_context_update.py dumps/partie.raw [--ticks 500] [--seed 1]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from src.core.game_loader import GameLoader
+from src.core.memory_backend import DumpBackend
+from src.core.memory_reader import MemoryReader
+from src.core.property import Property
+from src.game.monopoly import MonopolyGame
+from src.game.listeners import MonopolyListeners
+
+
+def replay_step(game, rng):
+    """Applique au plus un changement de partie au dump"""
+    roll = rng.random()
+    if not game.players or roll < 0.7:
+        return
+    player = rng.choice(game.players)
+    if roll < 0.85:
+        player.position = (player.position + rng.randint(2, 12)) % 40
+    elif roll < 0.95:
+        player.money = max(0, player.money + rng.choice((-200, -50, 100, 200)))
+    else:
+        address = rng.choice(list(Property.house_addresses().values()))
+        MemoryReader.set_byte(address, (MemoryReader.get_byte(address) + 1) % 6)
+
+
+def run(args):
+    """Rejoue la partie avec deux contextes en parallèle (complet, incrémental) et vérifie qu'ils restent égaux"""
+    from src.game.contexte import Contexte
+
+    backend = DumpBackend(os.path.abspath(args.dump), args.mem2 and os.path.abspath(args.mem2))
+    data = GameLoader(os.path.join(ROOT, "game_files", "starting_state.jsonc"), None)
+    game = MonopolyGame(data, backend)
+    rng = random.Random(args.seed)
+    contextes = {}
+    elapsed = {}
+    # Les traces de débogage de Contexte faussent les mesures
+    with contextlib.redirect_stdout(io.StringIO()):
+        for incremental in (False, True):
+            # Un dossier contexte/ (fichier et journal) par instance
+            os.chdir(tempfile.mkdtemp(prefix="monopoly_bench_"))
+            contextes[incremental] = Contexte(game, MonopolyListeners(game))
+            contextes[incremental].incremental = incremental
+            elapsed[incremental] = 0.0
+        for tick in range(args.ticks):
+            replay_step(game, rng)
+            # Fin de tour détectée par les listeners (entrées des joueurs modifiées hors mise à jour)
+            end_turn = rng.random() < 0.05
+            for incremental, contexte in contextes.items():
+                if end_turn:
+                    contexte._end_turn()
+                start = time.perf_counter()
+                contexte._update_context()
+                elapsed[incremental] += time.perf_counter() - start
+            full, partial = (json.dumps(contextes[mode].context, sort_keys=True) for mode in (False, True))
+            if full != partial:
+                raise AssertionError(f"tick {tick} : le contexte incrémental diffère du recalcul complet")
+    backend.close()
+    return elapsed, contextes[True]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dump", help="dump MEM1+MEM2 (ou MEM1 seul si --mem2 est fourni)")
+    parser.add_argument("--mem2", help="dump MEM2 séparé (mem2.raw de Dolphin)")
+    parser.add_argument("--ticks", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{args.ticks} mises à jour du contexte sur {args.dump}\n")
+    elapsed, contexte = run(args)
+    for label, incremental in (("complet", False), ("incrémental", True)):
+        print(f"  {label:<12} {elapsed[incremental] / args.ticks * 1e3:9.3f} ms/mise à jour")
+    print("  contextes identiques à chaque mise à jour")
+    for group, stats in contexte.section_stats().items():
+        print(f"    {group:<10} {stats['builds']:6d} recalculs  {stats['reuses']:6d} réutilisations")
+
+
+if __name__ == "__main__":
+    main()
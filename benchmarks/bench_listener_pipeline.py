@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark hors ligne du pipeline listeners + contexte sur un dump de RAM
+
+Le dump s'enregistre depuis un Dolphin en cours de partie :
+    python -c "from src.core.memory_backend import DumpBackend; DumpBackend.record('dumps/partie.raw')"
+
+Puis, sans émulateur :
+    python benchmarks/bench_listener_pipeline.py dumps/partie.raw [--ticks 20] [--no-context]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from src.core.game_loader import GameLoader
+from src.core.memory_backend import DumpBackend
+from src.game.monopoly import MonopolyGame
+from src.game.listeners import MonopolyListeners
+
+
+class CountingBackend:
+    """Enveloppe un MemoryBackend et compte les appels / octets lus"""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.calls = 0
+        self.bytes = 0
+
+    def hook(self):
+        self.inner.hook()
+
+    def is_hooked(self):
+        return self.inner.is_hooked()
+
+    def read_bytes(self, addr, length):
+        self.calls += 1
+        self.bytes += length
+        return self.inner.read_bytes(addr, length)
+
+    def write_bytes(self, addr, data):
+        self.inner.write_bytes(addr, data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dump", help="dump MEM1+MEM2 (ou MEM1 seul si --mem2 est fourni)")
+    parser.add_argument("--mem2", help="dump MEM2 séparé (mem2.raw de Dolphin)")
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--no-context", action="store_true", help="ne pas brancher Contexte sur les listeners")
+    args = parser.parse_args()
+
+    backend = CountingBackend(DumpBackend(os.path.abspath(args.dump), args.mem2 and os.path.abspath(args.mem2)))
+    data = GameLoader(os.path.join(ROOT, "game_files", "starting_state.jsonc"), None)
+    game = MonopolyGame(data, backend)
+    listeners = MonopolyListeners(game)
+
+    # Contexte écrit dans ./contexte : on travaille dans un dossier temporaire
+    os.chdir(tempfile.mkdtemp(prefix="monopoly_bench_"))
+    if not args.no_context:
+        from src.game.contexte import Contexte
+        Contexte(game, listeners)
+
+    handlers = {
+        "player_handler": listeners.player_handler,
+        "message_handler": listeners.message_handler,
+        "auction_handler": listeners.auction_handler,
+    }
+    print(f"{args.ticks} ticks sur {args.dump}\n")
+    for name, handler in handlers.items():
+        handler()  # premier passage : joueurs ajoutés, caches remplis
+        backend.calls = backend.bytes = 0
+        start = time.perf_counter()
+        for _ in range(args.ticks):
+            handler()
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<16} {elapsed / args.ticks * 1e3:9.2f} ms/tick  "
+              f"{backend.calls / args.ticks:8.1f} lectures  {backend.bytes / args.ticks / 1024:10.1f} Kio/tick")
+
+
+if __name__ == "__main__":
+    main()
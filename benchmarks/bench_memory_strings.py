@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark : lecture des chaînes UTF-16 par MemoryReader
+
+Compare l'ancienne lecture caractère par caractère (un appel dme toutes les
+2 octets) à la lecture par blocs de get_string / get_str. La RAM est simulée
+en mémoire avec une latence configurable par appel pour reproduire le coût
+d'un aller-retour vers Dolphin.
+
+Usage:
+    python benchmarks/bench_memory_strings.py [--latency-us 30] [--runs 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.memory_reader import MemoryReader
+
+
+class SimulatedDolphin:
+    """MemoryBackend en mémoire avec une latence par appel, pour imiter Dolphin"""
+
+    def __init__(self, base, size, latency):
+        self.base = base
+        self.ram = bytearray(size)
+        self.latency = latency
+        self.calls = 0
+
+    def _wait(self):
+        self.calls += 1
+        if self.latency:
+            end = time.perf_counter() + self.latency
+            while time.perf_counter() < end:
+                pass
+
+    def hook(self):
+        pass
+
+    def is_hooked(self):
+        return True
+
+    def read_bytes(self, addr, length):
+        self._wait()
+        offset = addr - self.base
+        return bytes(self.ram[offset:offset + length])
+
+    def write_bytes(self, addr, data):
+        offset = addr - self.base
+        self.ram[offset:offset + len(data)] = data
+
+
+def legacy_get_string(addr, max_length=1024, byteorder="big"):
+    """Implémentation d'origine de MemoryReader.get_string"""
+    string = ""
+    i = 0
+    while i < max_length:
+        char = MemoryReader.get_backend().read_bytes(addr, 2)
+        if char == b"\x00\x00":
+            break
+        try:
+            string += char.decode("utf-16-le" if byteorder == "little" else "utf-16-be")
+        except Exception:
+            string += "?"
+        addr += 2
+        i += 1
+    return string
+
+
+def legacy_get_str(addr):
+    """Implémentation d'origine de MemoryReader.get_str"""
+    length = int.from_bytes(MemoryReader.get_backend().read_bytes(addr, 4), "big")
+    return legacy_get_string(addr + 4, length, "big")
+
+
+def measure(label, func, dolphin, runs):
+    dolphin.calls = 0
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed / runs * 1e6:10.1f} µs/appel  {dolphin.calls / runs:8.1f} appels dme")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-us", type=float, default=30.0, help="latence simulée par appel dme (µs)")
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    base = 0x90000000
+    dolphin = SimulatedDolphin(base, 0x10000, args.latency_us / 1e6)
+    MemoryReader.set_backend(dolphin)
+
+    cases = {
+        "nom de joueur (6 car.)": "GPT1-a",
+        "propriété (22 car.)": "Northumberland Avenue.",
+        "popup (200 car.)": ("Do you want to pay the bail, roll for doubles or use a get out of "
+                             "free jail card (if you have one)? " * 2)[:200],
+    }
+
+    print(f"Latence simulée: {args.latency_us:.0f} µs/appel, {args.runs} itérations\n")
+    addr = base
+    for label, text in cases.items():
+        MemoryReader.set_str(addr, text)
+        print(label)
+        old = measure("get_str (ancien)", lambda: legacy_get_str(addr), dolphin, args.runs)
+        new = measure("get_str (par blocs)", lambda: MemoryReader.get_str(addr), dolphin, args.runs)
+        measure("get_string (ancien)", lambda: legacy_get_string(addr + 4), dolphin, args.runs)
+        measure("get_string (par blocs)", lambda: MemoryReader.get_string(addr + 4), dolphin, args.runs)
+        assert old == new == text, (old, new)
+        print()
+        addr += 0x1000
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark : recherche des événements de messages sur un dump de RAM
+
+Compare l'ancienne recherche (une regex et un finditer sur toute la zone des
+messages par événement) au MessageScanner (un préfiltre unique sur les préfixes
+littéraux, puis le motif de l'événement aux positions trouvées). Les deux
+chemins doivent trouver exactement les mêmes correspondances.
+
+Le dump s'enregistre depuis un Dolphin en cours de partie :
+    python -c "from src.core.memory_backend import DumpBackend; DumpBackend.record('dumps/partie.raw')"
+
+Puis, sans émulateur :
+    python benchmarks/bench_message_scanner.py dumps/partie.raw [--runs 3]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from src.core.game_loader import GameLoader
+from src.core.memory_backend import DumpBackend
+from src.core.memory_reader import MemoryReader
+from src.core.message_finder import MessageFinder
+from src.core.message_scanner import MessageScanner
+from src.game.monopoly import MonopolyGame
+
+
+def legacy_scan(patterns, data):
+    """Ancienne recherche : chaque motif compilé puis parcouru sur toute la zone"""
+    results = {}
+    for index, pattern in enumerate(patterns):
+        try:
+            compiled = re.compile(pattern)
+        except re.error:
+            continue
+        results[index] = [match.span() for match in compiled.finditer(data)]
+    return results
+
+
+def measure(label, func, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed / runs * 1e3:10.1f} ms/passe")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dump", help="dump MEM1+MEM2 (ou MEM1 seul si --mem2 est fourni)")
+    parser.add_argument("--mem2", help="dump MEM2 séparé (mem2.raw de Dolphin)")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    backend = DumpBackend(os.path.abspath(args.dump), args.mem2 and os.path.abspath(args.mem2))
+    game = MonopolyGame(GameLoader(os.path.join(ROOT, "game_files", "starting_state.jsonc"), None), backend)
+
+    start, end = game.data.manifest.messages_range
+    data = MemoryReader.get_bytes(start, end - start)
+    patterns = [MessageFinder.event_pattern(game, event) for event in game.data.manifest.events]
+
+    scanner = measure("construction du scanner", lambda: MessageScanner(patterns), 1)
+    print(f"  {len(patterns)} événements, {len(patterns) - len(scanner.residual)} via le préfiltre, "
+          f"{len(scanner.residual)} recherchés séparément\n")
+
+    print(f"Zone des messages : {len(data) / 1024 / 1024:.1f} Mio, {args.runs} passes")
+    old = measure("finditer par événement", lambda: legacy_scan(patterns, data), args.runs)
+    new = measure("MessageScanner (1 passe)", lambda: scanner.scan(data), args.runs)
+    assert old == new, "les deux recherches divergent"
+    print(f"\n  {sum(map(len, new.values()))} correspondances identiques")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@ USER_CONFIG_FILE = os.path.join(CONFIG_DIR, "user_config.json")
 CONTEXT_DIR = os.path.join(WORKSPACE_DIR, "contexte")
 CONTEXT_FILE = os.path.join(CONTEXT_DIR, "game_context.json")
 CONTEXT_HISTORY_DIR = os.path.join(CONTEXT_DIR, "history")
+CONTEXT_JOURNAL_DIR = os.path.join(CONTEXT_DIR, "journal")
 PROGRAM_FILES_DIR = os.getenv("ProgramFiles", "C:/Program Files")
 
 # Créer le dossier config s'il n'existe pas
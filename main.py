@@ -7,6 +7,7 @@ from src.game.monopoly import MonopolyGame
 from colorama import init, Fore, Back, Style
 
 from src.game.listeners import MonopolyListeners
+from src.game.polling_policy import PollingPolicy
 from src.game.contexte import Contexte
 
 def on_player_money_changed(player, new_value, old_value):
@@ -40,7 +41,7 @@ def on_message_removed(id, *args):
     print(f"{Fore.MAGENTA}🗑️ Message '{id}' a été supprimé{Style.RESET_ALL}")
     
 def on_event(event, *args):
-    if event in ["loop_tick", "player_handling", "message_handling", "player_position_changed", "auction_handling"]:
+    if event in ["loop_tick", "player_handling", "message_handling", "player_position_changed", "auction_handling", "batch_started", "batch_ended"]:
         return
     print(f"{Fore.CYAN}ℹ️ {event}{Style.RESET_ALL}")
     
@@ -67,8 +68,13 @@ def main():
 
         
         events = MonopolyListeners(game)
-        events.tps = 30
         events.interval_player = .1
+        # Fréquences adaptées à la phase de jeu (section "polling" de monitor_config.json)
+        PollingPolicy.load().attach(events)
+        # Callbacks (Contexte, sauvegardes JSON) exécutés hors du thread de lecture de la RAM
+        events.start_dispatcher()
+        # Rafales de changements (lancer de dés) traitées et sauvegardées en un seul lot
+        events.start_coalescing(0.1, MonopolyListeners.COALESCED_EVENTS)
         
         # Initialiser le contexte
         contexte = Contexte(game, events)
@@ -1,7 +1,6 @@
 """
 Monitor centralisé qui communique avec le serveur principal
 """
-import dolphin_memory_engine as dme
 import re
 import time
 import sys
@@ -18,6 +17,9 @@ import mss.tools
 from PIL import Image
 import keyboard
 from src.utils.calibration import CalibrationUtils
+from src.core.dme_session import DmeSession
+from src.core.memory_backend import MemoryBackend
+from src.core.memory_reader import MemoryReader
 from src.utils import property_manager, get_coordinates
 import difflib
 from dotenv import load_dotenv
@@ -39,7 +41,7 @@ print(f"[Monitor] Gemini API Key: {'✅ Found' if os.getenv('GEMINI_API_KEY') el
 pyautogui.FAILSAFE = False
 
 class CentralizedMonitor:
-    def __init__(self, api_url="http://localhost:5000"):
+    def __init__(self, api_url="http://localhost:5000", backend: MemoryBackend = None):
         # Nettoyer et valider l'URL
         api_url = str(api_url).strip().strip('`').strip('"').strip("'")
         if not api_url.startswith(('http://', 'https://')):
@@ -47,6 +49,10 @@ class CentralizedMonitor:
             api_url = "http://localhost:5000"
         
         self.api_url = api_url
+        # Source de la RAM : celle de MemoryReader par défaut (même backend et même session
+        # de reconnexion que MonopolyGame et les listeners), ou un dump (DumpBackend) pour tester hors ligne
+        self.backend = backend or MemoryReader.get_backend()
+        self.session = DmeSession.for_backend(self.backend)
         self.running = False
         self.already_seen = set()
         self.message_addresses = []
@@ -104,7 +110,11 @@ class CentralizedMonitor:
     def connect_to_dolphin(self):
         """Se connecte à Dolphin Memory Engine"""
         try:
-            dme.hook()
+            # Même session que MonopolyGame et les listeners : un seul hook, reconnexion partagée
+            if not self.session.connect():
+                raise Exception(self.session.last_error or "Dolphin Memory Engine non connecté")
+            if MemoryReader.get_backend() is not self.backend:
+                MemoryReader.set_backend(self.backend)
             print("✅ Connecté à Dolphin")
             return True
         except Exception as e:
@@ -178,10 +188,14 @@ class CentralizedMonitor:
         CHUNK_SIZE = 0x10000
         MAX_LENGTH = 400
         results = []
+        session = self.session
+        if not session.connected:
+            # Reconnexion à Dolphin en cours : rien à scanner
+            return results
         
         for addr in range(RAM_START, RAM_START + RAM_SIZE, CHUNK_SIZE):
             try:
-                chunk = dme.read_bytes(addr, CHUNK_SIZE)
+                chunk = self.backend.read_bytes(addr, CHUNK_SIZE)
                 for key in self.monitor_config['keywords'].keys():
                     key_compiled = re.compile(re.escape(key.encode("utf-16-le")), re.DOTALL)
                     for match in key_compiled.finditer(chunk):
@@ -199,6 +213,11 @@ class CentralizedMonitor:
                             'trigger': key,
                             'bytes':message_bytes
                         })
+            except RuntimeError as e:
+                if DmeSession.is_disconnect_error(e):
+                    print(f"⚠️ Scan interrompu, Dolphin semble être fermé : {e}")
+                    session.lost(e)
+                    break
             except:
                 pass
         
@@ -1102,8 +1121,8 @@ class CentralizedMonitor:
         # Écrire le montant de l'enchère aux deux adresses
         try:
             # Écrire le winning_bid aux deux adresses (front et back) - halfword (2 bytes)
-            dme.write_bytes(AUCTION_BID_FRONT_ADDRESS, winning_bid.to_bytes(2, 'big'))
-            dme.write_bytes(AUCTION_BID_BACK_ADDRESS, winning_bid.to_bytes(2, 'big'))
+            self.backend.write_bytes(AUCTION_BID_FRONT_ADDRESS, winning_bid.to_bytes(2, 'big'))
+            self.backend.write_bytes(AUCTION_BID_BACK_ADDRESS, winning_bid.to_bytes(2, 'big'))
             print("✅ Enchère configurée via RAM avec succès")
         except Exception as e:
             print(f"❌ Erreur lors de l'écriture en RAM: {e}")
@@ -152,6 +152,11 @@ class EventTypes:
     GAME_STOPPED = 'game.stopped'
     GAME_STATE_UPDATED = 'game.state_updated'
     
+    # Dolphin connection events (DmeSession)
+    DOLPHIN_CONNECTED = 'dolphin.connected'
+    DOLPHIN_DISCONNECTED = 'dolphin.disconnected'
+    DOLPHIN_RECONNECTING = 'dolphin.reconnecting'
+    
     # System events
     SERVICE_STARTED = 'service.started'
     SERVICE_STOPPED = 'service.stopped'
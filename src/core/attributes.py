@@ -1,3 +1,5 @@
+import weakref
+from .layout import LayoutField
 from .memory_reader import MemoryReader
 
 class IntAttribute:
@@ -9,10 +11,15 @@ class IntAttribute:
             return self
         base_address = instance._base + self.offset
         return MemoryReader.get_i32(base_address)
+    
+    def layout_field(self, name):
+        return LayoutField(name, self.offset, "i32")
 
 class StringAttribute:
-    def __init__(self, offset):
+    def __init__(self, offset, max_length=None):
         self.offset = offset
+        # Taille du champ en caractères, nécessaire pour l'inclure dans une Layout
+        self.max_length = max_length
 
     def __get__(self, instance, owner):
         if instance is None:
@@ -23,6 +30,11 @@ class StringAttribute:
     def __set__(self, instance, value):
         base_address = instance._base + self.offset
         MemoryReader.set_string(base_address, value)
+    
+    def layout_field(self, name):
+        if self.max_length is None:
+            return None
+        return LayoutField(name, self.offset, "utf16", self.max_length)
 
 class OffsetAttribute:
     def __init__(self, offset, factory=None):
@@ -44,64 +56,121 @@ class FixedArrayAttribute:
         if instance is None:
             return self
         base_address = instance._base + self.offset
-        return [MemoryReader.get_i32(base_address + i * 4) for i in range(self.length)]
+        # Une seule lecture pour tout le tableau (servie par le snapshot actif s'il le couvre)
+        data = MemoryReader.get_view(base_address, self.length * 4)
+        return [int.from_bytes(data[i * 4:i * 4 + 4], "big") for i in range(self.length)]
+    
+    def layout_field(self, name):
+        return LayoutField(name, self.offset, "i32", self.length)
+
+class ArrayCache:
+    """Dernier bloc (longueur + pointeurs) lu pour une instance et éléments construits"""
+    __slots__ = ("block", "result", "elements", "snapshot")
+
+    def __init__(self, block: bytes, result: list, elements: dict, snapshot):
+        self.block = block
+        self.result = result
+        # pointeur -> élément construit par la factory, réutilisé tant que le pointeur reste
+        self.elements = elements
+        # Snapshot (weakref) pendant lequel le bloc a été validé
+        self.snapshot = snapshot
 
 class DynamicArrayAttribute:
-    def __init__(self, offset, factory=None):
+    def __init__(self, offset, factory=None, capacity=None):
         self.offset = offset
         self.factory = factory
+        # Pointeurs lus avec la longueur en un seul bloc (None : longueur puis pointeurs)
+        self.capacity = capacity
+        # instance -> ArrayCache
+        self._cache = weakref.WeakKeyDictionary()
+
+    def _read_block(self, base_address):
+        """Longueur et bloc (longueur + pointeurs) du tableau, lus en une fois si capacity est connue"""
+        if self.capacity:
+            data = MemoryReader.get_view(base_address, 4 + 4 * self.capacity)
+            length = int.from_bytes(data[:4], "big")
+        else:
+            data = None
+            length = MemoryReader.get_i32(base_address)
+        if length < 0 or length > 100:
+            return length, None
+        if data is None or length > self.capacity:
+            data = MemoryReader.get_view(base_address, 4 + 4 * length)
+        return length, bytes(data[:4 + 4 * length])
 
     def __get__(self, instance, owner):
         if instance is None:
             return self
         base_address = instance._base + self.offset
-        length = MemoryReader.get_i32(base_address)
+        
+        # Dans un même snapshot (un tick), le tableau déjà validé est renvoyé sans relecture
+        cache = self._cache.get(instance)
+        snapshot = MemoryReader.active_snapshot()
+        if cache is not None and snapshot is not None and cache.snapshot is not None and cache.snapshot() is snapshot:
+            return list(cache.result)
+        
+        length, block = self._read_block(base_address)
         
         # Debug désactivé pour réduire le spam
         # print(f"[DEBUG DynamicArrayAttribute] Reading array at offset 0x{self.offset:X} (address: 0x{base_address:X}), length: {length}")
         
         # Vérifier que la longueur est raisonnable
-        if length < 0 or length > 100:
-            # print(f"[WARNING] Array length seems invalid: {length}, trying alternative reading method")
-            
-            # Essayer de lire comme un pointeur vers un tableau
-            pointer_address = MemoryReader.get_i32(base_address)
-            if pointer_address > 0x10000000 and pointer_address < 0xFFFFFFFF:
-                # print(f"[DEBUG] Trying as pointer: 0x{pointer_address:X}")
-                try:
-                    # Lire la longueur depuis le pointeur
-                    alt_length = MemoryReader.get_i32(pointer_address)
-                    if 0 <= alt_length <= 50:
-                        # print(f"[DEBUG] Alternative length found: {alt_length}")
-                        result = []
-                        for i in range(alt_length):
-                            element_address = MemoryReader.get_i32(pointer_address + 4 + i * 4)
-                            if self.factory:
-                                try:
-                                    element = self.factory(element_address)
-                                    result.append(element)
-                                except:
-                                    pass
-                        return result
-                except:
-                    pass
-            
-            return []
+        if block is None:
+            self._cache.pop(instance, None)
+            return self._read_indirect(base_address)
         
-        # Lire chaque élément
+        snapshot_ref = weakref.ref(snapshot) if snapshot is not None else None
+        if cache is not None and cache.block == block:
+            # Pointeurs inchangés : mêmes éléments
+            cache.snapshot = snapshot_ref
+            return list(cache.result)
+        
+        previous = cache.elements if cache is not None else {}
+        elements = {}
         result = []
         for i in range(length):
-            element_address = MemoryReader.get_i32(base_address + 4 + i * 4)
+            element_address = int.from_bytes(block[4 + i * 4:8 + i * 4], "big")
             # print(f"[DEBUG] Element {i}: address 0x{element_address:X}")
             
             if self.factory:
-                try:
-                    element = self.factory(element_address)
-                    result.append(element)
-                except Exception as e:
-                    # print(f"[ERROR] Failed to create element {i}: {e}")
-                    pass
+                element = elements.get(element_address) or previous.get(element_address)
+                if element is None:
+                    try:
+                        element = self.factory(element_address)
+                    except Exception as e:
+                        # print(f"[ERROR] Failed to create element {i}: {e}")
+                        continue
+                elements[element_address] = element
+                result.append(element)
             else:
                 result.append(element_address)
         
-        return result
\ No newline at end of file
+        self._cache[instance] = ArrayCache(block, result, elements, snapshot_ref)
+        return list(result)
+
+    def _read_indirect(self, base_address):
+        # print(f"[WARNING] Array length seems invalid: {length}, trying alternative reading method")
+        
+        # Essayer de lire comme un pointeur vers un tableau
+        pointer_address = MemoryReader.get_i32(base_address)
+        if pointer_address > 0x10000000 and pointer_address < 0xFFFFFFFF:
+            # print(f"[DEBUG] Trying as pointer: 0x{pointer_address:X}")
+            try:
+                # Lire la longueur depuis le pointeur
+                alt_length = MemoryReader.get_i32(pointer_address)
+                if 0 <= alt_length <= 50:
+                    # print(f"[DEBUG] Alternative length found: {alt_length}")
+                    result = []
+                    for i in range(alt_length):
+                        element_address = MemoryReader.get_i32(pointer_address + 4 + i * 4)
+                        if self.factory:
+                            try:
+                                element = self.factory(element_address)
+                                result.append(element)
+                            except:
+                                pass
+                    return result
+            except:
+                pass
+        
+        return []
@@ -1,4 +1,5 @@
 from src.core.attributes import IntAttribute
+from .layout import Layout, Layouts, Record
 from src.core.property import Property
 from .game_loader import PlayerData
 from .memory_reader import MemoryReader
@@ -11,8 +12,26 @@ class Auction:
     current_bidder = IntAttribute(0xC)
     status = IntAttribute(0x14)
 
+    # Taille de l'enregistrement couvert par les attributs ci-dessus
+    RECORD_SIZE = 0x18
+
     def __init__(self, base):
         self._base = base
 
+    def snapshot_span(self):
+        """Plage RAM (adresse, longueur) de l'enchère, pour MemoryReader.snapshot"""
+        return Auction.layout().span(self._base)
+
+    @staticmethod
+    def layout() -> Layout:
+        return Layouts.get("Auction")
+
+    @property
+    def record(self) -> Record:
+        """État complet de l'enchère décodé en un seul unpack"""
+        return Auction.layout().read(self._base)
+
     def is_active(self):
-        return self.status == 1
\ No newline at end of file
+        return self.status == 1
+
+Layouts.register(Layout.from_class(Auction, Auction.RECORD_SIZE))
@@ -0,0 +1,72 @@
+import json
+import os
+from typing import Dict, Optional
+
+from .game_loader import GameLoader
+from .memory_reader import MemoryReader
+
+class BuildingsIndex:
+    """
+    Octets "nombre de maisons" des propriétés (house_number_by_property de
+    starting_state.jsonc), chargés une seule fois.
+
+    Tous les octets tiennent dans une plage de quelques Kio : read() les lit en un
+    seul appel, et les fonctions d'aide (has_hotel, can_build_house...) se servent
+    de ce relevé au lieu de relire la RAM propriété par propriété.
+    """
+
+    DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                                'game_files', 'starting_state.jsonc')
+    # Nombre de maisons correspondant à un hôtel
+    HOTEL = 5
+
+    _default: Optional["BuildingsIndex"] = None
+
+    def __init__(self, addresses: Dict[str, int]):
+        # Libellé de la propriété -> adresse de son octet
+        self.addresses = dict(addresses)
+        self._labels = {label.lower(): label for label in self.addresses}
+        start = min(self.addresses.values(), default=0)
+        end = max(self.addresses.values(), default=-1) + 1
+        self.span = (start, end - start)
+
+    @staticmethod
+    def from_manifest(path: str) -> "BuildingsIndex":
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.loads(GameLoader.remove_comments(f.read()))
+        return BuildingsIndex({
+            prop['label']: MemoryReader.hex_to_int(prop['address'])
+            for prop in data.get('house_number_by_property', [])
+        })
+
+    @staticmethod
+    def load() -> "BuildingsIndex":
+        """Index du manifeste du jeu, lu au premier appel"""
+        if BuildingsIndex._default is None:
+            BuildingsIndex._default = BuildingsIndex.from_manifest(BuildingsIndex.DEFAULT_PATH)
+        return BuildingsIndex._default
+
+    def label(self, property_name: str) -> Optional[str]:
+        """Libellé de house_number_by_property pour un nom de propriété (casse ignorée)"""
+        return self._labels.get(property_name.lower())
+
+    def decode(self, view) -> Dict[str, int]:
+        """Nombre de maisons par libellé, depuis les octets de la plage span"""
+        start = self.span[0]
+        return {label: view[address - start] for label, address in self.addresses.items()}
+
+    def read(self) -> Dict[str, int]:
+        """Nombre de maisons (0-5, 5 = hôtel) de chaque propriété, en une seule lecture"""
+        if not self.addresses:
+            return {}
+        return self.decode(MemoryReader.get_view(*self.span))
+
+    def house_count(self, property_name: str, counts: Optional[Dict[str, int]] = None) -> Optional[int]:
+        """Nombre de maisons d'une propriété (None si inconnue), lu dans counts ou en RAM"""
+        label = self.label(property_name)
+        if label is None:
+            return None
+        if counts is None:
+            # Un seul octet : inutile de relire toute la plage
+            return MemoryReader.get_byte(self.addresses[label])
+        return counts.get(label)
@@ -0,0 +1,149 @@
+import threading
+import time
+import weakref
+from typing import Optional
+
+from .listeners import EventListeners
+from .memory_backend import MemoryBackend
+
+class DmeSession(EventListeners):
+    """
+    Connexion partagée à la RAM du jeu (hook dme) pour un MemoryBackend.
+
+    MonopolyGame, les listeners et le monitor passent par la même session : une
+    lecture qui échoue ("Could not read memory") la signale perdue avec lost(), un
+    thread retente alors le hook avec un délai exponentiel, et les lecteurs
+    attendent wait_connected() au lieu de s'arrêter. Événements émis (un dict
+    d'informations en argument) : "connected", "disconnected", "reconnecting".
+    """
+
+    CONNECTED = "connected"
+    DISCONNECTED = "disconnected"
+    RECONNECTING = "reconnecting"
+
+    # Délai avant la première tentative, multiplié à chaque échec jusqu'au maximum (secondes)
+    BACKOFF_INITIAL = 0.5
+    BACKOFF_FACTOR = 2.0
+    BACKOFF_MAX = 30.0
+    # Lecture de contrôle : identifiant du jeu au début de MEM1
+    PROBE = (0x80000000, 4)
+
+    _sessions = weakref.WeakKeyDictionary()
+    _sessions_lock = threading.Lock()
+
+    def __init__(self, backend: MemoryBackend):
+        super().__init__()
+        self.backend = backend
+        self.state = DmeSession.DISCONNECTED
+        self.disconnects = 0
+        self.reconnects = 0
+        self.last_error: Optional[str] = None
+        self._connected = threading.Event()
+        self._closed = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def for_backend(backend: MemoryBackend) -> "DmeSession":
+        """Session unique d'un backend (créée au premier appel)"""
+        with DmeSession._sessions_lock:
+            session = DmeSession._sessions.get(backend)
+            if session is None:
+                session = DmeSession._sessions[backend] = DmeSession(backend)
+            return session
+
+    @staticmethod
+    def is_disconnect_error(error: BaseException) -> bool:
+        """Vrai pour l'erreur de lecture de dme quand Dolphin est fermé ou bloqué"""
+        return isinstance(error, RuntimeError) and "Could not read memory" in str(error)
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    def _info(self, **extra) -> dict:
+        info = {
+            "state": self.state,
+            "disconnects": self.disconnects,
+            "reconnects": self.reconnects,
+            "error": self.last_error,
+        }
+        info.update(extra)
+        return info
+
+    def _try_connect(self) -> bool:
+        if not self.backend.is_hooked():
+            self.backend.hook()
+        if not self.backend.is_hooked():
+            return False
+        # Un hook peut subsister alors que la RAM n'est plus lisible
+        self.backend.read_bytes(*DmeSession.PROBE)
+        return True
+
+    def _set_connected(self) -> None:
+        self.state = DmeSession.CONNECTED
+        self.last_error = None
+        self._connected.set()
+        self.emit(DmeSession.CONNECTED, self._info())
+
+    def connect(self) -> bool:
+        """Hook immédiat (une tentative) ; renvoie True si la RAM est lisible"""
+        if self.connected:
+            return True
+        try:
+            ok = self._try_connect()
+        except Exception as e:
+            self.last_error = str(e)
+            ok = False
+        if ok:
+            self._set_connected()
+        return ok
+
+    def lost(self, error: Optional[BaseException] = None) -> None:
+        """Signale une lecture impossible : les lecteurs sont mis en pause et la reconnexion démarre"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._connected.clear()
+            self.state = DmeSession.DISCONNECTED
+            self.disconnects += 1
+            self.last_error = str(error) if error is not None else None
+            self._closed.clear()
+            self._thread = threading.Thread(target=self._reconnect, name="DmeSession-reconnect")
+            self._thread.daemon = True
+        self.emit(DmeSession.DISCONNECTED, self._info())
+        self._thread.start()
+
+    def _reconnect(self) -> None:
+        delay = DmeSession.BACKOFF_INITIAL
+        attempt = 0
+        while True:
+            attempt += 1
+            self.state = DmeSession.RECONNECTING
+            self.emit(DmeSession.RECONNECTING, self._info(attempt=attempt, delay=delay))
+            if self._closed.wait(delay):
+                return
+            unhook = getattr(self.backend, "unhook", None)
+            try:
+                # Le hook d'un émulateur fermé est abandonné avant d'en créer un nouveau
+                if unhook is not None:
+                    unhook()
+                ok = self._try_connect()
+            except Exception as e:
+                self.last_error = str(e)
+                ok = False
+            if ok:
+                self.reconnects += 1
+                self._set_connected()
+                return
+            delay = min(delay * DmeSession.BACKOFF_FACTOR, DmeSession.BACKOFF_MAX)
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        return self._connected.wait(timeout)
+
+    def close(self) -> None:
+        """Arrête une reconnexion en cours"""
+        self._closed.set()
+
+    def to_dict(self) -> dict:
+        return self._info(timestamp=time.time())
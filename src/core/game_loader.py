@@ -1,5 +1,8 @@
 import json
+import os
+import threading
 import typing
+from types import MappingProxyType
 from .memory_reader import Hex
 import re
 
@@ -15,28 +18,135 @@ class PlayerData(typing.TypedDict):
     id: str
     address: PlayerDataAddress
 
-class MessageData(typing.TypedDict):
-    id: str
-    pattern: str
+class CompiledManifest(typing.Mapping):
+    """
+    Manifeste analysé une seule fois, en lecture seule.
+    
+    Toutes les adresses (avec ou sans préfixe 0x) sont converties en int, les listes
+    deviennent des tuples et les dictionnaires des MappingProxyType. L'accès par clé
+    reste celui du JSON (manifest["players"], ...) ; les propriétés typées évitent
+    les conversions dans les boucles.
+    """
+    
+    # Clés de l'adresse d'un joueur
+    PLAYER_ADDRESS_KEYS = ("name", "money", "money_label", "goto", "position", "base")
+    
+    def __init__(self, raw: dict):
+        CompiledManifest.validate(raw)
+        self._data = CompiledManifest.freeze(CompiledManifest.normalize(raw))
+    
+    def __getitem__(self, key):
+        return self._data[key]
+    
+    def __iter__(self):
+        return iter(self._data)
+    
+    def __len__(self):
+        return len(self._data)
+    
+    @staticmethod
+    def to_int(value: Hex) -> int:
+        return int(value, 16) if isinstance(value, str) else value
+    
+    @staticmethod
+    def validate(raw: dict) -> None:
+        """Vérifie les sections utilisées par le jeu ; ValueError sinon"""
+        def require(condition, message):
+            if not condition:
+                raise ValueError(f"Manifeste invalide : {message}")
+        
+        require(isinstance(raw, dict), "la racine doit être un objet")
+        for key in ("players", "properties", "auction", "messages"):
+            require(key in raw, f"section '{key}' manquante")
+        require(isinstance(raw["players"], list), "'players' doit être une liste")
+        for i, player in enumerate(raw["players"]):
+            require(isinstance(player, dict) and "id" in player and isinstance(player.get("address"), dict),
+                    f"players[{i}] doit avoir 'id' et 'address'")
+            for key in CompiledManifest.PLAYER_ADDRESS_KEYS:
+                require(key in player["address"], f"players[{i}].address.{key} manquant")
+        for section in ("properties", "messages"):
+            address_range = raw[section].get("address_range") if isinstance(raw[section], dict) else None
+            require(isinstance(address_range, list) and len(address_range) == 2, f"{section}.address_range doit contenir 2 adresses")
+        require(isinstance(raw["messages"].get("events"), list), "messages.events doit être une liste")
+        for i, event in enumerate(raw["messages"]["events"]):
+            require(isinstance(event, dict) and "id" in event and event.get("type") in ("address", "pattern"),
+                    f"messages.events[{i}] doit avoir 'id' et un type 'address' ou 'pattern'")
+            require(event["type"] != "address" or "address" in event, f"messages.events[{i}] sans 'address'")
+            require(event["type"] != "pattern" or "pattern" in event, f"messages.events[{i}] sans 'pattern'")
+    
+    @staticmethod
+    def normalize(raw: dict) -> dict:
+        """Copie de raw où toutes les adresses sont des int"""
+        to_int = CompiledManifest.to_int
+        data = dict(raw)
+        for player in data["players"]:
+            for key, value in player["address"].items():
+                player["address"][key] = [to_int(v) for v in value] if isinstance(value, list) else to_int(value)
+        data["auction"] = to_int(data["auction"])
+        for section in ("properties", "messages"):
+            data[section]["address_range"] = [to_int(v) for v in data[section]["address_range"]]
+        for event in data["messages"]["events"]:
+            if "address" in event:
+                event["address"] = to_int(event["address"])
+        for house in data.get("house_number_by_property", []):
+            house["address"] = to_int(house["address"])
+        return data
+    
+    @staticmethod
+    def freeze(value):
+        if isinstance(value, dict):
+            return MappingProxyType({key: CompiledManifest.freeze(item) for key, item in value.items()})
+        if isinstance(value, list):
+            return tuple(CompiledManifest.freeze(item) for item in value)
+        return value
+    
+    @property
+    def players(self) -> typing.Tuple[PlayerData, ...]:
+        return self._data["players"]
+    
+    @property
+    def auction(self) -> int:
+        return self._data["auction"]
+    
+    @property
+    def messages_range(self) -> typing.Tuple[int, int]:
+        return self._data["messages"]["address_range"]
+    
+    @property
+    def properties_range(self) -> typing.Tuple[int, int]:
+        return self._data["properties"]["address_range"]
+    
+    @property
+    def events(self) -> typing.Tuple[typing.Mapping, ...]:
+        return self._data["messages"]["events"]
 
-class Manifest(typing.TypedDict):
-    players: typing.List[PlayerData]
-    messages: typing.List[MessageData]
-    auction: Hex
 
 class GameLoader:
     
     _path_manifest: str
     _path_save: str
     
+    # Manifestes compilés par chemin : (mtime_ns, taille, manifeste)
+    _manifests: typing.Dict[str, typing.Tuple[int, int, CompiledManifest]] = {}
+    _lock = threading.Lock()
+    
     def __init__(self, path_manifest, path_save):
         self._path_manifest = path_manifest
         self._path_save = path_save
         
     @property
-    def manifest(self) -> Manifest:
-        with open(self._path_manifest, 'r') as f:
-            return json.loads(GameLoader.remove_comments("".join(f.readlines())))
+    def manifest(self) -> CompiledManifest:
+        """Manifeste compilé, relu seulement si la date ou la taille du fichier change"""
+        path = os.path.abspath(self._path_manifest)
+        stat = os.stat(path)
+        cached = GameLoader._manifests.get(path)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        with GameLoader._lock:
+            with open(path, 'r') as f:
+                manifest = CompiledManifest(json.loads(GameLoader.remove_comments(f.read())))
+            GameLoader._manifests[path] = (stat.st_mtime_ns, stat.st_size, manifest)
+        return manifest
     
     @staticmethod
     def to_hex(value: Hex) -> int:
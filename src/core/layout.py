@@ -0,0 +1,181 @@
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+from .memory_reader import MemoryReader
+
+# Types de champs reconnus dans une section "layouts" du manifeste : (format struct, taille d'un élément)
+FIELD_TYPES = {
+    "u8": ("B", 1),
+    "i16": ("H", 2),
+    "i32": ("I", 4),
+    "utf16": ("s", 2),
+}
+
+class LayoutField:
+    """Champ d'un enregistrement : nom, offset, type et nombre d'éléments"""
+    __slots__ = ("name", "offset", "type", "count")
+
+    def __init__(self, name: str, offset: int, type: str = "i32", count: int = 1):
+        if type not in FIELD_TYPES:
+            raise ValueError(f"Unknown layout field type '{type}' for '{name}'")
+        self.name = name
+        self.offset = offset
+        self.type = type
+        self.count = count
+
+    @property
+    def size(self) -> int:
+        return FIELD_TYPES[self.type][1] * self.count
+
+    @property
+    def format(self) -> str:
+        code = FIELD_TYPES[self.type][0]
+        if self.type == "utf16":
+            return f"{self.size}s"
+        return code if self.count == 1 else f"{self.count}{code}"
+
+    @property
+    def values(self) -> int:
+        """Nombre de valeurs produites par struct.unpack pour ce champ"""
+        return 1 if self.type == "utf16" else self.count
+
+
+class Record:
+    """Base des objets valeur produits par Layout.unpack_from (un attribut par champ)"""
+    __slots__ = ("_base",)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}(0x{self._base:08X}, {fields})"
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, name) == getattr(other, name) for name in ("_base",) + self.__slots__)
+
+    # Comparés par valeur, modifiables et avec des champs listes : pas hachables
+    __hash__ = None
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Layout:
+    """
+    Disposition compilée d'un enregistrement en RAM.
+
+    Les champs sont triés par offset et compilés en un unique struct.Struct big-endian
+    (les trous sont comblés par des octets de remplissage) : un enregistrement complet
+    se décode en un seul unpack_from et donne une instance __slots__ de Record.
+    """
+
+    def __init__(self, name: str, fields: Iterable[LayoutField], size: Optional[int] = None):
+        self.name = name
+        self.fields: Tuple[LayoutField, ...] = tuple(sorted(fields, key=lambda field: field.offset))
+
+        fmt = [">"]
+        position = 0
+        for field in self.fields:
+            if field.offset < position:
+                raise ValueError(f"Layout '{name}': field '{field.name}' overlaps the previous field")
+            if field.offset > position:
+                fmt.append(f"{field.offset - position}x")
+            fmt.append(field.format)
+            position = field.offset + field.size
+        if size is not None and size > position:
+            fmt.append(f"{size - position}x")
+
+        self.struct = struct.Struct("".join(fmt))
+        self.size = self.struct.size
+        self.record_type = type(f"{name}Record", (Record,), {"__slots__": tuple(field.name for field in self.fields)})
+
+    @staticmethod
+    def from_class(cls, size: Optional[int] = None) -> "Layout":
+        """Compile les descripteurs d'une classe (IntAttribute, FixedArrayAttribute, ...) qui exposent layout_field"""
+        descriptors = {}
+        for klass in reversed(cls.__mro__):
+            descriptors.update(vars(klass))
+        fields = []
+        for name, descriptor in descriptors.items():
+            to_field = getattr(descriptor, "layout_field", None)
+            field = to_field(name) if callable(to_field) else None
+            if field is not None:
+                fields.append(field)
+        return Layout(cls.__name__, fields, size)
+
+    @staticmethod
+    def from_spec(name: str, spec: dict) -> "Layout":
+        """
+        Compile une entrée de la section "layouts" du manifeste, par exemple :
+        {"size": "0x8C", "fields": {"price": {"offset": "0x64", "type": "i32"}, "rents": {"offset": "0x74", "count": 6}}}
+        """
+        fields = [
+            LayoutField(field_name, MemoryReader.hex_to_int(field["offset"]), field.get("type", "i32"), field.get("count", 1))
+            for field_name, field in spec["fields"].items()
+        ]
+        size = spec.get("size")
+        return Layout(name, fields, MemoryReader.hex_to_int(size) if size is not None else None)
+
+    def span(self, base: int) -> Tuple[int, int]:
+        """Plage RAM (adresse, longueur) d'un enregistrement, pour MemoryReader.snapshot"""
+        return (base, self.size)
+
+    def unpack_from(self, buffer, offset: int = 0, base: int = 0) -> Record:
+        """Décode un enregistrement complet depuis buffer[offset:offset + size]"""
+        values = self.struct.unpack_from(buffer, offset)
+        record = self.record_type.__new__(self.record_type)
+        record._base = base
+        i = 0
+        for field in self.fields:
+            if field.type == "utf16":
+                value = Layout._decode_string(values[i], base + field.offset)
+            elif field.count == 1:
+                value = values[i]
+            else:
+                value = list(values[i:i + field.count])
+            setattr(record, field.name, value)
+            i += field.values
+        return record
+
+    @staticmethod
+    def _decode_string(data: bytes, addr: int) -> str:
+        end = MemoryReader.find_terminator(data)
+        if end == -1:
+            # Chaîne plus longue que le champ : relecture complète comme StringAttribute
+            return MemoryReader.get_string(addr)
+        return MemoryReader.decode_utf16(data[:end])
+
+    def read(self, base: int) -> Record:
+        """Lit et décode un enregistrement (servi par le snapshot actif s'il le couvre)"""
+        return self.unpack_from(MemoryReader.get_view(base, self.size), 0, base)
+
+    def read_many(self, bases: Iterable[int]) -> List[Record]:
+        """
+        Lit plusieurs enregistrements : un snapshot couvre toutes les plages (un appel
+        par zone contiguë), puis une boucle d'unpack_from sur les vues du snapshot.
+        """
+        spans = [self.span(base) for base in bases]
+        if not spans:
+            return []
+        snap = MemoryReader.active_snapshot()
+        if snap is not None and all(snap.covers(addr, length) for addr, length in spans):
+            return [self.read(base) for base, _ in spans]
+        with MemoryReader.snapshot(spans):
+            return [self.read(base) for base, _ in spans]
+
+
+class Layouts:
+    """Registre des dispositions compilées, surchargeables par la section "layouts" du manifeste"""
+
+    _layouts: Dict[str, Layout] = {}
+
+    @staticmethod
+    def register(layout: Layout) -> Layout:
+        Layouts._layouts[layout.name] = layout
+        return layout
+
+    @staticmethod
+    def get(name: str) -> Layout:
+        return Layouts._layouts[name]
+
+    @staticmethod
+    def load_manifest(manifest: dict) -> None:
+        for name, spec in manifest.get("layouts", {}).items():
+            Layouts.register(Layout.from_spec(name, spec))
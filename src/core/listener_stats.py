@@ -0,0 +1,167 @@
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from .memory_reader import MemoryReader
+
+class Histogram:
+    """Histogramme de durées (secondes) à seaux fixes"""
+    __slots__ = ("counts", "count", "total", "max")
+
+    # Bornes supérieures des seaux ; le dernier seau reçoit tout ce qui les dépasse
+    BOUNDS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+    def __init__(self):
+        self.counts = [0] * (len(Histogram.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.counts[bisect.bisect_left(Histogram.BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p: float) -> float:
+        """Borne supérieure du seau contenant le p-ième centile (max au-delà de la dernière borne)"""
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return Histogram.BOUNDS[index] if index < len(Histogram.BOUNDS) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        labels = [f"<={bound * 1e3:g}ms" for bound in Histogram.BOUNDS] + [f">{Histogram.BOUNDS[-1] * 1e3:g}ms"]
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "buckets": {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+class HandlerStats:
+    """Mesures d'un handler des listeners"""
+    __slots__ = ("name", "duration", "detection", "runs", "errors", "reads", "bytes",
+                 "last_success", "last_read")
+
+    def __init__(self, name: str):
+        self.name = name
+        # Durée d'exécution
+        self.duration = Histogram()
+        # Délai estimé entre le changement d'une valeur en RAM et l'émission de l'événement
+        self.detection = Histogram()
+        self.runs = 0
+        self.errors = 0
+        # Appels au backend (dme) et octets lus
+        self.reads = 0
+        self.bytes = 0
+        # Fin (time.time) de la dernière exécution sans erreur
+        self.last_success: Optional[float] = None
+        # Horodatage de la lecture de la RAM de l'exécution précédente
+        self.last_read: Optional[float] = None
+
+    def to_dict(self, now: float) -> dict:
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "reads": self.reads,
+            "bytes": self.bytes,
+            "reads_per_run": self.reads / self.runs if self.runs else 0.0,
+            "bytes_per_run": self.bytes / self.runs if self.runs else 0.0,
+            "last_success_age": now - self.last_success if self.last_success is not None else None,
+            "duration": self.duration.to_dict(),
+            "detection": self.detection.to_dict(),
+        }
+
+class ListenerStats:
+    """
+    Instrumentation des handlers de MonopolyListeners : durées, lectures de la RAM,
+    âge de la dernière lecture réussie et délai de détection des changements.
+
+    Une valeur changée en RAM a changé entre la lecture précédente et la lecture
+    courante (horodatage du snapshot actif, sinon début du handler) : le délai de
+    détection d'un événement est estimé depuis le milieu de cet intervalle.
+    """
+
+    # Événements émis à chaque passage, qui ne correspondent pas à un changement
+    PERIODIC_EVENTS = frozenset(("loop_tick", "player_handling", "message_handling", "auction_handling"))
+
+    def __init__(self):
+        self.handlers: Dict[str, HandlerStats] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def handler(self, name: str) -> HandlerStats:
+        stats = self.handlers.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self.handlers.setdefault(name, HandlerStats(name))
+        return stats
+
+    def wrap(self, name: str, func: Callable[[], None]) -> Callable[[], None]:
+        """func mesurée à chaque appel sous le nom name"""
+        stats = self.handler(name)
+
+        def measured():
+            counters = MemoryReader.read_counters()
+            reads, read_bytes = counters
+            start = time.time()
+            begin = time.perf_counter()
+            self._local.running = (stats, start)
+            self._local.failed = False
+            try:
+                func()
+            except Exception:
+                stats.errors += 1
+                raise
+            else:
+                if self._local.failed:
+                    stats.errors += 1
+                else:
+                    stats.last_success = time.time()
+            finally:
+                self._local.running = None
+                stats.duration.add(time.perf_counter() - begin)
+                stats.runs += 1
+                stats.reads += counters[0] - reads
+                stats.bytes += counters[1] - read_bytes
+                # Une lecture échouée ne compte pas comme l'état précédent des diffs
+                if not self._local.failed:
+                    stats.last_read = start
+        return measured
+
+    def failed(self) -> None:
+        """Le handler mesuré en cours a échoué sans lever d'exception (erreur gérée par lui-même)"""
+        if getattr(self._local, "running", None) is not None:
+            self._local.failed = True
+
+    def detected(self, event_name: str) -> None:
+        """Enregistre le délai de détection d'un événement émis pendant un handler mesuré"""
+        running = getattr(self._local, "running", None)
+        if running is None or event_name in ListenerStats.PERIODIC_EVENTS:
+            return
+        stats, start = running
+        if stats.last_read is None:
+            # Premier passage : l'état précédent n'a pas été lu
+            return
+        snapshot = MemoryReader.active_snapshot()
+        read = snapshot.timestamp if snapshot is not None else start
+        stats.detection.add(max(0.0, time.time() - (stats.last_read + read) / 2))
+
+    def to_dict(self) -> dict:
+        now = time.time()
+        handlers = {name: stats.to_dict(now) for name, stats in list(self.handlers.items())}
+        successes = [stats.last_success for stats in self.handlers.values() if stats.last_success is not None]
+        return {
+            "last_success_age": now - max(successes) if successes else None,
+            "handlers": handlers,
+        }
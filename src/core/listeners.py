@@ -1,20 +1,258 @@
+import queue
+import threading
+import traceback
+from typing import Iterable, List, Optional
+
+
 class EventListeners:
+    # Profondeur d'une file au-delà de laquelle les événements périodiques sont abandonnés
+    QUEUE_SIZE = 1000
+    # Événements périodiques (émis à chaque passage, sans changement d'état) :
+    # seuls abandonnés quand une file est pleine ; les autres y sont toujours ajoutés
+    PERIODIC_EVENTS = frozenset()
+
     def __init__(self):
         self._listeners = {}
+        # Observateurs appelés par emit dans le thread émetteur (watch)
+        self._watchers = []
+        # Files des workers (None : callbacks appelés directement par emit)
+        self._queues: Optional[List[queue.Queue]] = None
+        self._queue_size = EventListeners.QUEUE_SIZE
+        self._workers: List[threading.Thread] = []
+        # Ajouts aux files et passage aux appels directs (stop_dispatcher) sérialisés
+        self._switch_lock = threading.RLock()
+        self._stats_lock = threading.Lock()
+        self.dispatched = 0
+        self.dropped = 0
+        self.max_depth = 0
+        # Regroupement des rafales d'événements (start_coalescing)
+        self._coalesce_window = 0.0
+        self._coalesced_events = frozenset()
+        # Types déjà regroupés au moins une fois : toujours traités par le worker des lots
+        self._batch_types = frozenset()
+        self._batch: list = []
+        self._batch_timer: Optional[threading.Timer] = None
+        self._batch_lock = threading.Lock()
+        # Un lot et l'événement qui le suit sont transmis dans l'ordre d'émission
+        self._order_lock = threading.RLock()
+        self.batches = 0
+        self.coalesced = 0
 
     def on(self, event_name, callback):
         if event_name not in self._listeners:
             self._listeners[event_name] = []
         self._listeners[event_name].append(callback)
-        
+
     def off(self, event_name, callback):
         if event_name in self._listeners:
             self._listeners[event_name].remove(callback)
 
+    def watch(self, callback):
+        """
+        callback(event_name, *args) est appelé par emit dans le thread qui émet,
+        avant les files et les lots : sans délai, pendant le snapshot du handler.
+        Réservé aux traitements courts (une exception remonte au handler).
+        """
+        self._watchers.append(callback)
+
+    def unwatch(self, callback):
+        if callback in self._watchers:
+            self._watchers.remove(callback)
+
     def emit(self, event_name, *args, **kwargs):
+        for callback in self._watchers:
+            callback(event_name, *args, **kwargs)
+        if event_name in self._coalesced_events:
+            self._coalesce(event_name, args, kwargs)
+            return
+        if self._coalesced_events and event_name not in self.PERIODIC_EVENTS \
+                and threading.current_thread() not in self._workers:
+            # Les changements regroupés en attente précèdent cet événement : le lot part d'abord
+            with self._order_lock:
+                self._flush_batch()
+                self._enqueue(event_name, args, kwargs)
+            return
+        self._enqueue(event_name, args, kwargs)
+
+    def _enqueue(self, event_name, args, kwargs):
+        with self._switch_lock:
+            queues = self._queues
+            if queues is not None:
+                events = queues[self._worker_index(event_name, len(queues))]
+                depth = events.qsize()
+                if event_name in self.PERIODIC_EVENTS and depth >= self._queue_size:
+                    # Un consommateur trop lent ne doit pas retarder la détection des changements
+                    with self._stats_lock:
+                        self.dropped += 1
+                    return
+                # Les changements d'état ne sont ni abandonnés ni attendus : la file n'est pas bornée
+                events.put_nowait((event_name, args, kwargs))
+                if depth + 1 > self.max_depth:
+                    with self._stats_lock:
+                        self.max_depth = max(self.max_depth, depth + 1)
+                return
+        self._dispatch(event_name, args, kwargs)
+
+    def _worker_index(self, event_name, workers: int) -> int:
+        """
+        Worker d'un type d'événement, toujours le même : ordre conservé. Le worker 0
+        traite les lots et les types regroupés, les autres se partagent le reste.
+        """
+        if workers == 1 or event_name in self._batch_types:
+            return 0
+        return 1 + hash(event_name) % (workers - 1)
+
+    def _dispatch(self, event_name, args, kwargs):
         if "*" in self._listeners:
-            for callback in self._listeners["*"]:
+            for callback in list(self._listeners["*"]):
                 callback(event_name, *args, **kwargs)
         if event_name in self._listeners:
-            for callback in self._listeners[event_name]:
+            for callback in list(self._listeners[event_name]):
                 callback(*args, **kwargs)
+
+    def start_coalescing(self, window: float, events: Iterable[str]):
+        """
+        Regroupe les événements de events arrivés dans une fenêtre de window secondes
+        (à partir du premier) en un lot : "batch_started" (taille), chaque événement
+        dans l'ordre d'émission, puis "batch_ended" (liste des (nom, args)). Un
+        consommateur peut ainsi appliquer tous les changements et sauvegarder une fois.
+        Les autres événements sont transmis sans attendre, après le lot en cours
+        s'il y en a un (sauf ceux de PERIODIC_EVENTS) : l'ordre d'émission est conservé
+        (avec plusieurs workers, seulement entre les lots et les types qu'ils contiennent).
+        """
+        self._coalesce_window = window
+        self._coalesced_events = frozenset(events)
+        self._batch_types = self._batch_types | self._coalesced_events
+
+    def stop_coalescing(self):
+        self._coalesced_events = frozenset()
+        self._flush_batch()
+
+    def _coalesce(self, event_name, args, kwargs):
+        with self._batch_lock:
+            self._batch.append((event_name, args, kwargs))
+            if self._batch_timer is None:
+                self._batch_timer = threading.Timer(self._coalesce_window, self._flush_batch)
+                self._batch_timer.daemon = True
+                self._batch_timer.start()
+
+    def _flush_batch(self):
+        with self._order_lock:
+            with self._batch_lock:
+                batch, self._batch = self._batch, []
+                if self._batch_timer is not None:
+                    self._batch_timer.cancel()
+                    self._batch_timer = None
+                if not batch:
+                    return
+                self.batches += 1
+                self.coalesced += len(batch)
+            with self._switch_lock:
+                queues = self._queues
+                if queues is not None:
+                    # Lots et types regroupés passent par le worker 0 : ordre conservé pour ces types
+                    queues[0].put_nowait((None, (batch,), {}))
+                    return
+            self._dispatch_batch(batch)
+
+    def _dispatch_batch(self, batch):
+        # Une erreur d'un callback (batch_started compris) n'interrompt pas le lot,
+        # qui se termine toujours par batch_ended
+        try:
+            for event_name, args, kwargs in [("batch_started", (len(batch),), {})] + batch:
+                try:
+                    self._dispatch(event_name, args, kwargs)
+                except Exception:
+                    traceback.print_exc()
+        finally:
+            self._dispatch("batch_ended", ([(event_name, args) for event_name, args, _ in batch],), {})
+
+    def start_dispatcher(self, workers: int = 1, queue_size: int = QUEUE_SIZE):
+        """
+        Passe en mode asynchrone : emit met l'événement dans une file, vidée par des
+        threads workers, sans jamais attendre. L'ordre des événements d'un même type
+        est conservé ; au-delà de queue_size événements en attente, ceux de
+        PERIODIC_EVENTS sont abandonnés et comptés dans dropped, les autres sont
+        toujours ajoutés (max_depth mesure le retard des consommateurs).
+        """
+        with self._switch_lock:
+            if self._queues is not None:
+                return
+            queues = [queue.Queue() for _ in range(workers)]
+            self._queue_size = queue_size
+            self._workers = []
+            for index, events in enumerate(queues):
+                worker = threading.Thread(target=self._drain, args=(events,), name=f"EventListeners-{index}")
+                worker.daemon = True
+                worker.start()
+                self._workers.append(worker)
+            self._queues = queues
+
+    def stop_dispatcher(self):
+        """
+        Traite les événements en attente, y compris ceux émis pendant l'arrêt, puis
+        revient aux appels directs : un événement n'est jamais traité avant un plus ancien.
+        """
+        if self._queues is None:
+            return
+        self._flush_batch()
+        in_worker = threading.current_thread() in self._workers
+        while True:
+            if not in_worker:
+                for events in self._queues:
+                    events.join()
+            with self._switch_lock:
+                queues = self._queues
+                if queues is None:
+                    return
+                # Les files restent utilisées tant qu'un événement y attend encore
+                if in_worker or all(events.unfinished_tasks == 0 for events in queues):
+                    self._queues = None
+                    break
+        for events in queues:
+            events.put(None)
+        for worker in self._workers:
+            if worker is not threading.current_thread():
+                worker.join()
+        self._workers = []
+
+    def flush(self):
+        """Attend que tous les événements déjà émis aient été traités (à ne pas appeler depuis un callback)"""
+        self._flush_batch()
+        for events in self._queues or []:
+            events.join()
+
+    def _drain(self, events: queue.Queue):
+        while True:
+            item = events.get()
+            try:
+                if item is None:
+                    return
+                event_name, args, kwargs = item
+                try:
+                    if event_name is None:
+                        self._dispatch_batch(args[0])
+                    else:
+                        self._dispatch(event_name, args, kwargs)
+                except Exception:
+                    # Une erreur d'un callback ne doit pas arrêter le worker
+                    traceback.print_exc()
+                with self._stats_lock:
+                    self.dispatched += 1
+            finally:
+                events.task_done()
+
+    def dispatch_stats(self) -> dict:
+        """Profondeur des files, événements traités et abandonnés, lots regroupés"""
+        queues = self._queues or []
+        return {
+            "async": self._queues is not None,
+            "workers": len(queues),
+            "depth": sum(events.qsize() for events in queues),
+            "max_depth": self.max_depth,
+            "dispatched": self.dispatched,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "coalesced": self.coalesced,
+            "average_batch": self.coalesced / self.batches if self.batches else 0.0,
+        }
@@ -0,0 +1,133 @@
+import mmap
+import os
+from typing import BinaryIO, Optional, Protocol, runtime_checkable
+
+# Tailles physiques de la RAM Wii
+MEM1_SIZE = 0x01800000
+MEM2_SIZE = 0x04000000
+# Adresses physiques de MEM1 / MEM2 (0x80…/0xC0… -> 0x0…, 0x90…/0xD0… -> 0x10…)
+MEM1_PHYSICAL = 0x00000000
+MEM2_PHYSICAL = 0x10000000
+
+@runtime_checkable
+class MemoryBackend(Protocol):
+    """Source de la RAM du jeu utilisée par MemoryReader"""
+
+    def hook(self) -> None: ...
+
+    def is_hooked(self) -> bool: ...
+
+    def read_bytes(self, addr: int, length: int) -> bytes: ...
+
+    def write_bytes(self, addr: int, data: bytes) -> None: ...
+
+
+class DolphinBackend:
+    """RAM d'un émulateur Dolphin en cours d'exécution, via dolphin_memory_engine"""
+
+    def __init__(self):
+        self._dme = None
+
+    @property
+    def dme(self):
+        # Import paresseux : le reste de src/ doit rester utilisable sans Dolphin
+        if self._dme is None:
+            import dolphin_memory_engine
+            self._dme = dolphin_memory_engine
+        return self._dme
+
+    def hook(self) -> None:
+        self.dme.hook()
+
+    def is_hooked(self) -> bool:
+        return self.dme.is_hooked()
+
+    def unhook(self) -> None:
+        self.dme.un_hook()
+
+    def read_bytes(self, addr: int, length: int) -> bytes:
+        return self.dme.read_bytes(addr, length)
+
+    def write_bytes(self, addr: int, data: bytes) -> None:
+        self.dme.write_bytes(addr, data)
+
+
+class DumpBackend:
+    """
+    RAM lue depuis un dump brut, projeté en mémoire (mmap).
+
+    Le fichier contient MEM1 (24 Mo) éventuellement suivi de MEM2 (64 Mo), ou bien
+    MEM1 et MEM2 sont fournis dans deux fichiers séparés (mem1.raw / mem2.raw de
+    Dolphin). Les écritures restent privées au processus : le dump n'est jamais modifié.
+    """
+
+    def __init__(self, path: str, mem2_path: Optional[str] = None):
+        self._files = []
+        # (début physique, taille, mmap, offset dans le fichier)
+        self._regions = []
+        if mem2_path is None:
+            mapped = self._map(path)
+            self._regions.append((MEM1_PHYSICAL, min(len(mapped), MEM1_SIZE), mapped, 0))
+            if len(mapped) > MEM1_SIZE:
+                self._regions.append((MEM2_PHYSICAL, min(len(mapped) - MEM1_SIZE, MEM2_SIZE), mapped, MEM1_SIZE))
+        else:
+            mem1 = self._map(path)
+            mem2 = self._map(mem2_path)
+            self._regions.append((MEM1_PHYSICAL, min(len(mem1), MEM1_SIZE), mem1, 0))
+            self._regions.append((MEM2_PHYSICAL, min(len(mem2), MEM2_SIZE), mem2, 0))
+
+    def _map(self, path: str) -> mmap.mmap:
+        f = open(path, "rb")
+        self._files.append(f)
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    @staticmethod
+    def to_physical(addr: int) -> int:
+        return addr & 0x3FFFFFFF
+
+    def _translate(self, addr: int, length: int):
+        """Renvoie (mmap, offset) pour une adresse virtuelle Wii"""
+        physical = DumpBackend.to_physical(addr)
+        for start, size, mapped, file_offset in self._regions:
+            if start <= physical and physical + length <= start + size:
+                return mapped, file_offset + physical - start
+        raise RuntimeError(f"Could not read memory at 0x{addr:08X} (length {length}) from dump")
+
+    def hook(self) -> None:
+        pass
+
+    def is_hooked(self) -> bool:
+        return bool(self._regions)
+
+    def read_bytes(self, addr: int, length: int) -> bytes:
+        mapped, offset = self._translate(addr, length)
+        return mapped[offset:offset + length]
+
+    def write_bytes(self, addr: int, data: bytes) -> None:
+        mapped, offset = self._translate(addr, len(data))
+        mapped[offset:offset + len(data)] = data
+
+    def close(self) -> None:
+        for _, _, mapped, _ in self._regions:
+            if not mapped.closed:
+                mapped.close()
+        for f in self._files:
+            f.close()
+        self._regions = []
+
+    @staticmethod
+    def record(path: str, source: Optional[MemoryBackend] = None, chunk_size: int = 0x100000) -> str:
+        """Enregistre MEM1 puis MEM2 depuis source (Dolphin par défaut) dans un dump unique"""
+        source = source or DolphinBackend()
+        if not source.is_hooked():
+            source.hook()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "wb") as f:
+            for base, size in ((0x80000000, MEM1_SIZE), (0x90000000, MEM2_SIZE)):
+                DumpBackend._copy(source, f, base, size, chunk_size)
+        return path
+
+    @staticmethod
+    def _copy(source: MemoryBackend, f: BinaryIO, base: int, size: int, chunk_size: int) -> None:
+        for offset in range(0, size, chunk_size):
+            f.write(source.read_bytes(base + offset, min(chunk_size, size - offset)))
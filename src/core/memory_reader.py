@@ -1,53 +1,198 @@
-import dolphin_memory_engine as dme
-from typing import Union
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Union
+from .memory_backend import DolphinBackend, MemoryBackend, MEM1_SIZE, MEM2_SIZE
+from .memory_snapshot import MemorySnapshot, Span
 
 Hex = Union[str, int]
 
+# Plages de RAM adressables de la Wii (adresse virtuelle, taille)
+MEM1 = (0x80000000, MEM1_SIZE)
+MEM2 = (0x90000000, MEM2_SIZE)
+
 class MemoryReader:
     
+    # Source de la RAM (Dolphin par défaut, ou un dump via DumpBackend)
+    _backend: MemoryBackend = DolphinBackend()
+    
+    # Pile des snapshots actifs, propre à chaque thread
+    _local = threading.local()
+    
+    # Taille (en caractères) du premier bloc lu par get_string, doublée ensuite
+    STRING_BLOCK = 64
+    # Caractères lus en même temps que le préfixe de longueur dans get_str
+    STR_PREFETCH = 32
+    # Au-delà, la longueur lue est jugée suspecte et on lit par blocs croissants
+    STR_MAX_EXACT = 0x1000
+    
     @staticmethod
     def hex_to_int(value: Hex) -> int:
         return int(value, 16) if isinstance(value, str) else value
     
+    @staticmethod
+    def set_backend(backend: MemoryBackend) -> None:
+        MemoryReader._backend = backend
+    
+    @staticmethod
+    def get_backend() -> MemoryBackend:
+        return MemoryReader._backend
+    
+    @staticmethod
+    def is_ram_address(addr: int, length: int = 1) -> bool:
+        """Vérifie que la plage [addr, addr + length) est dans MEM1 ou MEM2"""
+        return any(start <= addr and addr + length <= start + size for start, size in (MEM1, MEM2))
+    
+    @staticmethod
+    def _snapshots() -> list:
+        stack = getattr(MemoryReader._local, "snapshots", None)
+        if stack is None:
+            stack = MemoryReader._local.snapshots = []
+        return stack
+    
+    @staticmethod
+    def read_counters() -> List[int]:
+        """[appels, octets] lus dans le backend par le thread courant (compteurs cumulés)"""
+        counters = getattr(MemoryReader._local, "reads", None)
+        if counters is None:
+            counters = MemoryReader._local.reads = [0, 0]
+        return counters
+    
+    @staticmethod
+    def _backend_read(addr: int, length: int) -> bytes:
+        counters = MemoryReader.read_counters()
+        counters[0] += 1
+        counters[1] += length
+        return MemoryReader._backend.read_bytes(addr, length)
+    
+    @staticmethod
+    @contextmanager
+    def snapshot(spans: Iterable[Span]) -> Iterator[MemorySnapshot]:
+        """
+        Lit les plages (adresse, longueur) en une fois et sert toutes les lectures
+        couvertes depuis ce snapshot tant que le bloc `with` est actif (thread courant).
+        Les lectures hors snapshot retombent sur la RAM.
+        """
+        snap = MemorySnapshot(spans, MemoryReader._backend_read)
+        stack = MemoryReader._snapshots()
+        stack.append(snap)
+        try:
+            yield snap
+        finally:
+            stack.remove(snap)
+    
+    @staticmethod
+    def active_snapshot() -> Union[MemorySnapshot, None]:
+        stack = MemoryReader._snapshots()
+        return stack[-1] if stack else None
+    
+    @staticmethod
+    def _read(addr: int, length: int) -> Union[bytes, memoryview]:
+        for snap in reversed(MemoryReader._snapshots()):
+            view = snap.view(addr, length)
+            if view is not None:
+                return view
+        return MemoryReader._backend_read(addr, length)
+    
+    @staticmethod
+    def _write(addr: int, data: bytes) -> None:
+        MemoryReader._backend.write_bytes(addr, data)
+        for snap in MemoryReader._snapshots():
+            snap.patch(addr, data)
+    
     @staticmethod
     def set_string(addr: Hex, str: str, byteorder: str = "big") -> None:
-        dme.write_bytes(MemoryReader.hex_to_int(addr), str.encode("utf-16-le" if byteorder == "little" else "utf-16-be") + b'\x00\x00')
+        MemoryReader._write(MemoryReader.hex_to_int(addr), str.encode("utf-16-le" if byteorder == "little" else "utf-16-be") + b'\x00\x00')
 
     @staticmethod
-    def get_string(addr: Hex, max_length = 1024, byteorder: str = "big") -> str:
-        string = ""
-        parsed_addr = MemoryReader.hex_to_int(addr)
-        # Désactiver les logs pour éviter le spam
-        # print(f"[DEBUG MemoryReader] Reading string from address 0x{parsed_addr:08X}, byteorder={byteorder}")
-        i = 0
-        while i < max_length:
-            char = dme.read_bytes(parsed_addr, 2)
-            if char == b"\x00\x00":
-                break
-            try:
-                decoded = char.decode("utf-16-le" if byteorder == "little" else "utf-16-be")
-                string += decoded
-                # Désactiver les logs verbeux
-                # if i < 10:  # Log first few chars
-                #     print(f"[DEBUG MemoryReader] Char {i}: {char.hex()} -> '{decoded}'")
-            except Exception as e:
-                string += "?"
-                # Désactiver les logs d'erreur qui spamment
-                # print(f"[DEBUG MemoryReader] Failed to decode char at offset {i}: {char.hex()}, error: {e}")
-            parsed_addr += 2
-            i += 1
-        # Désactiver le log final
-        # print(f"[DEBUG MemoryReader] Final string: '{string}' (length: {len(string)})")
-        return string
+    def _block_size(addr: int, size: int) -> int:
+        """
+        Réduit un bloc de lecture spéculative pour qu'il reste dans le snapshot actif
+        qui couvre addr, ou dans la plage MEM1/MEM2 qui le contient.
+        """
+        for snap in reversed(MemoryReader._snapshots()):
+            available = snap.available(addr)
+            if available >= 2:
+                return min(size, available - available % 2)
+        for start, ram_size in (MEM1, MEM2):
+            if start <= addr < start + ram_size:
+                available = start + ram_size - addr
+                return min(size, available - available % 2)
+        return size
     
+    @staticmethod
+    def find_terminator(data: bytes, start: int = 0) -> int:
+        """Position du premier 0x0000 aligné sur 2 octets, ou -1"""
+        index = data.find(b"\x00\x00", start)
+        while index != -1 and index % 2:
+            index = data.find(b"\x00\x00", index + 1)
+        return index
+    
+    @staticmethod
+    def decode_utf16(data: bytes, byteorder: str = "big") -> str:
+        """Décode un bloc UTF-16 ; les unités invalides sont remplacées par '?'"""
+        encoding = "utf-16-le" if byteorder == "little" else "utf-16-be"
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            # Même rendu que l'ancien décodage caractère par caractère
+            chars = []
+            for i in range(0, len(data) - 1, 2):
+                try:
+                    chars.append(data[i:i + 2].decode(encoding))
+                except UnicodeDecodeError:
+                    chars.append("?")
+            return "".join(chars)
+    
+    @staticmethod
+    def _read_utf16(addr: int, max_length: int, byteorder: str, prefix: bytes = b"", block: int = 0) -> str:
+        """
+        Lit une chaîne UTF-16 terminée par 0x0000 (au plus max_length caractères) par
+        blocs de taille croissante, en réutilisant les octets déjà lus dans prefix.
+        """
+        limit = 2 * max_length
+        data = prefix[:limit - limit % 2]
+        end = MemoryReader.find_terminator(data)
+        if end != -1:
+            return MemoryReader.decode_utf16(data[:end], byteorder)
+        
+        chunks = [data]
+        read = len(data)
+        block = block or 2 * MemoryReader.STRING_BLOCK
+        while read < limit:
+            size = MemoryReader._block_size(addr + read, min(block, limit - read))
+            if size <= 0:
+                break
+            chunk = bytes(MemoryReader._read(addr + read, size))
+            end = MemoryReader.find_terminator(chunk)
+            if end != -1:
+                chunks.append(chunk[:end])
+                break
+            chunks.append(chunk)
+            read += size
+            block *= 2
+        return MemoryReader.decode_utf16(b"".join(chunks), byteorder)
+
+    @staticmethod
+    def get_string(addr: Hex, max_length = 1024, byteorder: str = "big") -> str:
+        if max_length <= 0:
+            return ""
+        return MemoryReader._read_utf16(MemoryReader.hex_to_int(addr), max_length, byteorder)
     
     @staticmethod
     def get_str(addr: Hex) -> str:
-        return MemoryReader.get_string(
-            MemoryReader.hex_to_int(addr) + 4, 
-            MemoryReader.get_i32(addr), 
-            "big"
-        )
+        """
+        Lit une chaîne préfixée par sa longueur (i32). Le préfixe et les premiers
+        caractères sont lus ensemble : une chaîne courte ne coûte qu'un appel, une
+        chaîne plus longue un second appel de exactement 2 * len - déjà lus octets.
+        """
+        parsed_addr = MemoryReader.hex_to_int(addr)
+        head = bytes(MemoryReader._read(parsed_addr, max(4, MemoryReader._block_size(parsed_addr, 4 + 2 * MemoryReader.STR_PREFETCH))))
+        length = int.from_bytes(head[:4], "big")
+        if length <= 0:
+            return ""
+        prefix = head[4:]
+        block = 2 * length - len(prefix) if length <= MemoryReader.STR_MAX_EXACT else 0
+        return MemoryReader._read_utf16(parsed_addr + 4, length, "big", prefix, block)
     
     @staticmethod
     def set_str(addr: Hex, value: str) -> None:
@@ -57,35 +202,40 @@ class MemoryReader:
     
     @staticmethod
     def set_i16(addr: Hex, value: int, byteorder = "big") -> None:
-        dme.write_bytes(MemoryReader.hex_to_int(addr), value.to_bytes(2, byteorder))
+        MemoryReader._write(MemoryReader.hex_to_int(addr), value.to_bytes(2, byteorder))
         
     @staticmethod
     def get_i16(addr: int, byteorder = "big") -> int:
-        return int.from_bytes(dme.read_bytes(MemoryReader.hex_to_int(addr), 2), byteorder)
+        return int.from_bytes(MemoryReader._read(MemoryReader.hex_to_int(addr), 2), byteorder)
     
     @staticmethod
     def set_i32(addr: int, value: int, byteorder = "big") -> None:
-        dme.write_bytes(MemoryReader.hex_to_int(addr), value.to_bytes(4, byteorder))
+        MemoryReader._write(MemoryReader.hex_to_int(addr), value.to_bytes(4, byteorder))
 
     @staticmethod
     def get_i32(addr: int, byteorder = "big") -> int:
-        return int.from_bytes(dme.read_bytes(MemoryReader.hex_to_int(addr), 4), byteorder)
+        return int.from_bytes(MemoryReader._read(MemoryReader.hex_to_int(addr), 4), byteorder)
     
     @staticmethod
     def get_byte(addr: int, byteorder = "big") -> int:
-        return int.from_bytes(dme.read_bytes(MemoryReader.hex_to_int(addr), 1), byteorder)
+        return int.from_bytes(MemoryReader._read(MemoryReader.hex_to_int(addr), 1), byteorder)
 
     @staticmethod
     def set_byte(addr: int, value: int, byteorder = "big") -> None:
-        dme.write_bytes(MemoryReader.hex_to_int(addr), value.to_bytes(1, byteorder))
+        MemoryReader._write(MemoryReader.hex_to_int(addr), value.to_bytes(1, byteorder))
         
     @staticmethod
     def get_bytes(addr: int, length: int) -> bytes:
-        return dme.read_bytes(MemoryReader.hex_to_int(addr), length)
+        return bytes(MemoryReader._read(MemoryReader.hex_to_int(addr), length))
+    
+    @staticmethod
+    def get_view(addr: int, length: int) -> memoryview:
+        """Comme get_bytes, mais sans copie quand la plage est dans le snapshot actif"""
+        return memoryview(MemoryReader._read(MemoryReader.hex_to_int(addr), length))
     
     @staticmethod
     def set_bytes(addr: int, value: bytes) -> None:
-        dme.write_bytes(MemoryReader.hex_to_int(addr), value)
+        MemoryReader._write(MemoryReader.hex_to_int(addr), value)
     
     @staticmethod
     def check_you_owe(addr: Hex = 0x90083E99) -> bool:
@@ -99,7 +249,7 @@ class MemoryReader:
             scan_range = 0x100
             
             # Lire toute la plage en une seule fois
-            chunk = dme.read_bytes(base_addr, scan_range)
+            chunk = MemoryReader.get_bytes(base_addr, scan_range)
             
             # Chercher "You owe" en UTF-16LE dans le chunk
             search_pattern = "You owe".encode("utf-16-le")
@@ -0,0 +1,87 @@
+import bisect
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+
+# (adresse, longueur)
+Span = Tuple[int, int]
+
+class MemorySnapshot:
+    """Copie figée de plusieurs plages de RAM lue une seule fois par tick.
+
+    Les plages demandées sont triées et fusionnées, lues avec un appel par plage
+    contiguë puis concaténées dans un unique buffer. Les lectures couvertes sont
+    servies sous forme de tranches `memoryview` (aucune copie).
+    """
+
+    def __init__(self, spans: Iterable[Span], read: Callable[[int, int], bytes]):
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._offsets: List[int] = []
+
+        merged = MemorySnapshot.merge_spans(spans)
+        self._buffer = bytearray(sum(end - start for start, end in merged))
+        self._view = memoryview(self._buffer)
+
+        offset = 0
+        for start, end in merged:
+            self._buffer[offset:offset + end - start] = read(start, end - start)
+            self._starts.append(start)
+            self._ends.append(end)
+            self._offsets.append(offset)
+            offset += end - start
+
+        self.reads = len(merged)
+        self.timestamp = time.time()
+
+    @staticmethod
+    def merge_spans(spans: Iterable[Span]) -> List[Tuple[int, int]]:
+        """Fusionne les plages (adresse, longueur) qui se chevauchent ou se touchent en (début, fin)"""
+        merged: List[List[int]] = []
+        for start, end in sorted((addr, addr + length) for addr, length in spans if length > 0):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        return [(start, end) for start, end in merged]
+
+    @property
+    def size(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def spans(self) -> List[Tuple[int, int]]:
+        return list(zip(self._starts, self._ends))
+
+    def _locate(self, addr: int, length: int) -> int:
+        i = bisect.bisect_right(self._starts, addr) - 1
+        if i < 0 or addr + length > self._ends[i]:
+            return -1
+        return self._offsets[i] + addr - self._starts[i]
+
+    def available(self, addr: int) -> int:
+        """Nombre d'octets contigus disponibles dans le snapshot à partir de addr"""
+        i = bisect.bisect_right(self._starts, addr) - 1
+        if i < 0 or addr >= self._ends[i]:
+            return 0
+        return self._ends[i] - addr
+
+    def covers(self, addr: int, length: int) -> bool:
+        return self._locate(addr, length) != -1
+
+    def view(self, addr: int, length: int) -> Optional[memoryview]:
+        """Renvoie une tranche du buffer, ou None si la plage n'est pas couverte"""
+        offset = self._locate(addr, length)
+        if offset == -1:
+            return None
+        return self._view[offset:offset + length]
+
+    def patch(self, addr: int, data: bytes) -> None:
+        """Répercute une écriture en RAM sur les parties couvertes du snapshot"""
+        end = addr + len(data)
+        i = max(bisect.bisect_right(self._starts, addr) - 1, 0)
+        while i < len(self._starts) and self._starts[i] < end:
+            lo, hi = max(addr, self._starts[i]), min(end, self._ends[i])
+            if lo < hi:
+                offset = self._offsets[i] + lo - self._starts[i]
+                self._buffer[offset:offset + hi - lo] = data[lo - addr:hi - addr]
+            i += 1
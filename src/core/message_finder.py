@@ -1,71 +1,132 @@
-from typing import List
+from typing import Dict, List, Optional, Tuple
 import re
+import weakref
 from .memory_reader import MemoryReader
+from .message_scanner import MessageScanner
+from .page_tracker import PageTracker
 from ..game.monopoly import MonopolyGame
-from .game_loader import GameLoader
+
+class MessageMatch:
+    """Correspondance d'un événement dans la zone des messages (offset relatif à la zone)"""
+    __slots__ = ("start", "end", "text")
+    
+    def __init__(self, start: int, end: int, text: str):
+        self.start = start
+        self.end = end
+        self.text = text
+    
+    @property
+    def extent(self) -> Tuple[int, int]:
+        """Octets dont dépend la correspondance : préfixe de longueur, chaîne et terminateur"""
+        return (self.start - 4, max(self.end, self.start + 2 * len(self.text) + 2))
+
+class MessageScan:
+    """État d'un scan des messages conservé d'un tick à l'autre pour une partie"""
+    
+    def __init__(self):
+        self.tracker = PageTracker()
+        # index de l'événement -> (motif compilé, correspondances triées par offset)
+        self.events: Dict[int, Tuple[bytes, List[MessageMatch]]] = {}
+        # Motifs compilés de tous les événements (MessageScanner)
+        self.scanner: Optional[MessageScanner] = None
 
 class MessageFinder:
     
+    _scans = weakref.WeakKeyDictionary()
+    
     def byte_process_player_names(game: MonopolyGame, text: str, args: List[str]) -> str:
         return b"(?:" + b"|".join([player.name.encode("utf-16-be") for player in game.players]) + b")"
     
     @staticmethod
     def messages(game: MonopolyGame) -> List[dict]:
-        address_range: List[int, int] = list(map(GameLoader.to_hex, game.data.manifest["messages"]["address_range"]))
-        memory_dump = MemoryReader.get_bytes(address_range[0], address_range[1] - address_range[0])
+        address_range = game.data.manifest.messages_range
+        size = address_range[1] - address_range[0]
+        
+        memory_dump = MemoryReader.get_bytes(address_range[0], size)
+        return MessageFinder._messages(game, address_range[0], memory_dump)
+    
+    @staticmethod
+    def _scan_state(game: MonopolyGame) -> MessageScan:
+        scan = MessageFinder._scans.get(game)
+        if scan is None:
+            scan = MessageFinder._scans[game] = MessageScan()
+        return scan
+    
+    @staticmethod
+    def event_pattern(game: MonopolyGame, event: dict) -> bytes:
+        """Motif regex (octets UTF-16-BE) d'un événement du manifeste"""
+        # get the text to search
+        str_text = MemoryReader.get_str(event["address"]) if event["type"] == "address" else event["pattern"]
+        
+        # convert regex symbols to true symbols (for the regext not use ? as a regex symbol)
+        
+        if "string_replace" in event:
+            for key, value in event["string_replace"].items():
+                split = value.split(":")
+                if split[0] == "value":
+                    str_text = str_text.replace(key, "".join(split[1:]))
+                elif split[0] == "process":
+                    value = getattr(MessageFinder, "string_process_" + split[1])(game, str_text, split[2:])
+                    str_text = str_text.replace(key, value)
+        
+        # convert string to bytes
+        byte_text = str_text.encode("utf-16-be")
+        
+        # Escape special regex characters in byte_text
+        byte_text = re.escape(byte_text)
+        
+        if "byte_replace" in event:
+            for key, value in event["byte_replace"].items():
+                split = value.split(":")
+                if split[0] == "value":
+                    byte_text = byte_text.replace(key.encode("utf-16-be"), "".join(split[1:]).encode("utf-8"))
+                elif split[0] == "process":
+                    value = getattr(MessageFinder, "byte_process_" + split[1])(game, str_text, split[2:])
+                    byte_text = byte_text.replace(key.encode("utf-16-be"), value)
+            
+        # Replace all occurrences of %<number> with (.*) using regex
+        return re.sub(b'\x00%\x00\d', b'(.+)', byte_text)
+    
+    @staticmethod
+    def scanner(game: MonopolyGame) -> MessageScanner:
+        """
+        Scanner des motifs de tous les événements, reconstruit seulement quand un motif
+        change (noms des joueurs, textes lus en RAM ou manifeste)
+        """
+        scan = MessageFinder._scan_state(game)
+        patterns = tuple(MessageFinder.event_pattern(game, event) for event in game.data.manifest.events)
+        if scan.scanner is None or scan.scanner.key != patterns:
+            scan.scanner = MessageScanner(patterns)
+        return scan.scanner
+    
+    @staticmethod
+    def _messages(game: MonopolyGame, base: int, memory_dump: bytes) -> List[dict]:
+        scan = MessageFinder._scan_state(game)
+        scan.tracker.update(memory_dump)
+        scanner = MessageFinder.scanner(game)
+        
+        # Une seule passe pour tous les événements à rechercher dans toute la zone
+        full = [
+            index for index, pattern in enumerate(scanner.patterns)
+            if pattern is not None and (
+                scan.tracker.is_full() or index not in scan.events or scan.events[index][0] != pattern.pattern
+            )
+        ]
+        full_spans = scanner.scan(memory_dump, full) if full else {}
         
         results = []
              
         # for each event in the manifest
-        for event in game.data.manifest["messages"]["events"]:
-            
-            # get the text to search
-            str_text = MemoryReader.get_str(event["address"]) if event["type"] == "address" else event["pattern"]
-            
-            # convert regex symbols to true symbols (for the regext not use ? as a regex symbol)
-            
-            if "string_replace" in event:
-                for key, value in event["string_replace"].items():
-                    split = value.split(":")
-                    if split[0] == "value":
-                        str_text = str_text.replace(key, "".join(split[1:]))
-                    elif split[0] == "process":
-                        value = getattr(MessageFinder, "string_process_" + split[1])(game, str_text, split[2:])
-                        str_text = str_text.replace(key, value)
-            
-            # convert string to bytes
-            byte_text = str_text.encode("utf-16-be")
-            
-            # Escape special regex characters in byte_text
-            byte_text = re.escape(byte_text)
-            
-            if "byte_replace" in event:
-                for key, value in event["byte_replace"].items():
-                    split = value.split(":")
-                    if split[0] == "value":
-                        byte_text = byte_text.replace(key.encode("utf-16-be"), "".join(split[1:]).encode("utf-8"))
-                    elif split[0] == "process":
-                        value = getattr(MessageFinder, "byte_process_" + split[1])(game, str_text, split[2:])
-                        byte_text = byte_text.replace(key.encode("utf-16-be"), value)
-                
-            # Replace all occurrences of %<number> with (.*) using regex
-            byte_text = re.sub(b'\x00%\x00\d', b'(.+)', byte_text)
-            
-            # convert pattern to regex
-            try:
-                pattern = re.compile(byte_text)
-            except:
+        for event_index, event in enumerate(game.data.manifest.events):
+            pattern = scanner.patterns[event_index]
+            if pattern is None:
                 continue
-            # find all matches
-            address = []
-            
-            # for each match, get the address and the text
-            for match in pattern.finditer(memory_dump):
-                index = address_range[0] + match.start() - 4
-                address.append({
-                    "address": hex(index),
-                    "text": MemoryReader.get_str(index)
-                })
+            # find all matches (seules les pages modifiées depuis le tick précédent sont relues)
+            matches = MessageFinder._find(scan, event_index, pattern, memory_dump, base, full_spans.get(event_index))
+            address = [
+                {"address": hex(base + match.start - 4), "text": match.text}
+                for match in matches
+            ]
     
                 
             results.append({
@@ -74,4 +135,126 @@ class MessageFinder:
                 "data": address
             })
                   
-        return results
\ No newline at end of file
+        return results
+
+    @staticmethod
+    def decode_str(memory_dump: bytes, offset: int, base: int) -> str:
+        """
+        Comme MemoryReader.get_str(base + offset), mais lu dans memory_dump : préfixe de
+        longueur puis texte UTF-16-BE. La RAM n'est relue que si la chaîne sort de la zone.
+        """
+        if offset < 0 or offset + 4 > len(memory_dump):
+            return MemoryReader.get_str(base + offset)
+        length = int.from_bytes(memory_dump[offset:offset + 4], "big")
+        if length <= 0:
+            return ""
+        start = offset + 4
+        end = start + 2 * length
+        data = memory_dump[start:min(end, len(memory_dump))]
+        terminator = MemoryReader.find_terminator(data)
+        if terminator != -1:
+            return MemoryReader.decode_utf16(data[:terminator])
+        if end > len(memory_dump):
+            # La chaîne continue au-delà de la zone lue
+            return MemoryReader.get_str(base + offset)
+        return MemoryReader.decode_utf16(data)
+    
+    @staticmethod
+    def _match_at(memory_dump: bytes, start: int, end: int, base: int) -> MessageMatch:
+        return MessageMatch(start, end, MessageFinder.decode_str(memory_dump, start - 4, base))
+    
+    @staticmethod
+    def _match(memory_dump: bytes, match: re.Match, base: int) -> MessageMatch:
+        return MessageFinder._match_at(memory_dump, match.start(), match.end(), base)
+    
+    @staticmethod
+    def _find(scan: MessageScan, event_index: int, pattern: re.Pattern, memory_dump: bytes, base: int,
+              full_spans: Optional[List[Tuple[int, int]]] = None) -> List[MessageMatch]:
+        """
+        Correspondances de pattern dans la zone. Les correspondances des pages propres
+        sont reprises du tick précédent ; seules les positions dont le résultat peut
+        dépendre d'une page modifiée sont relues par la regex.
+        
+        Une correspondance examine au plus la longueur du motif, et pour un motif
+        contenant (.+) jusqu'au premier retour à la ligne (que . ne traverse pas)
+        plus la longueur du motif.
+        """
+        tracker = scan.tracker
+        previous = scan.events.get(event_index)
+        if previous is None or previous[0] != pattern.pattern or tracker.is_full():
+            if full_spans is None:
+                full_spans = [match.span() for match in pattern.finditer(memory_dump)]
+            matches = [MessageFinder._match_at(memory_dump, start, end, base) for start, end in full_spans]
+            scan.events[event_index] = (pattern.pattern, matches)
+            return matches
+        
+        old = previous[1]
+        if not tracker.dirty:
+            return old
+        
+        margin = len(pattern.pattern)
+        greedy = b"(.+)" in pattern.pattern
+        size = len(memory_dump)
+        
+        def reach(pos: int) -> int:
+            """Fin des octets examinés par une correspondance qui commence avant pos"""
+            if greedy:
+                newline = memory_dump.find(b"\n", pos)
+                pos = size if newline == -1 else newline
+            return min(pos + margin, size)
+        
+        def first_start(pos: int) -> int:
+            """Premier début de correspondance pouvant examiner l'octet pos"""
+            pos -= margin
+            if pos < 0:
+                return 0
+            return memory_dump.rfind(b"\n", 0, pos + 1) + 1 if greedy else pos
+        
+        # Débuts de correspondance à réexaminer à cause d'une page modifiée, plus le
+        # début de toute correspondance précédente dont les octets examinés y touchent
+        starts = [(first_start(start), end) for start, end in tracker.dirty]
+        starts.extend(
+            (match.start, match.start + 1) for match in old
+            if tracker.intersects(match.start, max(match.end, reach(match.start)))
+        )
+        regions: List[List[int]] = []
+        for lo, hi in sorted(starts):
+            if regions and lo <= regions[-1][1]:
+                regions[-1][1] = max(regions[-1][1], hi)
+            else:
+                regions.append([lo, hi])
+        
+        def carry(match: MessageMatch) -> MessageMatch:
+            # Texte relu si la chaîne d'une correspondance conservée a été modifiée
+            if tracker.intersects(*match.extent):
+                return MessageFinder._match_at(memory_dump, match.start, match.end, base)
+            return match
+        
+        matches: List[MessageMatch] = []
+        i = 0
+        for lo, hi in regions:
+            while i < len(old) and old[i].start < lo:
+                matches.append(carry(old[i]))
+                i += 1
+            # Même découpage non chevauchant qu'un scan complet
+            pos = max(lo, matches[-1].end if matches else 0)
+            while True:
+                # Les anciennes correspondances de la zone sont remplacées ; les octets
+                # qu'elles couvraient n'avaient pas été examinés et doivent l'être
+                while i < len(old) and old[i].start < hi:
+                    hi = max(hi, old[i].end)
+                    i += 1
+                if pos >= hi:
+                    break
+                found = pattern.search(memory_dump, pos, reach(hi))
+                if found is None or found.start() >= hi:
+                    break
+                # Relue sans borne de fin pour obtenir la même étendue qu'un scan complet
+                match = pattern.match(memory_dump, found.start()) or found
+                matches.append(MessageFinder._match(memory_dump, match, base))
+                pos = match.end() if match.end() > match.start() else match.end() + 1
+                hi = max(hi, match.end())
+        matches.extend(carry(match) for match in old[i:])
+        
+        scan.events[event_index] = (pattern.pattern, matches)
+        return matches
@@ -0,0 +1,128 @@
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Caractères qui mettent fin à un préfixe littéral dans un motif compilé par MessageFinder
+SPECIAL = frozenset(b"()[]{}?*+|.^$\\")
+QUANTIFIERS = frozenset(b"?*+{")
+
+class MessageScanner:
+    """
+    Recherche de tous les motifs d'événements en une seule passe sur la zone des messages.
+
+    Chaque motif commence en pratique par un texte littéral (ou une alternative de
+    noms de joueurs) : un unique préfiltre regex recherche ces préfixes, puis le
+    motif de chaque événement concerné est essayé à la position trouvée. Les motifs
+    sans préfixe exploitable sont recherchés séparément. Le résultat par événement
+    est identique à celui de pattern.finditer.
+    """
+
+    # Longueur maximale des clés du préfiltre (octets)
+    KEY_LENGTH = 8
+    # Préfixe minimal (octets) pour passer par le préfiltre
+    MIN_PREFIX = 4
+
+    def __init__(self, patterns: Sequence[Optional[bytes]]):
+        self.key = tuple(patterns)
+        self.patterns: List[Optional[re.Pattern]] = []
+        for pattern in patterns:
+            try:
+                self.patterns.append(re.compile(pattern) if pattern is not None else None)
+            except re.error:
+                self.patterns.append(None)
+
+        prefixes = {
+            index: MessageScanner.literal_prefixes(pattern.pattern)
+            for index, pattern in enumerate(self.patterns)
+            if pattern is not None
+        }
+        usable = {
+            index: alternatives for index, alternatives in prefixes.items()
+            if alternatives and min(map(len, alternatives)) >= MessageScanner.MIN_PREFIX
+        }
+        self.residual = [index for index in prefixes if index not in usable]
+
+        # Les clés sont prises à partir du deuxième octet : le premier octet d'un texte
+        # UTF-16-BE est presque toujours 0x00, omniprésent dans la RAM
+        self._buckets: Dict[bytes, List[Tuple[int, bytes]]] = {}
+        self._prefilter = None
+        if usable:
+            length = min(MessageScanner.KEY_LENGTH, min(len(prefix) for alternatives in usable.values() for prefix in alternatives) - 1)
+            for index, alternatives in usable.items():
+                for prefix in alternatives:
+                    self._buckets.setdefault(prefix[1:1 + length], []).append((index, prefix))
+            self._prefilter = re.compile(b"|".join(re.escape(key) for key in sorted(self._buckets)))
+
+    @staticmethod
+    def literal_prefixes(pattern: bytes) -> List[bytes]:
+        """
+        Préfixes littéraux par lesquels toute correspondance de pattern commence : un
+        seul en général, un par branche si le motif débute par (?:a|b|...) littéral.
+        Liste vide si le motif ne commence pas par un littéral.
+        """
+        prefix, i = MessageScanner._literal(pattern, 0)
+        if i < len(pattern) and pattern.startswith(b"(?:", i):
+            end = pattern.find(b")", i)
+            if end != -1:
+                alternatives = []
+                for branch in pattern[i + 3:end].split(b"|"):
+                    literal, stop = MessageScanner._literal(branch, 0)
+                    if stop != len(branch):
+                        break
+                    alternatives.append(prefix + literal)
+                else:
+                    # Un groupe optionnel ou répété ne fait pas partie du préfixe
+                    if end + 1 < len(pattern) and pattern[end + 1] in QUANTIFIERS:
+                        return [prefix] if prefix else []
+                    # Le texte après le groupe prolonge chaque branche
+                    suffix, _ = MessageScanner._literal(pattern, end + 1)
+                    return [alternative + suffix for alternative in alternatives]
+        return [prefix] if prefix else []
+
+    @staticmethod
+    def _literal(pattern: bytes, i: int) -> Tuple[bytes, int]:
+        """Texte littéral de pattern à partir de i, et position du premier élément non littéral"""
+        literal = bytearray()
+        while i < len(pattern):
+            byte = pattern[i]
+            if byte == 0x5C:  # \
+                # Seul un caractère non alphanumérique échappé est littéral (\d, \w, \1 ne le sont pas)
+                if i + 1 >= len(pattern) or chr(pattern[i + 1]).isalnum():
+                    break
+                char, step = pattern[i + 1], 2
+            elif byte in SPECIAL:
+                break
+            else:
+                char, step = byte, 1
+            if i + step < len(pattern) and pattern[i + step] in QUANTIFIERS:
+                break
+            literal.append(char)
+            i += step
+        return bytes(literal), i
+
+    def scan(self, data: bytes, indices: Optional[Iterable[int]] = None) -> Dict[int, List[Tuple[int, int]]]:
+        """Plages (début, fin) des correspondances de chaque événement demandé (tous par défaut)"""
+        wanted = set(range(len(self.patterns)) if indices is None else indices)
+        wanted = {index for index in wanted if self.patterns[index] is not None}
+        results: Dict[int, List[Tuple[int, int]]] = {index: [] for index in wanted}
+        last_end = dict.fromkeys(wanted, 0)
+
+        if self._prefilter is not None and any(index not in self.residual for index in wanted):
+            search = self._prefilter.search
+            found = search(data, 1)
+            while found is not None:
+                position = found.start() - 1
+                for index, prefix in self._buckets[found.group()]:
+                    # Même découpage non chevauchant que finditer pour chaque événement
+                    if index not in wanted or position < last_end[index] or not data.startswith(prefix, position):
+                        continue
+                    match = self.patterns[index].match(data, position)
+                    if match is not None:
+                        results[index].append(match.span())
+                        last_end[index] = match.end() if match.end() > position else position + 1
+                # Toutes les positions sont examinées, même à l'intérieur d'une clé trouvée
+                found = search(data, found.start() + 1)
+
+        for index in self.residual:
+            if index in wanted:
+                results[index] = [match.span() for match in self.patterns[index].finditer(data)]
+        return results
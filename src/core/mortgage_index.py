@@ -0,0 +1,90 @@
+from typing import Dict, List, Optional, Tuple
+
+from .memory_reader import MemoryReader
+
+class MortgageIndex:
+    """
+    Octets d'hypothèque des 28 propriétés (adresse_mortgage de MonopolyProperties.json),
+    convertis une seule fois et indexés par position sur le plateau.
+
+    Les octets tiennent dans une plage de quelques Kio : read() les lit en un seul
+    appel et renvoie l'état de toutes les propriétés sous forme d'un entier dont le
+    bit n vaut 1 si la propriété de la case n est hypothéquée.
+    """
+
+    # Cases des propriétés, dans l'ordre de MonopolyProperties.json (Property00 à Property27)
+    PROPERTY_POSITIONS = (1, 3, 5, 6, 8, 9, 11, 12, 13, 14, 15, 16, 18, 19,
+                          21, 23, 24, 25, 26, 27, 28, 29, 31, 32, 34, 35, 37, 39)
+
+    _default: Optional["MortgageIndex"] = None
+
+    def __init__(self, addresses: Dict[int, int], names: Dict[int, str]):
+        # Position sur le plateau -> adresse de l'octet d'hypothèque
+        self.addresses = dict(addresses)
+        # Position -> nom dans MonopolyProperties.json
+        self.names = dict(names)
+        self._positions = {name: position for position, name in self.names.items()}
+        start = min(self.addresses.values(), default=0)
+        end = max(self.addresses.values(), default=-1) + 1
+        self.span = (start, end - start)
+
+    @staticmethod
+    def from_properties(properties: Dict[str, dict]) -> "MortgageIndex":
+        """Index construit depuis les données de MonopolyProperties.json (nom -> propriété)"""
+        addresses, names = {}, {}
+        for name, prop in properties.items():
+            try:
+                position = MortgageIndex.PROPERTY_POSITIONS[int(prop['id'].replace('Property', ''))]
+            except (KeyError, ValueError, IndexError):
+                continue
+            names[position] = name
+            if prop.get('adresse_mortgage'):
+                addresses[position] = MemoryReader.hex_to_int(prop['adresse_mortgage'])
+        return MortgageIndex(addresses, names)
+
+    @staticmethod
+    def load() -> "MortgageIndex":
+        """Index des données de Property, construit au premier appel"""
+        if MortgageIndex._default is None:
+            from .property import Property
+            Property._load_property_data()
+            MortgageIndex._default = MortgageIndex.from_properties(Property._property_data or {})
+        return MortgageIndex._default
+
+    def position(self, property_name: str) -> Optional[int]:
+        return self._positions.get(property_name)
+
+    def address(self, property_name: str) -> Optional[int]:
+        """Adresse de l'octet d'hypothèque d'une propriété (nom de MonopolyProperties.json)"""
+        position = self._positions.get(property_name)
+        return self.addresses.get(position) if position is not None else None
+
+    def decode(self, view) -> int:
+        """États d'hypothèque (bit n : case n) depuis les octets de la plage span"""
+        start = self.span[0]
+        mask = 0
+        for position, address in self.addresses.items():
+            # 0 = non hypothéquée, 1 = hypothéquée
+            if view[address - start] == 1:
+                mask |= 1 << position
+        return mask
+
+    def read(self) -> int:
+        """États d'hypothèque de toutes les propriétés, en une seule lecture"""
+        if not self.addresses:
+            return 0
+        return self.decode(MemoryReader.get_view(*self.span))
+
+    @staticmethod
+    def is_mortgaged(mask: int, position: int) -> bool:
+        return bool(mask >> position & 1)
+
+    @staticmethod
+    def changes(previous: int, current: int) -> List[Tuple[int, bool]]:
+        """(position, hypothéquée) des propriétés dont l'état a changé, par position croissante"""
+        flipped = previous ^ current
+        return [
+            (position, bool(current >> position & 1))
+            for position in range(flipped.bit_length())
+            if flipped >> position & 1
+        ]
@@ -0,0 +1,67 @@
+import bisect
+import zlib
+from typing import List, Tuple
+
+class PageTracker:
+    """
+    Détecte les pages modifiées d'une zone de RAM entre deux lectures.
+
+    Une empreinte crc32 est conservée pour chaque page de PAGE_SIZE octets ; update()
+    renvoie les plages (début, fin) relatives à la zone dont le contenu a changé,
+    les pages voisines modifiées étant fusionnées. Au premier appel, ou si la taille
+    de la zone change, toute la zone est considérée comme modifiée.
+    """
+
+    PAGE_SIZE = 0x1000
+
+    def __init__(self, page_size: int = PAGE_SIZE):
+        self.page_size = page_size
+        self._digests: List[int] = []
+        self._size = -1
+        self.dirty: List[Tuple[int, int]] = []
+
+    def reset(self) -> None:
+        self._digests = []
+        self._size = -1
+
+    def digests(self, data) -> List[int]:
+        view = memoryview(data)
+        return [zlib.crc32(view[offset:offset + self.page_size]) for offset in range(0, len(view), self.page_size)]
+
+    def update(self, data) -> List[Tuple[int, int]]:
+        digests = self.digests(data)
+        if len(data) != self._size:
+            self.dirty = [(0, len(data))] if len(data) else []
+        else:
+            self.dirty = []
+            for page, (old, new) in enumerate(zip(self._digests, digests)):
+                if old == new:
+                    continue
+                start, end = page * self.page_size, min((page + 1) * self.page_size, len(data))
+                if self.dirty and self.dirty[-1][1] == start:
+                    self.dirty[-1] = (self.dirty[-1][0], end)
+                else:
+                    self.dirty.append((start, end))
+        self._digests = digests
+        self._size = len(data)
+        return self.dirty
+
+    @property
+    def dirty_bytes(self) -> int:
+        return sum(end - start for start, end in self.dirty)
+
+    def is_full(self) -> bool:
+        """Vrai si le dernier update() a marqué toute la zone comme modifiée"""
+        return self.dirty == [(0, self._size)]
+
+    def intersects(self, start: int, end: int) -> bool:
+        """Vrai si [start, end) recoupe une plage modifiée au dernier update()"""
+        i = bisect.bisect_right(self.dirty, (end,)) - 1
+        while i >= 0:
+            dirty_start, dirty_end = self.dirty[i]
+            if dirty_end <= start:
+                return False
+            if dirty_start < end:
+                return True
+            i -= 1
+        return False
@@ -1,6 +1,8 @@
+from typing import List
 from src.core.attributes import DynamicArrayAttribute, IntAttribute
 from src.core.property import Property
 from .game_loader import PlayerData
+from .layout import Layout, Layouts, Record
 from .memory_reader import MemoryReader
 
 class Player:
@@ -9,36 +11,75 @@ class Player:
     dice1 = IntAttribute(0x0)
     dice2 = IntAttribute(0x4)
     roll = IntAttribute(0x10)
-    # L'offset 0x14C est le bon pour cette version du jeu
-    properties = DynamicArrayAttribute(0x14C, Property)
+    
+    # Nombre de pointeurs de propriétés couverts par le snapshot du joueur
+    MAX_PROPERTIES = 28
+    # L'offset 0x14C est le bon pour cette version du jeu ; longueur et pointeurs
+    # sont lus en un bloc, et les Property réutilisées tant que les pointeurs restent
+    properties = DynamicArrayAttribute(0x14C, Property, capacity=MAX_PROPERTIES)
+    # Longueur maximale (en caractères) du nom lu par `name`
+    NAME_LENGTH = 10
     
     @property
     def owned_properties(self):
         """Retourne uniquement les propriétés réellement possédées (adresse != 0x0)"""
-        all_props = self.properties
         valid_props = []
         seen_positions = set()  # Pour éviter les doublons
         
-        for prop in all_props:
-            try:
-                # Vérifier si l'adresse de base est valide (pas 0x0 ou autres valeurs invalides)
-                if prop._base > 0x10000 and prop._base < 0xFFFFFF00:
-                    # Vérifier aussi que la position est valide (entre 0 et 39)
-                    pos = prop.position
-                    if 0 <= pos <= 39 and pos not in seen_positions:
-                        valid_props.append(prop)
-                        seen_positions.add(pos)
-            except:
-                pass
+        # Tous les enregistrements sont lus en une fois (pointeurs invalides déjà écartés)
+        try:
+            records = self.property_records()
+        except Exception:
+            return valid_props
+        
+        for record in records:
+            # Vérifier aussi que la position est valide (entre 0 et 39)
+            pos = record.position
+            if 0 <= pos <= 39 and pos not in seen_positions:
+                valid_props.append(Property(record._base))
+                seen_positions.add(pos)
                 
         return valid_props
     
     def __init__(self, data: PlayerData):
         self._data = data
+    
+    def snapshot_spans(self):
+        """Plages RAM (adresse, longueur) lues par les accesseurs du joueur"""
+        address = self._data["address"]
+        return [
+            (self._base, Player.properties.offset + 4 + 4 * Player.MAX_PROPERTIES),
+            (address["name"][0], 2 * Player.NAME_LENGTH),
+            (address["money"][0], 4),
+            (address["goto"][0], 1),
+            (address["position"][0], 1),
+        ]
+    
+    def property_bases(self) -> List[int]:
+        """Adresses des enregistrements de propriétés pointés par le joueur (hors pointeurs invalides)"""
+        size = Property.layout().size
+        return [prop._base for prop in self.properties if MemoryReader.is_ram_address(prop._base, size)]
+    
+    def property_spans(self):
+        """Plages RAM des enregistrements de propriétés pointés par le joueur"""
+        return [Property.snapshot_span(base) for base in self.property_bases()]
+    
+    def property_records(self) -> List[Record]:
+        """Enregistrements des propriétés du joueur : une lecture groupée et une boucle d'unpack"""
+        return Property.read_records(self.property_bases())
+    
+    @staticmethod
+    def layout() -> Layout:
+        return Layouts.get("Player")
+    
+    @property
+    def record(self) -> Record:
+        """Dés et lancer (dice1, dice2, roll) décodés en un seul unpack"""
+        return Player.layout().read(self._base)
 
     @property
     def _base(self) -> int:
-        return MemoryReader.hex_to_int(self._data['address']['base'])
+        return self._data['address']['base']
         
     @property
     def id(self):
@@ -46,11 +87,12 @@ class Player:
     
     @property
     def dices(self):
-        return [self.dice1, self.dice2]
+        record = self.record
+        return [record.dice1, record.dice2]
 
     @property
     def name(self):
-        return MemoryReader.get_string(self._data["address"]["name"][0], max_length=10)
+        return MemoryReader.get_string(self._data["address"]["name"][0], max_length=Player.NAME_LENGTH)
     
     @name.setter
     def name(self, value):
@@ -83,3 +125,5 @@ class Player:
     def position(self, value):
         for address in self._data["address"]["position"]:
             MemoryReader.set_byte(address, value)
+
+Layouts.register(Layout.from_class(Player))
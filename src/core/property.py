@@ -1,14 +1,21 @@
+from typing import Iterable, List
 from src.core.attributes import StringAttribute, IntAttribute, FixedArrayAttribute
+from .buildings_index import BuildingsIndex
+from .layout import Layout, Layouts, Record
 from .memory_reader import MemoryReader
+from .mortgage_index import MortgageIndex
 import json
 import os
 
 class Property:
-    name = StringAttribute(0x8)
+    name = StringAttribute(0x8, max_length=32)
     position = IntAttribute(0x48)
     price = IntAttribute(0x64)
     rents = FixedArrayAttribute(0x74, 6)
     
+    # Taille de l'enregistrement couvert par les attributs ci-dessus (fin de rents)
+    RECORD_SIZE = 0x8C
+    
     # Dictionnaire pour stocker les données statiques depuis MonopolyProperties.json
     _property_data = None
 
@@ -16,6 +23,25 @@ class Property:
         self._base = base
         self._load_property_data()
     
+    @staticmethod
+    def snapshot_span(base: int):
+        """Plage RAM (adresse, longueur) de l'enregistrement, pour MemoryReader.snapshot"""
+        return Property.layout().span(base)
+    
+    @staticmethod
+    def layout() -> Layout:
+        return Layouts.get("Property")
+    
+    @property
+    def record(self) -> Record:
+        """Enregistrement complet (name, position, price, rents) décodé en un seul unpack"""
+        return Property.layout().read(self._base)
+    
+    @staticmethod
+    def read_records(bases: Iterable[int]) -> List[Record]:
+        """Décode les enregistrements de plusieurs propriétés en une lecture groupée"""
+        return Property.layout().read_many(bases)
+    
     @classmethod
     def _load_property_data(cls):
         """Charge les données des propriétés depuis MonopolyProperties.json"""
@@ -63,19 +89,7 @@ class Property:
     @property
     def is_mortgaged(self):
         """Vérifie si la propriété est hypothéquée en lisant l'adresse mémoire"""
-        if self._property_data and self.name in self._property_data:
-            mortgage_address = self._property_data[self.name].get('adresse_mortgage')
-            if mortgage_address:
-                try:
-                    # Convertir l'adresse hexadécimale en entier
-                    address = int(mortgage_address, 16)
-                    # Lire le byte à cette adresse (0 = non hypothéquée, 1 = hypothéquée)
-                    mortgage_status = MemoryReader.get_byte(address)
-                    return mortgage_status == 1
-                except Exception as e:
-                    print(f"Erreur lors de la lecture du statut d'hypothèque pour {self.name}: {e}")
-                    return False
-        return False
+        return Property.is_property_mortgaged(self.name)
     
     def get_property_info(self):
         """Retourne toutes les informations calculées de la propriété"""
@@ -92,61 +106,40 @@ class Property:
         }
     
     @staticmethod
-    def get_house_count_for_property(property_name):
-        """Récupère le nombre de maisons sur une propriété donnée"""
-        # Charger les adresses depuis le fichier de configuration
-        config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'game_files', 'starting_state.jsonc')
-        
+    def house_addresses():
+        """Adresse de l'octet "nombre de maisons" par nom de propriété (en minuscules)"""
+        return {label.lower(): address for label, address in BuildingsIndex.load().addresses.items()}
+    
+    @staticmethod
+    def mortgage_addresses():
+        """Adresse de l'octet d'hypothèque par nom de propriété"""
+        index = MortgageIndex.load()
+        return {index.names[position]: address for position, address in index.addresses.items()}
+    
+    @staticmethod
+    def get_house_count_for_property(property_name, counts=None):
+        """Récupère le nombre de maisons sur une propriété donnée (dans counts, relevé de BuildingsIndex.read, si fourni)"""
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                # Enlever les commentaires du JSONC
-                content = f.read()
-                lines = content.split('\n')
-                cleaned_lines = []
-                for line in lines:
-                    # Enlever les commentaires de type //
-                    comment_pos = line.find('//')
-                    if comment_pos != -1:
-                        line = line[:comment_pos]
-                    cleaned_lines.append(line)
-                
-                cleaned_content = '\n'.join(cleaned_lines)
-                data = json.loads(cleaned_content)
-            
-            # Trouver l'adresse correspondant à la propriété
-            house_addresses = data.get('house_number_by_property', [])
-            
-            for prop in house_addresses:
-                if prop['label'].lower() == property_name.lower():
-                    address = prop['address']
-                    # Lire le nombre de maisons à cette adresse
-                    house_count = MemoryReader.get_byte(address)
-                    return house_count
-            
-            # Si la propriété n'est pas trouvée
-            return None
-            
+            return BuildingsIndex.load().house_count(property_name, counts)
         except Exception as e:
             print(f"Erreur lors de la lecture du nombre de maisons: {e}")
             return None
     
     @staticmethod
-    def is_property_mortgaged(property_name):
-        """Vérifie si une propriété est hypothéquée par son nom"""
-        # Charger les données des propriétés
-        if Property._property_data is None:
-            Property._load_property_data()
-        
-        if Property._property_data and property_name in Property._property_data:
-            mortgage_address = Property._property_data[property_name].get('adresse_mortgage')
-            if mortgage_address:
-                try:
-                    # Convertir l'adresse hexadécimale en entier
-                    address = int(mortgage_address, 16)
-                    # Lire le byte à cette adresse (0 = non hypothéquée, 1 = hypothéquée)
-                    mortgage_status = MemoryReader.get_byte(address)
-                    return mortgage_status == 1
-                except Exception as e:
-                    print(f"Erreur lors de la lecture du statut d'hypothèque pour {property_name}: {e}")
-                    return False
-        return False
\ No newline at end of file
+    def is_property_mortgaged(property_name, mask=None):
+        """Vérifie si une propriété est hypothéquée par son nom (dans mask, relevé de MortgageIndex.read, si fourni)"""
+        index = MortgageIndex.load()
+        if mask is not None:
+            position = index.position(property_name)
+            return position is not None and MortgageIndex.is_mortgaged(mask, position)
+        address = index.address(property_name)
+        if address is None:
+            return False
+        try:
+            # Lire le byte à cette adresse (0 = non hypothéquée, 1 = hypothéquée)
+            return MemoryReader.get_byte(address) == 1
+        except Exception as e:
+            print(f"Erreur lors de la lecture du statut d'hypothèque pour {property_name}: {e}")
+            return False
+
+Layouts.register(Layout.from_class(Property, Property.RECORD_SIZE))
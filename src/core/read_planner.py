@@ -0,0 +1,108 @@
+from contextlib import ExitStack, contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+from .memory_reader import Hex, MemoryReader
+from .memory_snapshot import Span
+
+# Décodeurs usuels pour ReadPlanner.add (reçoivent une memoryview de la taille demandée)
+def decode_byte(view) -> int:
+    return view[0]
+
+def decode_i32(view) -> int:
+    return int.from_bytes(view, "big")
+
+class ReadPlan:
+    """Plages contiguës retenues par ReadPlanner, avec le bilan du regroupement"""
+
+    def __init__(self, spans: List[Span], fields: int, requested: int, gap: int):
+        self.spans = spans
+        self.fields = fields
+        self.requested = requested
+        self.gap = gap
+
+    @property
+    def calls(self) -> int:
+        return len(self.spans)
+
+    @property
+    def bytes(self) -> int:
+        return sum(length for _, length in self.spans)
+
+    @property
+    def saved_calls(self) -> int:
+        return self.fields - self.calls
+
+    def cost(self, latency: float, bytes_per_second: float = 0) -> float:
+        """Durée estimée (s) du plan pour une latence par appel et un débit donnés"""
+        return self.calls * latency + (self.bytes / bytes_per_second if bytes_per_second else 0)
+
+    def report(self) -> str:
+        return (f"{self.calls} plages, {self.bytes} octets lus pour {self.requested} demandés "
+                f"({self.fields} lectures, {self.saved_calls} appels économisés, écart max 0x{self.gap:X})")
+
+    def __repr__(self):
+        return f"ReadPlan({self.report()})"
+
+
+class ReadPlanner:
+    """
+    Regroupe toutes les lectures d'un tick en un minimum de plages contiguës.
+
+    Chaque champ logique est enregistré avec add(clé, adresse, longueur, décodeur) ;
+    cover() ajoute des plages sans clé, lues par les accesseurs habituels. Deux plages
+    séparées d'au plus `gap` octets sont lues d'un seul tenant : un écart plus grand
+    réduit le nombre d'appels dme au prix d'octets inutiles.
+    """
+
+    DEFAULT_GAP = 0x100
+
+    def __init__(self, gap: int = DEFAULT_GAP):
+        self.gap = gap
+        self._fields: Dict[str, Tuple[int, int, Callable]] = {}
+        self._spans: List[Span] = []
+        self.last_plan: ReadPlan = None
+
+    def add(self, key: str, addr: Hex, length: int = 1, decode: Callable = None) -> None:
+        self._fields[key] = (MemoryReader.hex_to_int(addr), length, decode or bytes)
+
+    def cover(self, spans: Iterable[Span]) -> None:
+        self._spans.extend((MemoryReader.hex_to_int(addr), length) for addr, length in spans)
+
+    def _requested(self) -> List[Span]:
+        return [(addr, length) for addr, length, _ in self._fields.values()] + self._spans
+
+    def plan(self) -> ReadPlan:
+        requested = self._requested()
+        merged: List[List[int]] = []
+        for start, end in sorted((addr, addr + length) for addr, length in requested if length > 0):
+            if merged and start <= merged[-1][1] + self.gap:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        return ReadPlan(
+            [(start, end - start) for start, end in merged],
+            len(requested),
+            sum(length for _, length in requested),
+            self.gap,
+        )
+
+    @contextmanager
+    def execute(self) -> Iterator[Dict[str, object]]:
+        """
+        Exécute le plan dans un snapshot actif pendant le bloc `with` et renvoie les
+        champs décodés par clé (None si la lecture ou le décodage échoue). Si une
+        plage ne peut pas être lue, chaque champ est relu séparément comme avant.
+        """
+        self.last_plan = self.plan()
+        with ExitStack() as stack:
+            try:
+                snap = stack.enter_context(MemoryReader.snapshot(self.last_plan.spans))
+            except RuntimeError:
+                snap = None
+            values = {}
+            for key, (addr, length, decode) in self._fields.items():
+                try:
+                    view = snap.view(addr, length) if snap is not None else MemoryReader.get_view(addr, length)
+                    values[key] = decode(view)
+                except Exception:
+                    values[key] = None
+            yield values
@@ -0,0 +1,167 @@
+import heapq
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+class ScheduledJob:
+    """Tâche périodique du TickScheduler et ses compteurs"""
+    __slots__ = ("name", "func", "interval", "next_due", "runs", "overruns", "skipped",
+                 "last_duration", "max_duration", "max_lateness", "_generation")
+
+    def __init__(self, name: str, func: Callable[[], None], interval: float, next_due: float):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.next_due = next_due
+        self.runs = 0
+        # Exécutions terminées après l'échéance suivante
+        self.overruns = 0
+        # Échéances sautées pour rattraper le retard
+        self.skipped = 0
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+        # Retard maximal (secondes) entre l'échéance et le début de l'exécution
+        self.max_lateness = 0.0
+        self._generation = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "interval": self.interval,
+            "runs": self.runs,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "last_duration": self.last_duration,
+            "max_duration": self.max_duration,
+            "max_lateness": self.max_lateness,
+        }
+
+class TickScheduler:
+    """
+    Ordonnanceur à échéances pour les handlers des listeners.
+
+    Un tas (min-heap) contient la prochaine échéance de chaque tâche ; la boucle
+    dort exactement jusqu'à la plus proche. Les échéances sont à cadence fixe
+    (next_due += interval, sans dérive due à la durée des handlers). Une tâche en
+    retard de plus d'un intervalle saute les échéances manquées au lieu de les
+    enchaîner, et le dépassement est comptabilisé.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._heap: List[Tuple[float, int, int, str]] = []
+        self._sequence = 0
+        self._lock = threading.RLock()
+        # Réveille la boucle quand une échéance est avancée ou à l'arrêt
+        self._wakeup = threading.Event()
+
+    def _push(self, job: ScheduledJob) -> None:
+        self._sequence += 1
+        heapq.heappush(self._heap, (job.next_due, self._sequence, job._generation, job.name))
+
+    def add(self, name: str, func: Callable[[], None], interval: float, delay: float = 0.0) -> ScheduledJob:
+        """Ajoute (ou remplace) une tâche exécutée toutes les interval secondes"""
+        if interval <= 0:
+            raise ValueError(f"Intervalle invalide pour {name} : {interval}")
+        with self._lock:
+            previous = self.jobs.get(name)
+            job = ScheduledJob(name, func, interval, self.clock() + delay)
+            if previous is not None:
+                job._generation = previous._generation + 1
+            self.jobs[name] = job
+            self._push(job)
+        self._wakeup.set()
+        return job
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            # L'entrée du tas devient obsolète et sera ignorée
+            self.jobs.pop(name, None)
+
+    def set_interval(self, name: str, interval: float) -> ScheduledJob:
+        """Change l'intervalle d'une tâche, même pendant que la boucle tourne"""
+        if interval <= 0:
+            raise ValueError(f"Intervalle invalide pour {name} : {interval}")
+        with self._lock:
+            job = self.jobs.get(name)
+            if job is None:
+                raise KeyError(name)
+            # Un intervalle raccourci prend effet tout de suite, un intervalle allongé après la prochaine échéance
+            job.next_due = min(job.next_due, self.clock() + interval)
+            job.interval = interval
+            job._generation += 1
+            self._push(job)
+        self._wakeup.set()
+        return job
+
+    def intervals(self) -> Dict[str, float]:
+        with self._lock:
+            return {name: job.interval for name, job in self.jobs.items()}
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            return {name: job.to_dict() for name, job in self.jobs.items()}
+
+    def next_deadline(self) -> Optional[float]:
+        """Prochaine échéance valide (les entrées obsolètes du tas sont retirées)"""
+        with self._lock:
+            while self._heap:
+                due, _, generation, name = self._heap[0]
+                job = self.jobs.get(name)
+                if job is not None and job._generation == generation:
+                    return due
+                heapq.heappop(self._heap)
+            return None
+
+    def run_pending(self) -> int:
+        """
+        Exécute les tâches arrivées à échéance à l'appel, dans l'ordre des échéances ;
+        renvoie leur nombre. Une tâche plus lente que son intervalle ne peut pas
+        monopoliser la boucle : elle repasse au plus une fois par appel.
+        """
+        executed = 0
+        now = self.clock()
+        while True:
+            with self._lock:
+                due = self.next_deadline()
+                if due is None or due > now:
+                    return executed
+                _, _, _, name = heapq.heappop(self._heap)
+                job = self.jobs[name]
+                job.max_lateness = max(job.max_lateness, self.clock() - due)
+                # Cadence fixe : l'échéance suivante ne dépend pas de la durée d'exécution
+                job.next_due = due + job.interval
+                generation = job._generation
+
+            start = self.clock()
+            try:
+                job.func()
+            finally:
+                end = self.clock()
+                executed += 1
+                with self._lock:
+                    job.runs += 1
+                    job.last_duration = end - start
+                    job.max_duration = max(job.max_duration, job.last_duration)
+                    # Sinon la tâche a été retirée, ou reprogrammée par set_interval pendant son exécution
+                    if self.jobs.get(name) is job and job._generation == generation:
+                        if job.next_due <= end:
+                            # Dépassement : les échéances déjà passées sont sautées sauf la dernière
+                            job.overruns += 1
+                            missed = int((end - job.next_due) // job.interval)
+                            job.skipped += missed
+                            job.next_due += missed * job.interval
+                        self._push(job)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Dort jusqu'à la prochaine échéance (au plus timeout), ou jusqu'à wake()"""
+        due = self.next_deadline()
+        delay = timeout if due is None else max(0.0, due - self.clock())
+        if timeout is not None:
+            delay = min(delay, timeout)
+        if delay is None or delay > 0:
+            self._wakeup.wait(delay)
+        self._wakeup.clear()
+
+    def wake(self) -> None:
+        self._wakeup.set()
@@ -0,0 +1,223 @@
+import asyncio
+import traceback
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .listeners import MonopolyListeners
+
+class GameEvent:
+    """Événement émis par les listeners : nom et arguments de emit"""
+    __slots__ = ("name", "args")
+
+    def __init__(self, name: str, args: tuple):
+        self.name = name
+        self.args = args
+
+    def __repr__(self):
+        return f"GameEvent({self.name!r}, {self.args!r})"
+
+class AsyncMonopolyListeners(MonopolyListeners):
+    """
+    Variante asyncio de MonopolyListeners.
+
+    Chaque handler (player, message, auction et ceux ajoutés par schedule) est une
+    tâche asyncio à cadence fixe ; les lectures bloquantes de la RAM passent par
+    asyncio.to_thread, une à la fois comme dans le thread de MonopolyListeners.
+    Les événements se consomment dans la même boucle :
+
+        listeners = AsyncMonopolyListeners(game)
+        listeners.start()
+        async for event in listeners.events():
+            print(event.name, event.args)
+    """
+
+    # Nombre maximal d'événements en attente par consommateur de events()
+    QUEUE_SIZE = 1000
+
+    def __init__(self, game):
+        super().__init__(game)
+        self._task: Optional[asyncio.Task] = None
+        # Flux events() abonnés
+        self._streams: List["EventStream"] = []
+        # Une seule lecture de la RAM à la fois
+        self._read_lock: Optional[asyncio.Lock] = None
+        self.dropped_events = 0
+
+    def start(self) -> asyncio.Task:
+        """Démarre les handlers dans la boucle asyncio courante et renvoie la tâche principale"""
+        if self._task is None or self._task.done():
+            self._running = True
+            self._task = asyncio.get_running_loop().create_task(self.run())
+        return self._task
+
+    async def stop(self):
+        """
+        Annule les handlers, attend leur fin (y compris une lecture en cours dans son
+        thread) et termine les itérateurs events()
+        """
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def run(self):
+        """Exécute tous les handlers jusqu'à stop(), une annulation ou la fermeture de Dolphin"""
+        self._running = True
+        self._read_lock = asyncio.Lock()
+        handlers: Dict[str, Tuple[Callable[[], None], Callable[[], float]]] = {}
+        for name in MonopolyListeners.HANDLERS:
+            handler = self._stats.wrap(name, getattr(self, name + "_handler"))
+            handlers[name] = (handler, lambda name=name: getattr(self, "interval_" + name))
+        for name, job in self._scheduler.jobs.items():
+            if name not in handlers:
+                handlers[name] = (job.func, lambda job=job: job.interval)
+
+        tasks = [
+            asyncio.create_task(self._run_handler(handler, interval), name=f"listener-{name}")
+            for name, (handler, interval) in handlers.items()
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._running = False
+            # Les itérateurs events() se terminent après les événements déjà reçus
+            for stream in list(self._streams):
+                stream.finish()
+
+    async def _run_handler(self, handler: Callable[[], None], interval: Callable[[], float]):
+        loop = asyncio.get_running_loop()
+        due = loop.time()
+        while self._running:
+            session = self._game.session
+            if not session.connected:
+                # En pause pendant une reconnexion à Dolphin
+                await self._in_thread(session.wait_connected, MonopolyListeners.RECONNECT_POLL)
+                due = loop.time()
+                continue
+            async with self._read_lock:
+                self.emit("loop_tick")
+                try:
+                    await self._in_thread(handler)
+                except Exception:
+                    # L'erreur d'un handler n'arrête ni ce handler ni les autres
+                    traceback.print_exc()
+            # Cadence fixe ; les échéances déjà passées sont sautées
+            due += interval()
+            now = loop.time()
+            if due < now:
+                due = now
+            await asyncio.sleep(due - now)
+
+    @staticmethod
+    async def _in_thread(func: Callable, *args):
+        """
+        func(*args) dans un thread. Un thread ne s'interrompt pas : une annulation
+        attend la fin de l'appel en cours, puis est propagée.
+        """
+        call = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        cancelled = False
+        while not call.done():
+            try:
+                await asyncio.wait((call,))
+            except asyncio.CancelledError:
+                cancelled = True
+        if cancelled:
+            raise asyncio.CancelledError
+        return call.result()
+
+    def events(self, names: Optional[Iterable[str]] = None, maxsize: int = QUEUE_SIZE) -> "EventStream":
+        """
+        Itérateur asynchrone des événements émis (tous, ou seulement names), abonné
+        dès cet appel : aucun événement émis avant le premier await n'est perdu. Se
+        termine à stop() ; les événements au-delà de maxsize en attente sont abandonnés.
+        """
+        return EventStream(self, names, maxsize)
+
+
+class EventStream:
+    """
+    Événements de AsyncMonopolyListeners dans une file asyncio, abonnée à la
+    création. À consommer avec async for, et à fermer avec aclose() ou async with :
+
+        async with listeners.events(["auction_bid"]) as stream:
+            async for event in stream:
+                print(event.args)
+    """
+
+    def __init__(self, listeners: AsyncMonopolyListeners, names: Optional[Iterable[str]] = None,
+                 maxsize: int = AsyncMonopolyListeners.QUEUE_SIZE):
+        self._listeners = listeners
+        self._loop = asyncio.get_running_loop()
+        self._wanted = None if names is None else frozenset(names)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._closed = False
+        listeners.on("*", self._callback)
+        listeners._streams.append(self)
+
+    def _push(self, event: GameEvent):
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._listeners.dropped_events += 1
+
+    def _callback(self, event_name, *args, **kwargs):
+        if self._wanted is None or event_name in self._wanted:
+            try:
+                # emit est appelé depuis le thread de lecture (asyncio.to_thread)
+                self._loop.call_soon_threadsafe(self._push, GameEvent(event_name, args))
+            except RuntimeError:
+                # Boucle fermée
+                pass
+
+    def finish(self):
+        """Termine l'itération après les événements déjà reçus"""
+        # Le marqueur de fin doit passer même si la file est pleine
+        while True:
+            try:
+                self._queue.put_nowait(None)
+                return
+            except asyncio.QueueFull:
+                self._queue.get_nowait()
+
+    def close(self):
+        """Désabonne le flux (les événements déjà reçus restent lisibles)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._listeners.off("*", self._callback)
+        if self in self._listeners._streams:
+            self._listeners._streams.remove(self)
+
+    def __aiter__(self) -> "EventStream":
+        return self
+
+    async def __anext__(self) -> GameEvent:
+        if self._closed and self._queue.empty():
+            raise StopAsyncIteration
+        event = await self._queue.get()
+        if event is None:
+            self.close()
+            raise StopAsyncIteration
+        return event
+
+    async def aclose(self):
+        self.close()
+
+    async def __aenter__(self) -> "EventStream":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,353 @@
+import bisect
+import glob
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from .context_journal import ContextJournal
+
+class HistoryEntry:
+    """Ligne du journal du contexte indexée : emplacement, horodatage, partie, tour, événements et joueurs"""
+    __slots__ = ("segment", "offset", "checkpoint", "seq", "time", "event", "game", "turn", "players")
+
+    def __init__(self, segment: str, offset: int, checkpoint: int, seq: int, time: float,
+                 event: Optional[str], game: Optional[str], turn: Optional[int], players: Set[str]):
+        self.segment = segment
+        self.offset = offset
+        # Offset du point de reprise à partir duquel rejouer cette ligne
+        self.checkpoint = checkpoint
+        self.seq = seq
+        self.time = time
+        self.event = event
+        # Partie du dernier point de reprise (None pour un journal antérieur aux identifiants)
+        self.game = game
+        self.turn = turn
+        # Clés (player1...) et noms des joueurs modifiés par la ligne
+        self.players = players
+
+    @property
+    def types(self) -> List[str]:
+        """Types d'événements de la ligne (ceux d'un lot sont joints par "+")"""
+        return self.event.split("+") if self.event else []
+
+    def to_dict(self) -> dict:
+        return {
+            "segment": os.path.basename(self.segment),
+            "seq": self.seq,
+            "time": self.time,
+            "event": self.event,
+            "game": self.game,
+            "turn": self.turn,
+            "players": sorted(self.players),
+        }
+
+
+class SegmentScan:
+    """Avancement de l'indexation d'un segment, pour ne lire ensuite que les lignes ajoutées"""
+    __slots__ = ("offset", "checkpoint", "game", "turn", "names", "players")
+
+    def __init__(self, previous: Optional["SegmentScan"] = None):
+        self.offset = 0
+        self.checkpoint = 0
+        self.game: Optional[str] = previous.game if previous is not None else None
+        # Le point de reprise qui ouvre un segment se compare au dernier état du segment précédent
+        self.turn: Optional[int] = previous.turn if previous is not None else None
+        # Clé du joueur -> nom, d'après le dernier état connu
+        self.names: Dict[str, str] = dict(previous.names) if previous is not None else {}
+        # Clé du joueur -> JSON compact de son dernier état (None avant le premier point de reprise)
+        self.players: Optional[Dict[str, str]] = dict(previous.players) \
+            if previous is not None and previous.players is not None else None
+
+    def changed(self, key: str, players: Set[str]) -> None:
+        """Ajoute à players la clé et le nom du joueur key"""
+        players.add(key)
+        if self.names.get(key):
+            players.add(self.names[key])
+
+
+class ContextHistory:
+    """
+    Historique interrogeable du contexte, indexé sur les segments de ContextJournal.
+
+    Chaque ligne du journal est indexée (horodatage, tour, types d'événements,
+    joueurs) sans garder les contextes en mémoire. state_at() relit le segment
+    depuis le point de reprise le plus proche et rejoue au plus
+    ContextJournal.CHECKPOINT_EVERY deltas ; events() répond par recherche
+    dichotomique sur les horodatages. refresh() n'indexe que les lignes ajoutées.
+    Les tours sont indexés par partie : sans partie précisée, une requête par
+    tour porte sur la dernière partie écrite.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self):
+        self._scans: Dict[str, SegmentScan] = {}
+        # Lignes triées par horodatage, et index de leurs positions dans cette liste
+        self._entries: List[HistoryEntry] = []
+        self._times: List[float] = []
+        self._by_type: Dict[str, List[int]] = {}
+        self._by_player: Dict[str, List[int]] = {}
+        self._by_game: Dict[Optional[str], List[int]] = {}
+        self._by_turn: Dict[Tuple[Optional[str], int], List[int]] = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def refresh(self) -> int:
+        """Indexe les lignes écrites depuis le dernier appel ; renvoie leur nombre"""
+        with self._lock:
+            segments = sorted(glob.glob(os.path.join(self.directory, "segment-*.jsonl")))
+            for segment, scan in self._scans.items():
+                if segment not in segments or os.path.getsize(segment) < scan.offset:
+                    # Segment supprimé (rotation) ou réécrit : index reconstruit
+                    self._clear()
+                    break
+            added: List[HistoryEntry] = []
+            previous = None
+            for segment in segments:
+                scan = self._scans.get(segment)
+                if scan is None:
+                    scan = self._scans[segment] = SegmentScan(previous)
+                added.extend(self._scan(segment, scan))
+                previous = scan
+            if not added:
+                return 0
+            if self._times and added[0].time < self._times[-1] or any(
+                    later.time < earlier.time for earlier, later in zip(added, added[1:])):
+                # Lignes importées ou horloge reculée : tri complet
+                entries = sorted(self._entries + added, key=lambda entry: entry.time)
+                self._entries, self._times = [], []
+                self._by_type, self._by_player, self._by_game, self._by_turn = {}, {}, {}, {}
+                self._append(entries)
+            else:
+                self._append(added)
+            return len(added)
+
+    def _append(self, entries: List[HistoryEntry]):
+        for entry in entries:
+            position = len(self._entries)
+            self._entries.append(entry)
+            self._times.append(entry.time)
+            for event_type in entry.types:
+                self._by_type.setdefault(event_type, []).append(position)
+            for player in entry.players:
+                self._by_player.setdefault(player, []).append(position)
+            self._by_game.setdefault(entry.game, []).append(position)
+            if entry.turn is not None:
+                self._by_turn.setdefault((entry.game, entry.turn), []).append(position)
+
+    @staticmethod
+    def _scan(segment: str, scan: SegmentScan) -> List[HistoryEntry]:
+        entries = []
+        with open(segment, "rb") as f:
+            f.seek(scan.offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Ligne en cours d'écriture : relue au prochain refresh
+                    break
+                offset = scan.offset
+                scan.offset += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                players = set()
+                if record.get("type") == "checkpoint":
+                    scan.checkpoint = offset
+                    context = record.get("context", {})
+                    scan.turn = context.get("global", {}).get("current_turn")
+                    game = record.get("game")
+                    if game != scan.game:
+                        # Nouvelle partie : tous ses joueurs sont signalés
+                        scan.game = game
+                        scan.players = None
+                    states = {key: ContextJournal.encode(player)
+                              for key, player in context.get("players", {}).items()}
+                    # Joueurs modifiés : différence avec l'état précédent, comme pour un delta
+                    previous = scan.players or {}
+                    for key in previous:
+                        if key not in states:
+                            scan.changed(key, players)
+                    scan.names = {key: player.get("name") for key, player in context.get("players", {}).items()}
+                    for key, state in states.items():
+                        if scan.players is None or previous.get(key) != state:
+                            scan.changed(key, players)
+                    scan.players = states
+                else:
+                    if scan.players is None:
+                        scan.players = {}
+                    changes = record.get("set", {})
+                    if "global.current_turn" in changes:
+                        scan.turn = changes["global.current_turn"]
+                    for path in list(changes) + record.get("unset", []):
+                        if path.startswith("players."):
+                            key = path[len("players."):]
+                            if path in changes:
+                                value = changes[path]
+                                scan.players[key] = ContextJournal.encode(value)
+                                if isinstance(value, dict):
+                                    scan.names[key] = value.get("name")
+                            else:
+                                scan.players.pop(key, None)
+                            scan.changed(key, players)
+                entries.append(HistoryEntry(segment, offset, scan.checkpoint, record.get("seq", 0),
+                                            record.get("time", 0.0), record.get("event"), scan.game, scan.turn,
+                                            players))
+        return entries
+
+    @staticmethod
+    def _load(entry: HistoryEntry) -> dict:
+        """Contexte après la ligne entry : point de reprise puis deltas jusqu'à elle"""
+        context = None
+        with open(entry.segment, "rb") as f:
+            f.seek(entry.checkpoint)
+            offset = entry.checkpoint
+            for line in f:
+                context = ContextJournal.apply(context, json.loads(line))
+                if offset >= entry.offset:
+                    break
+                offset += len(line)
+        return context
+
+    def latest_game(self) -> Optional[str]:
+        """Partie de la dernière ligne écrite"""
+        with self._lock:
+            return self._entries[-1].game if self._entries else None
+
+    def entry_at(self, turn: Optional[int] = None, timestamp: Optional[float] = None,
+                 game: Optional[str] = None) -> Optional[HistoryEntry]:
+        """
+        Dernière ligne du tour turn de la partie game (la dernière partie par
+        défaut), ou dernière ligne écrite au plus tard à timestamp (dans game si précisée)
+        """
+        with self._lock:
+            if turn is not None:
+                if game is None:
+                    game = self.latest_game()
+                positions = self._by_turn.get((game, turn))
+                return self._entries[positions[-1]] if positions else None
+            position = len(self._entries) - 1
+            if timestamp is not None:
+                position = bisect.bisect_right(self._times, timestamp) - 1
+            if game is not None:
+                # Dernière ligne de la partie jusqu'à position incluse
+                positions = self._by_game.get(game, [])
+                index = bisect.bisect_right(positions, position) - 1
+                position = positions[index] if index >= 0 else -1
+            return self._entries[position] if position >= 0 else None
+
+    def state_at(self, turn: Optional[int] = None, timestamp: Optional[float] = None,
+                 game: Optional[str] = None) -> Optional[dict]:
+        """Contexte à la fin du tour turn, ou tel qu'il était à timestamp (le dernier sinon)"""
+        entry = self.entry_at(turn, timestamp, game)
+        return ContextHistory._load(entry) if entry is not None else None
+
+    def events(self, start: Optional[float] = None, end: Optional[float] = None,
+               event_type: Optional[str] = None, player: Optional[str] = None,
+               turn_from: Optional[int] = None, turn_to: Optional[int] = None,
+               limit: Optional[int] = None, game: Optional[str] = None) -> List[HistoryEntry]:
+        """Lignes entre start et end (inclus), filtrées par type d'événement, joueur (clé ou nom), partie et tours"""
+        with self._lock:
+            low = bisect.bisect_left(self._times, start) if start is not None else 0
+            high = bisect.bisect_right(self._times, end) if end is not None else len(self._times)
+            # Liste de positions la plus sélective, restreinte à [low, high)
+            candidates = None
+            for index, key in ((self._by_type, event_type), (self._by_player, player), (self._by_game, game)):
+                if key is None:
+                    continue
+                positions = index.get(key, [])
+                positions = positions[bisect.bisect_left(positions, low):bisect.bisect_left(positions, high)]
+                if candidates is None or len(positions) < len(candidates):
+                    candidates = positions
+            if candidates is None:
+                candidates = range(low, high)
+            result = []
+            for position in candidates:
+                entry = self._entries[position]
+                if event_type is not None and event_type not in entry.types:
+                    continue
+                if player is not None and player not in entry.players:
+                    continue
+                if game is not None and entry.game != game:
+                    continue
+                if turn_from is not None and (entry.turn is None or entry.turn < turn_from):
+                    continue
+                if turn_to is not None and (entry.turn is None or entry.turn > turn_to):
+                    continue
+                result.append(entry)
+                if limit is not None and len(result) >= limit:
+                    break
+            return result
+
+    def summary(self) -> dict:
+        with self._lock:
+            turns: Dict[Optional[str], List[int]] = {}
+            for game, turn in self._by_turn:
+                turns.setdefault(game, []).append(turn)
+            games = [
+                {
+                    "game": game,
+                    "entries": len(positions),
+                    "first": self._times[positions[0]],
+                    "last": self._times[positions[-1]],
+                    "turns": [min(turns[game]), max(turns[game])] if game in turns else None,
+                }
+                for game, positions in sorted(self._by_game.items(), key=lambda item: item[1][0])
+            ]
+            return {
+                "entries": len(self._entries),
+                "segments": len(self._scans),
+                "first": self._times[0] if self._times else None,
+                "last": self._times[-1] if self._times else None,
+                "game": self.latest_game(),
+                "games": games,
+                "event_types": {event_type: len(positions) for event_type, positions in self._by_type.items()},
+            }
+
+    @staticmethod
+    def read_history_directory(history_dir: str):
+        """États de l'ancien dossier contexte/history (<timestamp>_<événement>.json), par date"""
+        files = []
+        for path in glob.glob(os.path.join(history_dir, "*.json")):
+            timestamp, _, event = os.path.basename(path)[:-len(".json")].partition("_")
+            try:
+                files.append((int(timestamp), event or None, path))
+            except ValueError:
+                continue
+        for timestamp, event, path in sorted(files, key=lambda item: item[0]):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    yield float(timestamp), event, json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Historique ignoré ({path}): {e}")
+
+    def import_history_directory(self, history_dir: str, journal: Optional[ContextJournal] = None) -> int:
+        """
+        Ajoute au journal les fichiers de l'ancien dossier d'historique qui n'y sont
+        pas encore (même seconde et même événement) ; renvoie le nombre importé.
+        journal est celui du contexte en cours d'écriture s'il existe.
+        """
+        with self._lock:
+            self.refresh()
+            known = {(int(entry.time), entry.event) for entry in self._entries}
+        # Un seul état en mémoire à la fois : lu, écrit dans le journal, puis indexé par refresh()
+        states = (
+            (timestamp, event, context)
+            for timestamp, event, context in ContextHistory.read_history_directory(history_dir)
+            if (int(timestamp), event) not in known
+        )
+        owned = journal is None
+        if owned:
+            journal = ContextJournal(self.directory)
+        try:
+            count = journal.import_states(states)
+            journal.flush()
+        finally:
+            if owned:
+                journal.close()
+        self.refresh()
+        return count
@@ -0,0 +1,257 @@
+import glob
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+class ContextJournal:
+    """
+    Journal en ajout seul des états successifs du contexte (JSON Lines).
+
+    Chaque record() compare le contexte section par section ("global.<clé>",
+    "players.<joueur>", "events", "board") à l'état précédent et n'écrit qu'une
+    ligne compacte avec les sections modifiées. Les lignes sont écrites par un
+    thread dédié dans des segments segment-NNNNNN.jsonl ; chaque segment commence
+    par un point de reprise complet ("checkpoint"), répété toutes les
+    CHECKPOINT_EVERY lignes, et un nouveau segment est ouvert au-delà de
+    SEGMENT_BYTES. Tous les segments sont conservés, sauf si max_segments
+    (MAX_SEGMENTS par défaut) limite leur nombre : les plus anciens sont alors
+    déplacés dans archive/, ou supprimés avec archive=False.
+    Les points de reprise portent l'identifiant de la partie (game) : un par
+    journal ouvert, et un par partie importée.
+
+        journal = ContextJournal("contexte/journal")
+        journal.record(contexte.context, "player_money_changed")
+        context = ContextJournal.replay("contexte/journal")
+    """
+
+    SEGMENT_BYTES = 1024 * 1024
+    CHECKPOINT_EVERY = 100
+    # Segments gardés dans le dossier du journal (None : aucune limite)
+    MAX_SEGMENTS: Optional[int] = None
+
+    # Sections découpées par clé : un changement d'argent ne réécrit qu'un joueur
+    SPLIT_SECTIONS = ("global", "players")
+
+    def __init__(self, directory: str, game: Optional[str] = None,
+                 max_segments: Optional[int] = None, archive: bool = True):
+        self.directory = directory
+        self.max_segments = max_segments if max_segments is not None else ContextJournal.MAX_SEGMENTS
+        self.archive = archive
+        # Partie des lignes écrites, jusqu'au prochain point de reprise d'une autre partie
+        self.game = game or ContextJournal.new_game()
+        os.makedirs(directory, exist_ok=True)
+        self.seq = 0
+        self.deltas = 0
+        self.checkpoints = 0
+        self.bytes = 0
+        # Sections (chemin -> JSON compact) de la dernière ligne écrite
+        self._parts: Dict[str, str] = {}
+        self._segment = ContextJournal._last_segment(directory) + 1
+        self._segment_bytes = 0
+        self._since_checkpoint = 0
+        self._lock = threading.RLock()
+        self._lines: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write, name="ContextJournal-writer")
+        self._writer.daemon = True
+        self._writer.start()
+
+    @staticmethod
+    def _segments(directory: str):
+        return sorted(glob.glob(os.path.join(directory, "segment-*.jsonl")))
+
+    @staticmethod
+    def _last_segment(directory: str) -> int:
+        segments = ContextJournal._segments(directory)
+        if not segments:
+            return 0
+        return int(os.path.basename(segments[-1])[len("segment-"):-len(".jsonl")])
+
+    @staticmethod
+    def new_game() -> str:
+        """Identifiant d'une nouvelle partie : date de début et suffixe aléatoire"""
+        return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+    def _segment_path(self) -> str:
+        return os.path.join(self.directory, f"segment-{self._segment:06d}.jsonl")
+
+    @staticmethod
+    def encode(value) -> str:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    @staticmethod
+    def parts(context: dict) -> Dict[str, str]:
+        """Sections du contexte (chemin -> JSON compact)"""
+        parts = {}
+        for key, value in context.items():
+            if key in ContextJournal.SPLIT_SECTIONS and isinstance(value, dict):
+                parts[key] = "{}"
+                for sub_key, sub_value in value.items():
+                    parts[f"{key}.{sub_key}"] = ContextJournal.encode(sub_value)
+            else:
+                parts[key] = ContextJournal.encode(value)
+        return parts
+
+    def record(self, context: dict, event: Optional[str] = None, timestamp: Optional[float] = None) -> None:
+        """Ajoute l'état de context au journal (écrit en arrière-plan), avec l'événement qui l'a produit"""
+        parts = ContextJournal.parts(context)
+        if timestamp is None:
+            timestamp = time.time()
+        with self._lock:
+            self.seq += 1
+            header = f'"seq":{self.seq},"time":{timestamp:.3f},"event":{ContextJournal.encode(event)}'
+            if self._segment_bytes >= ContextJournal.SEGMENT_BYTES:
+                self._segment += 1
+                self._segment_bytes = 0
+            if self._segment_bytes == 0 or self._since_checkpoint >= ContextJournal.CHECKPOINT_EVERY:
+                line = ('{"type":"checkpoint",' + header + ',"game":' + ContextJournal.encode(self.game)
+                        + ',"context":' + ContextJournal.encode(context) + '}\n')
+                self._since_checkpoint = 0
+                self.checkpoints += 1
+            else:
+                changed = [path for path, text in parts.items() if self._parts.get(path) != text]
+                removed = [path for path in self._parts if path not in parts]
+                line = ('{"type":"delta",' + header
+                        + ',"set":{' + ",".join(f"{ContextJournal.encode(path)}:{parts[path]}" for path in changed)
+                        + '},"unset":' + ContextJournal.encode(removed) + '}\n')
+                self._since_checkpoint += 1
+                self.deltas += 1
+            self._parts = parts
+            size = len(line.encode("utf-8"))
+            self._segment_bytes += size
+            self.bytes += size
+            self._lines.put((self._segment_path(), line))
+
+    def restart(self) -> None:
+        """La prochaine ligne sera un point de reprise complet"""
+        with self._lock:
+            self._since_checkpoint = ContextJournal.CHECKPOINT_EVERY
+
+    def import_states(self, states: Iterable[Tuple[float, Optional[str], dict]]) -> int:
+        """
+        Ajoute des états déjà horodatés (timestamp, événement, contexte), sans
+        qu'une ligne du contexte courant ne s'intercale ; renvoie leur nombre.
+        Les états importés forment une nouvelle partie, et une autre à chaque
+        fois que le tour recule.
+        """
+        count = 0
+        with self._lock:
+            game = self.game
+            turn = None
+            try:
+                self.game = None
+                for timestamp, event, context in states:
+                    current = context.get("global", {}).get("current_turn")
+                    if self.game is None or turn is not None and current is not None and current < turn:
+                        self.game = ContextJournal.new_game()
+                        self.restart()
+                    if current is not None:
+                        turn = current
+                    self.record(context, event, timestamp)
+                    count += 1
+            finally:
+                # Le contexte courant ne se compare pas aux états importés
+                self.game = game
+                self.restart()
+        return count
+
+    def _write(self):
+        path, f = None, None
+        while True:
+            item = self._lines.get()
+            try:
+                if item is None:
+                    if f is not None:
+                        f.close()
+                    return
+                segment, line = item
+                if segment != path:
+                    if f is not None:
+                        f.close()
+                    path = segment
+                    f = open(path, "a", encoding="utf-8")
+                    if self.max_segments is not None:
+                        self._prune()
+                f.write(line)
+                # Écriture groupée des lignes en attente, puis vidage sur disque
+                if self._lines.empty():
+                    f.flush()
+            except Exception as e:
+                print(f"Erreur lors de l'écriture du journal du contexte: {e}")
+            finally:
+                self._lines.task_done()
+
+    def _prune(self):
+        """Archive (ou supprime) les segments au-delà des max_segments plus récents"""
+        segments = ContextJournal._segments(self.directory)
+        archive_dir = os.path.join(self.directory, "archive")
+        for segment in segments[:max(0, len(segments) - self.max_segments)]:
+            try:
+                if self.archive:
+                    os.makedirs(archive_dir, exist_ok=True)
+                    os.replace(segment, os.path.join(archive_dir, os.path.basename(segment)))
+                else:
+                    os.remove(segment)
+            except OSError as e:
+                print(f"Segment du journal non archivé ({segment}): {e}")
+
+    def flush(self) -> None:
+        """Attend que toutes les lignes déjà enregistrées soient écrites"""
+        self._lines.join()
+
+    def close(self) -> None:
+        self._lines.put(None)
+        self._writer.join()
+
+    def stats(self) -> dict:
+        return {
+            "segment": self._segment,
+            "seq": self.seq,
+            "checkpoints": self.checkpoints,
+            "deltas": self.deltas,
+            "bytes": self.bytes,
+            "pending": self._lines.qsize(),
+        }
+
+    @staticmethod
+    def records(directory: str) -> Iterator[dict]:
+        """Lignes du journal, du plus ancien segment conservé au plus récent"""
+        for segment in ContextJournal._segments(directory):
+            with open(segment, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # Dernière ligne tronquée par un arrêt brutal
+                        pass
+
+    @staticmethod
+    def apply(context: dict, record: dict) -> dict:
+        """Contexte obtenu en appliquant une ligne du journal à context"""
+        if record.get("type") == "checkpoint":
+            return record["context"]
+        for path, value in record.get("set", {}).items():
+            key, _, sub_key = path.partition(".")
+            if sub_key:
+                context.setdefault(key, {})[sub_key] = value
+            else:
+                context[key] = value
+        for path in record.get("unset", []):
+            key, _, sub_key = path.partition(".")
+            if sub_key:
+                context.get(key, {}).pop(sub_key, None)
+            else:
+                context.pop(key, None)
+        return context
+
+    @staticmethod
+    def replay(directory: str) -> Optional[dict]:
+        """Dernier contexte reconstruit depuis le journal (None si aucun point de reprise)"""
+        context = None
+        for record in ContextJournal.records(directory):
+            if record.get("type") == "checkpoint" or context is not None:
+                context = ContextJournal.apply(context, record)
+        return context
@@ -0,0 +1,67 @@
+from typing import Any, Callable, Dict, Hashable
+
+class ContextSection:
+    """
+    Partie du contexte (un joueur, une propriété, le résumé des constructions...)
+    recalculée seulement quand la clé de ses entrées change. Sinon le même objet
+    est renvoyé : le contexte garde l'identité des parties inchangées.
+    """
+    __slots__ = ("key", "value", "builds", "reuses")
+
+    _UNSET = object()
+
+    def __init__(self):
+        self.key: Hashable = ContextSection._UNSET
+        self.value: Any = None
+        self.builds = 0
+        self.reuses = 0
+
+    def get(self, key: Hashable, build: Callable[..., Any], *args) -> Any:
+        """Valeur pour les entrées key : la précédente si key n'a pas changé, sinon build(*args)"""
+        if key == self.key:
+            self.reuses += 1
+            return self.value
+        self.value = build(*args)
+        self.key = key
+        self.builds += 1
+        return self.value
+
+
+class ContextSections:
+    """Sections du contexte regroupées par type ("players", "properties", "buildings", "global")"""
+
+    def __init__(self):
+        self.sections: Dict[str, Dict[Hashable, ContextSection]] = {}
+
+    def section(self, group: str, name: Hashable = None) -> ContextSection:
+        sections = self.sections.setdefault(group, {})
+        section = sections.get(name)
+        if section is None:
+            section = sections[name] = ContextSection()
+        return section
+
+    def get(self, group: str, name: Hashable, key: Hashable, build: Callable[..., Any], *args) -> Any:
+        return self.section(group, name).get(key, build, *args)
+
+    def retain(self, group: str, names) -> None:
+        """Oublie les sections de group absentes de names (joueurs partis)"""
+        sections = self.sections.get(group, {})
+        for name in [name for name in sections if name not in names]:
+            del sections[name]
+
+    def reset(self) -> None:
+        """Oublie toutes les entrées : la prochaine mise à jour recalcule tout"""
+        for sections in self.sections.values():
+            for section in sections.values():
+                section.key = ContextSection._UNSET
+                section.value = None
+
+    def stats(self) -> dict:
+        """Recalculs et réutilisations par type de section"""
+        return {
+            group: {
+                "builds": sum(section.builds for section in sections.values()),
+                "reuses": sum(section.reuses for section in sections.values()),
+            }
+            for group, sections in self.sections.items()
+        }
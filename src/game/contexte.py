@@ -1,35 +1,57 @@
+import copy
 import json
 import os
-import time
-from typing import Dict, List, Any
+import threading
+from typing import Dict, List, Any, Tuple
 from .monopoly import MonopolyGame
 from .listeners import MonopolyListeners
+from .context_journal import ContextJournal
+from .context_sections import ContextSections
+from .player_state import PlayerState
 from src.utils import property_manager
-from src.utils.property_helpers import get_property_house_count, get_current_player_index_from_ram
-from src.core.property import Property
+from src.utils.property_helpers import CURRENT_PLAYER_ADDRESS, current_player_index_from_byte
+from src.core.buildings_index import BuildingsIndex
+from src.core.dme_session import DmeSession
+from src.core.mortgage_index import MortgageIndex
+from src.core.read_planner import ReadPlanner, ReadPlan, decode_byte
 
 class Contexte:
     """Classe gérant le contexte global du jeu Monopoly"""
     
+    # Écart maximal (octets) entre deux lectures regroupées par le ReadPlanner du tick
+    read_gap = ReadPlanner.DEFAULT_GAP
+    # Dernier plan de lecture exécuté (nombre de plages, octets, appels économisés)
+    read_plan: ReadPlan = None
+    # Mise à jour incrémentale : une section du contexte n'est recalculée que si ses entrées changent
+    incremental = True
+    # Délai (secondes) avant la réécriture de game_context.json : une seule écriture par rafale d'événements
+    save_delay = 1.0
+    
     def __init__(self, game: MonopolyGame, listeners: MonopolyListeners):
         """Initialise le contexte avec le jeu et les listeners"""
         self.game = game
         self.listeners = listeners
         self.context_file = os.path.join("contexte", "game_context.json")
-        self.context_history_dir = os.path.join("contexte", "history")
+        # Dernier contenu écrit dans context_file
+        self._saved_text = None
+        # Historique des états du contexte (deltas et points de reprise)
+        self.journal = ContextJournal(os.path.join("contexte", "journal"))
         self.current_turn = 0
         self.current_player_index = 0  # Indice du joueur actuel
         self.events = []
         self.turn_events = []  # Événements du tour actuel
         self.monopoly_board = self._initialize_monopoly_board()  # Initialiser le plateau de Monopoly
         self.duplicate_events = set()  # Pour éviter les événements en double
+        # Historiques à sauvegarder à la fin du lot d'événements en cours (None hors lot)
+        self._batch_history = None
+        # Sections du contexte et entrées de leur dernier calcul
+        self._sections = ContextSections()
+        # Mises à jour (listeners, app.py) et sauvegardes différées sérialisées
+        self._lock = threading.RLock()
+        self._save_timer = None
         self.game_settings = self._load_game_settings()
         print(f'GAME_SETTINGS {self.game_settings}')  # Charger les paramètres du jeu
         
-        # Créer le dossier d'historique s'il n'existe pas
-        if not os.path.exists(self.context_history_dir):
-            os.makedirs(self.context_history_dir)
-        
         # Initialiser le contexte
         self.context = {
             "global": {
@@ -52,6 +74,7 @@ class Contexte:
         # Initialiser le contexte avec l'état actuel
         self._update_context()
         self._save_context()
+        self.journal.record(self.context, "init")
     
     def _initialize_monopoly_board(self):
         """Initialise le plateau de Monopoly avec les noms réels des cases (version UK)"""
@@ -128,22 +151,40 @@ class Contexte:
     def _register_events(self):
         """Enregistre les callbacks pour les événements intéressants"""
         # Événements des joueurs
-        self.listeners.on("player_added", self._on_player_added)
-        self.listeners.on("player_removed", self._on_player_removed)
-        self.listeners.on("player_money_changed", self._on_player_money_changed)
-        self.listeners.on("player_name_changed", self._on_player_name_changed)
-        self.listeners.on("player_dice_changed", self._on_player_dice_changed)
-        self.listeners.on("player_goto_changed", self._on_player_goto_changed)
-        self.listeners.on("player_position_changed", self._on_player_position_changed)
-        self.listeners.on("player_properties_changed", self._on_player_properties_changed)
+        self._on("player_added", self._on_player_added)
+        self._on("player_removed", self._on_player_removed)
+        self._on("player_money_changed", self._on_player_money_changed)
+        self._on("player_name_changed", self._on_player_name_changed)
+        self._on("player_dice_changed", self._on_player_dice_changed)
+        self._on("player_goto_changed", self._on_player_goto_changed)
+        self._on("player_position_changed", self._on_player_position_changed)
+        self._on("player_properties_changed", self._on_player_properties_changed)
+        
+        # Événements des propriétés
+        self._on("property_mortgage_changed", self._on_property_mortgage_changed)
         
         # Événements des enchères
-        self.listeners.on("auction_started", self._on_auction_started)
-        self.listeners.on("auction_ended", self._on_auction_ended)
-        self.listeners.on("auction_bid", self._on_auction_bid)
+        self._on("auction_started", self._on_auction_started)
+        self._on("auction_ended", self._on_auction_ended)
+        self._on("auction_bid", self._on_auction_bid)
         
         # Événements des messages
-        self.listeners.on("message_added", self._on_message_added)
+        self._on("message_added", self._on_message_added)
+        
+        # Lots d'événements regroupés (EventListeners.start_coalescing)
+        self._on("batch_started", self._on_batch_started)
+        self._on("batch_ended", self._on_batch_ended)
+    
+    def _on(self, event_name, callback):
+        """
+        Abonne callback sous self._lock : les listeners l'appellent depuis leurs
+        workers et le timer des lots, pendant que app.py met à jour le contexte
+        et que le timer de sauvegarde le sérialise.
+        """
+        def locked(*args, **kwargs):
+            with self._lock:
+                return callback(*args, **kwargs)
+        self.listeners.on(event_name, locked)
     
     def _load_game_settings(self):
         """Charge les paramètres du jeu depuis le fichier de configuration"""
@@ -164,116 +205,202 @@ class Contexte:
             "game": {"default_model": "gpt-4.1-mini"}
         }
     
+    def _plan_tick(self) -> ReadPlanner:
+        """Regroupe toutes les lectures RAM d'une mise à jour du contexte"""
+        planner = ReadPlanner(self.read_gap)
+        planner.add("current_player", CURRENT_PLAYER_ADDRESS, 1, decode_byte)
+        # Nombres de maisons : une seule plage pour toutes les propriétés
+        buildings = BuildingsIndex.load()
+        planner.add("buildings", *buildings.span, buildings.decode)
+        # États d'hypothèque : une seule plage, décodée en bits par case du plateau
+        mortgages = MortgageIndex.load()
+        planner.add("mortgages", *mortgages.span, mortgages.decode)
+        # Joueurs (argent, position, dés, pointeurs de propriétés) et enchère
+        planner.cover(self.game.snapshot_spans())
+        return planner
+    
     def _update_context(self):
-        """Met à jour le contexte avec l'état actuel du jeu"""
-        # Debug: afficher le nombre de joueurs (désactivé pour éviter le spam)
-        # print(f"[DEBUG] Nombre de joueurs détectés: {len(self.game.players)}")
-        
-        # Mise à jour des informations globales
-        player_names = []
-        
-        # Utiliser les noms configurés si disponibles
-        for i, player in enumerate(self.game.players):
-            try:
-                # Utiliser le nom configuré pour ce joueur
-                player_key = f"player{i+1}"
-                if player_key in self.game_settings.get("players", {}):
-                    configured_name = self.game_settings["players"][player_key].get("name", player.name)
-                    player_names.append(configured_name)
-                else:
-                    player_names.append(player.name)
-            except:
-                pass
-        
-        # Lire le joueur actuel depuis la RAM via la fonction centralisée
-        current_player_index = get_current_player_index_from_ram()
+        """Met à jour le contexte avec l'état actuel du jeu (gardé tel quel pendant une reconnexion à Dolphin)"""
+        session = self.game.session
+        if not session.connected:
+            return
+        planner = self._plan_tick()
+        try:
+            with self._lock, planner.execute() as tick:
+                self.read_plan = planner.last_plan
+                self._build_context(tick)
+        except RuntimeError as e:
+            if not DmeSession.is_disconnect_error(e):
+                raise
+            # Dolphin fermé : la session partagée met les lecteurs en pause et se reconnecte
+            print(f"⚠️ Contexte non mis à jour, Dolphin semble être fermé : {e}")
+            session.lost(e)
+    
+    def _build_context(self, tick: Dict[str, Any]):
+        """
+        Construit le contexte à partir des champs lus par le plan du tick.
+
+        Chaque section (global, propriétés, constructions, joueurs) n'est recalculée
+        que si ses entrées ont changé depuis la mise à jour précédente ; une section
+        inchangée garde le même objet.
+        """
+        if not self.incremental:
+            self._sections.reset()
+        sections = self._sections
+        
+        # État de chaque joueur lu une seule fois (nom, argent, dés, position, propriétés)
+        states = self._read_player_states()
+        owned = {i: Contexte._owned_positions(state) for i, _, state in states}
+        
+        # Joueur actuel lu par le plan du tick
+        current_player_byte = tick.get("current_player")
+        current_player_index = current_player_index_from_byte(current_player_byte) if current_player_byte is not None else None
+        # Si on ne peut pas lire la RAM, garder la logique existante
         if current_player_index is not None:
             self.current_player_index = current_player_index
-            print(f"[DEBUG] Current player from RAM: player{self.current_player_index + 1}")
-        else:
-            # Si on ne peut pas lire la RAM, garder la logique existante
-            print(f"[DEBUG] Utilisation du current player par défaut: player{self.current_player_index + 1}")
         
+        # Mise à jour des informations globales (noms configurés si disponibles)
+        player_names = tuple(self._configured_name(i, state.name) for i, _, state in states)
         self.context["global"]["player_count"] = len(self.game.players)
-        self.context["global"]["player_names"] = player_names
+        self.context["global"]["player_names"] = sections.get("global", "player_names", player_names, list, player_names)
         self.context["global"]["current_turn"] = self.current_turn
         self.context["global"]["current_player"] = f"player{self.current_player_index + 1}"
         
-        # Mise à jour des propriétés
-        properties = []
+        # Mise à jour des propriétés : dépendent du propriétaire et du nombre de maisons
+        buildings = BuildingsIndex.load()
+        house_counts = tick.get("buildings") or {}
         property_owners = {}  # Pour stocker quel joueur possède quelle propriété
+        for i, _, state in states:
+            for prop_position in owned[i]:
+                property_owners[prop_position] = state.id
+        property_inputs = tuple(
+            (space["id"], property_owners.get(space["id"]), buildings.house_count(space["name"], house_counts) or 0)
+            for space in self.monopoly_board if space["type"] == "property"
+        )
+        properties = sections.get("properties", None, property_inputs, self._build_properties, property_inputs)
+        self.context["global"]["properties"] = properties
         
-        # Récupérer les propriétés de chaque joueur
-        for i, player in enumerate(self.game.players):
+        # Résumé des constructions, recalculé avec les propriétés
+        self.context["global"]["buildings_summary"] = sections.get(
+            "buildings", None, property_inputs, Contexte._build_buildings_summary, properties)
+        
+        # Mise à jour des joueurs
+        houses_by_position = {prop["id"]: prop["houses"] for prop in properties}
+        mortgage_mask = tick.get("mortgages") or 0
+        players = {}
+        for i, player, state in states:
+            player_key = f"player{i+1}"
+            positions = owned[i]
+            player_inputs = (
+                state.id, state.name, state.money, tuple(state.dices), state.position, positions,
+                tuple(houses_by_position.get(position, 0) for position in positions),
+                tuple(MortgageIndex.is_mortgaged(mortgage_mask, position) for position in positions),
+                i == self.current_player_index,
+            )
             try:
-                # Utiliser owned_properties au lieu de properties pour éviter la confusion avec la position actuelle
-                for prop in player.owned_properties:
-                    try:
-                        prop_position = prop.position
-                        property_owners[prop_position] = player.id
-                        # Debug pour Bond Street
-                        if prop_position == 34:
-                            print(f"[DEBUG] Bond Street owner: player.id={player.id}")
-                    except:
-                        pass
-            except:
-                pass
+                players[player_key] = sections.get(
+                    "player", player_key, player_inputs, self._build_player,
+                    i, player, state, positions, houses_by_position, tick)
+            except Exception as e:
+                print(f"Erreur lors de la mise à jour d'un joueur: {e}")
+        sections.retain("player", players)
         
-        # Créer la liste de toutes les propriétés du plateau
-        for space in self.monopoly_board:
-            if space["type"] == "property":
-                prop_id = space["id"]
-                owner = property_owners.get(prop_id, None)
-                
-                # Obtenir les informations de prix standard
-                price, house_price, rents = self._get_property_details(prop_id, space["color"])
-                
-                # Récupérer les coordonnées depuis property_manager
-                coords = None
-                prop_details = property_manager.get_property_by_position(prop_id)
-                if prop_details and 'coordinates' in prop_details:
-                    coords = {
-                        'x_relative': prop_details['coordinates']['x_relative'],
-                        'y_relative': prop_details['coordinates']['y_relative'],
-                        'x_pixel': prop_details['coordinates']['x_pixel'],
-                        'y_pixel': prop_details['coordinates']['y_pixel']
-                    }
-                
-                # Récupérer le nombre de maisons/hôtels sur cette propriété
-                house_count = 0
-                try:
-                    house_count = get_property_house_count(space["name"]) or 0
-                except Exception as e:
-                    # En cas d'erreur, laisser à 0
-                    pass
-                
-                # Calculer le loyer actuel en fonction du nombre de maisons
-                current_rent = 0
-                if owner and house_count >= 0 and house_count < len(rents):
-                    current_rent = rents[house_count]
-                
-                properties.append({
-                    "id": prop_id,
-                    "name": space["name"],
-                    "group": space["color"],
-                    "price": price,
-                    "rent": rents,
-                    "current_rent": current_rent,  # Loyer actuel basé sur les constructions
-                    "house_price": house_price,
-                    "owner": owner,
-                    "houses": house_count,  # Nombre de maisons/hôtel (5 = hôtel)
-                    "has_hotel": house_count == 5,  # True si la propriété a un hôtel
-                    "coordinates": coords  # Ajout des coordonnées
-                })
+        players_inputs = tuple((player_key, id(entry)) for player_key, entry in players.items())
+        self.context["players"] = sections.get("players", None, players_inputs, dict, players)
         
-        self.context["global"]["properties"] = properties
+        # Mise à jour du plateau
+        if not self.context["board"]["spaces"]:
+            # Utiliser le plateau de Monopoly initialisé
+            self.context["board"]["spaces"] = self.monopoly_board
         
-        # Ajouter un résumé des constructions
-        total_houses = sum(1 for p in properties if 0 < p["houses"] < 5) 
+        # Limiter le nombre d'événements
+        if len(self.context["events"]) > 20:
+            self.context["events"] = self.context["events"][-20:]
+    
+    def _configured_name(self, index: int, name: str) -> str:
+        """Nom configuré pour le joueur index, sinon le nom lu en RAM"""
+        player_key = f"player{index+1}"
+        if player_key in self.game_settings.get("players", {}):
+            return self.game_settings["players"][player_key].get("name", name)
+        return name
+    
+    def _read_player_states(self) -> List[Tuple[int, Any, PlayerState]]:
+        """(indice, joueur, état) de chaque joueur lisible"""
+        states = []
+        for i, player in enumerate(self.game.players):
+            try:
+                states.append((i, player, PlayerState.read(player)))
+            except Exception as e:
+                if DmeSession.is_disconnect_error(e):
+                    # Toute la mise à jour est abandonnée, pas seulement ce joueur
+                    raise
+                print(f"Erreur lors de la mise à jour d'un joueur: {e}")
+        return states
+    
+    @staticmethod
+    def _owned_positions(state: PlayerState) -> Tuple[int, ...]:
+        """Positions des propriétés réellement possédées, sans doublons (comme Player.owned_properties)"""
+        positions = []
+        for prop in state.properties:
+            prop_position = prop["position"]
+            if 0 <= prop_position <= 39 and prop_position not in positions:
+                positions.append(prop_position)
+        return tuple(positions)
+    
+    def _build_properties(self, property_inputs) -> List[dict]:
+        """Liste de toutes les propriétés du plateau ; seules celles dont les entrées ont changé sont recréées"""
+        return [
+            self._sections.get("property", prop_id, (owner, house_count), self._build_property,
+                               prop_id, owner, house_count)
+            for prop_id, owner, house_count in property_inputs
+        ]
+    
+    def _build_property(self, prop_id: int, owner, house_count: int) -> dict:
+        space = self.monopoly_board[prop_id]
+        # Debug pour Bond Street
+        if prop_id == 34 and owner is not None:
+            print(f"[DEBUG] Bond Street owner: player.id={owner}")
+        
+        # Obtenir les informations de prix standard
+        price, house_price, rents = self._get_property_details(prop_id, space["color"])
+        
+        # Récupérer les coordonnées depuis property_manager
+        coords = None
+        prop_details = property_manager.get_property_by_position(prop_id)
+        if prop_details and 'coordinates' in prop_details:
+            coords = {
+                'x_relative': prop_details['coordinates']['x_relative'],
+                'y_relative': prop_details['coordinates']['y_relative'],
+                'x_pixel': prop_details['coordinates']['x_pixel'],
+                'y_pixel': prop_details['coordinates']['y_pixel']
+            }
+        
+        # Calculer le loyer actuel en fonction du nombre de maisons
+        current_rent = 0
+        if owner and house_count >= 0 and house_count < len(rents):
+            current_rent = rents[house_count]
+        
+        return {
+            "id": prop_id,
+            "name": space["name"],
+            "group": space["color"],
+            "price": price,
+            "rent": rents,
+            "current_rent": current_rent,  # Loyer actuel basé sur les constructions
+            "house_price": house_price,
+            "owner": owner,
+            "houses": house_count,  # Nombre de maisons/hôtel (5 = hôtel)
+            "has_hotel": house_count == 5,  # True si la propriété a un hôtel
+            "coordinates": coords  # Ajout des coordonnées
+        }
+    
+    @staticmethod
+    def _build_buildings_summary(properties: List[dict]) -> dict:
+        """Résumé des constructions"""
         total_hotels = sum(1 for p in properties if p["houses"] == 5)
         properties_with_buildings = [p for p in properties if p["houses"] > 0]
         
-        self.context["global"]["buildings_summary"] = {
+        return {
             "total_houses": sum(p["houses"] for p in properties if p["houses"] < 5),
             "total_hotels": total_hotels,
             "properties_with_houses": [{
@@ -288,159 +415,136 @@ class Contexte:
                 "group": p["group"]
             } for p in properties_with_buildings if p["houses"] == 5]
         }
-        
-        # Mise à jour des joueurs
-        players = {}
-        
-        for i, player in enumerate(self.game.players):
+    
+    def _build_player(self, i: int, player, state: PlayerState, positions, houses_by_position, tick) -> dict:
+        """Entrée du joueur i dans context["players"]"""
+        player_key = f"player{i+1}"
+        
+        # Utiliser le nom configuré pour ce joueur
+        player_name = self._configured_name(i, state.name)
+        
+        # Vérifier si le nom est corrompu (caractères non-ASCII)
+        if player_name and any(ord(c) > 127 for c in player_name):
+            # Logger seulement la première fois
+            if not hasattr(self, '_corruption_logged'):
+                self._corruption_logged = True
+                print(f"⚠️  Nom corrompu détecté pour {player_key}. Utilisation du nom de configuration.")
+            # Utiliser le nom de la configuration
+            config_name = self.game_settings.get('players', {}).get(player_key, {}).get('name', f'GPT{i+1}')
+            player_name = config_name
+            
+            # Essayer d'écrire le nom correct en mémoire
             try:
-                player_id = player.id
-                
-                # Utiliser le nom configuré pour ce joueur
-                player_key = f"player{i+1}"
-                if player_key in self.game_settings.get("players", {}):
-                    player_name = self.game_settings["players"][player_key].get("name", player.name)
-                else:
-                    player_name = player.name
-                
-                # Vérifier si le nom est corrompu (caractères non-ASCII)
-                if player_name and any(ord(c) > 127 for c in player_name):
-                    # Logger seulement la première fois
-                    if not hasattr(self, '_corruption_logged'):
-                        self._corruption_logged = True
-                        print(f"⚠️  Nom corrompu détecté pour {player_key}. Utilisation du nom de configuration.")
-                    # Utiliser le nom de la configuration
-                    config_name = self.game_settings.get('players', {}).get(player_key, {}).get('name', f'GPT{i+1}')
-                    player_name = config_name
-                    
-                    # Essayer d'écrire le nom correct en mémoire
-                    try:
-                        player.name = config_name
-                    except Exception as e:
-                        pass  # Ignorer silencieusement les erreurs
-                
-                # Debug: afficher les infos du joueur (désactivé pour éviter le spam)
-                # print(f"[DEBUG] Joueur {i+1}: id={player_id}, nom={player_name}, argent={player.money}, position={player.position}")
-                
-                # Récupérer les propriétés du joueur
-                player_properties = []
-                try:
-                    # Utiliser la méthode owned_properties qui filtre les propriétés valides
-                    for prop in player.owned_properties:
-                        try:
-                            prop_position = prop.position
-                            if 0 <= prop_position < len(self.monopoly_board):
-                                prop_info = self.monopoly_board[prop_position]
-                                if prop_info["type"] == "property":
-                                    # Récupérer le nombre de maisons depuis la liste globale des propriétés
-                                    houses = 0
-                                    for global_prop in properties:
-                                        if global_prop["id"] == prop_position:
-                                            houses = global_prop.get("houses", 0)
-                                            break
-                                    
-                                    # Vérifier si la propriété est hypothéquée
-                                    is_mortgaged = Property.is_property_mortgaged(prop_info["name"])
-                                    
-                                    player_properties.append({
-                                        "id": prop_position,
-                                        "name": prop_info["name"],
-                                        "group": prop_info.get("color", "unknown"),
-                                        "houses": houses,
-                                        "is_mortgaged": is_mortgaged
-                                    })
-                        except:
-                            pass
-                except:
-                    pass
-                
-                # Déterminer l'espace actuel
-                position = getattr(player, 'position', 0)
-                current_space = "Unknown"
-                
-                # Utiliser le nom réel de la case à partir du plateau
-                if 0 <= position < len(self.monopoly_board):
-                    current_space = self.monopoly_board[position]["name"]
-                else:
-                    for space in self.context["board"]["spaces"]:
-                        if space["id"] == position:
-                            current_space = space["name"]
-                            break
-                
-                # Déterminer si le joueur est en prison
-                in_jail = position == 10 and getattr(player, 'jail_turns', 0) > 0
-                
-                # Debug: afficher les propriétés du joueur (version simplifiée)
-                if len(player_properties) > 0:
-                    print(f"[INFO] {player_name}: {len(player_properties)} propriétés")
-                
-                # Utiliser player_key comme clé au lieu du nom
-                players[player_key] = {
-                    "name": player_name,
-                    "ai_model": self.game_settings.get("players", {}).get(player_key, {}).get("ai_model", "gpt-4.1-mini"),
-                    "provider": self.game_settings.get("players", {}).get(player_key, {}).get("provider", "openai"),
-                    "current_player": (i == self.current_player_index),
-                    "is_current": (i == self.current_player_index),  # Ajout pour la compatibilité
-                    "dice_result": getattr(player, 'dices', None),
-                    "money": getattr(player, 'money', 0),
-                    "properties": player_properties,
-                    "position": position,
-                    "current_space": current_space,
-                    "jail": in_jail
-                }
-                
+                player.name = config_name
             except Exception as e:
-                print(f"Erreur lors de la mise à jour d'un joueur: {e}")
+                pass  # Ignorer silencieusement les erreurs
+        
+        # Récupérer les propriétés du joueur
+        player_properties = []
+        for prop_position in positions:
+            prop_info = self.monopoly_board[prop_position]
+            if prop_info["type"] == "property":
+                player_properties.append({
+                    "id": prop_position,
+                    "name": prop_info["name"],
+                    "group": prop_info.get("color", "unknown"),
+                    "houses": houses_by_position.get(prop_position, 0),
+                    # Vérifier si la propriété est hypothéquée
+                    "is_mortgaged": MortgageIndex.is_mortgaged(tick.get("mortgages") or 0, prop_position)
+                })
         
-        self.context["players"] = players
+        # Déterminer l'espace actuel
+        position = state.position
+        current_space = "Unknown"
         
-        # Mise à jour du plateau
-        if not self.context["board"]["spaces"]:
-            # Utiliser le plateau de Monopoly initialisé
-            self.context["board"]["spaces"] = self.monopoly_board
+        # Utiliser le nom réel de la case à partir du plateau
+        if 0 <= position < len(self.monopoly_board):
+            current_space = self.monopoly_board[position]["name"]
+        else:
+            for space in self.context["board"]["spaces"]:
+                if space["id"] == position:
+                    current_space = space["name"]
+                    break
         
-        # Limiter le nombre d'événements
-        if len(self.context["events"]) > 20:
-            self.context["events"] = self.context["events"][-20:]
+        # Déterminer si le joueur est en prison
+        in_jail = position == 10 and getattr(player, 'jail_turns', 0) > 0
+        
+        # Debug: afficher les propriétés du joueur (version simplifiée)
+        if len(player_properties) > 0:
+            print(f"[INFO] {player_name}: {len(player_properties)} propriétés")
+        
+        return {
+            "name": player_name,
+            "ai_model": self.game_settings.get("players", {}).get(player_key, {}).get("ai_model", "gpt-4.1-mini"),
+            "provider": self.game_settings.get("players", {}).get(player_key, {}).get("provider", "openai"),
+            "current_player": (i == self.current_player_index),
+            "is_current": (i == self.current_player_index),  # Ajout pour la compatibilité
+            "dice_result": state.dices,
+            "money": state.money,
+            "properties": player_properties,
+            "position": position,
+            "current_space": current_space,
+            "jail": in_jail
+        }
+    
+    def snapshot(self) -> dict:
+        """Copie du contexte, prise sous le verrou (à sérialiser hors des mises à jour)"""
+        with self._lock:
+            return copy.deepcopy(self.context)
+    
+    def section_stats(self) -> dict:
+        """Recalculs et réutilisations des sections du contexte"""
+        return self._sections.stats()
     
     def _save_context(self):
-        """Sauvegarde le contexte dans le fichier JSON"""
-        with open(self.context_file, 'w', encoding='utf-8') as f:
-            json.dump(self.context, f, ensure_ascii=False, indent=2)
+        """Sauvegarde le contexte dans le fichier JSON (rien n'est écrit s'il n'a pas changé)"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            text = json.dumps(self.context, ensure_ascii=False, indent=2)
+            if text == self._saved_text:
+                return
+            with open(self.context_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+            self._saved_text = text
     
-    def _save_history(self, event_type: str):
-        """Sauvegarde une copie du contexte dans l'historique"""
-        timestamp = int(time.time())
-        history_file = os.path.join(self.context_history_dir, f"{timestamp}_{event_type}.json")
-        with open(history_file, 'w', encoding='utf-8') as f:
-            json.dump(self.context, f, ensure_ascii=False, indent=2)
+    def _save_context_later(self):
+        """Programme la sauvegarde du fichier JSON dans save_delay secondes (si elle ne l'est pas déjà)"""
+        with self._lock:
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay, self._save_context)
+                self._save_timer.daemon = True
+                self._save_timer.start()
     
     def _add_event(self, player_name, action, detail=None):
         """Ajoute un événement à la liste des événements avec un message descriptif"""
-        # Vérifier si l'événement est pertinent ou s'il doit être ignoré
-        if self._should_ignore_event(action, player_name, detail):
-            return
+        # Appelé depuis les callbacks et app.py : le contexte n'est modifié que sous le verrou
+        with self._lock:
+            # Vérifier si l'événement est pertinent ou s'il doit être ignoré
+            if self._should_ignore_event(action, player_name, detail):
+                return
             
-        # Fusionner avec l'événement précédent si possible
-        if self._should_merge_with_previous(action, player_name, detail):
-            return
+            # Fusionner avec l'événement précédent si possible
+            if self._should_merge_with_previous(action, player_name, detail):
+                return
             
-        # Créer un message descriptif basé sur l'action et les détails
-        message = self._generate_event_message(player_name, action, detail)
-        
-        event = {
-            "turn": self.current_turn,
-            "player": player_name,
-            "action": action,
-            "detail": detail,
-            "message": message
-        }
-        self.context["events"].append(event)
-        self.turn_events.append(event)
+            # Créer un message descriptif basé sur l'action et les détails
+            message = self._generate_event_message(player_name, action, detail)
+        
+            event = {
+                "turn": self.current_turn,
+                "player": player_name,
+                "action": action,
+                "detail": detail,
+                "message": message
+            }
+            self.context["events"].append(event)
+            self.turn_events.append(event)
         
-        # Vérifier si c'est la fin du tour
-        if self._is_turn_ending_action(action):
-            self._end_turn()
+            # Vérifier si c'est la fin du tour
+            if self._is_turn_ending_action(action):
+                self._end_turn()
     
     def _should_ignore_event(self, action, player_name, detail):
         """Détermine si un événement doit être ignoré"""
@@ -747,50 +851,77 @@ class Contexte:
     
     def _end_turn(self):
         """Termine le tour actuel et passe au joueur suivant"""
-        # Passer au joueur suivant
-        self.current_player_index = (self.current_player_index + 1) % max(1, len(self.game.players))
+        # Modifie le contexte : sous le verrou, comme les mises à jour
+        with self._lock:
+            # Passer au joueur suivant
+            self.current_player_index = (self.current_player_index + 1) % max(1, len(self.game.players))
         
-        # Si on revient au premier joueur, incrémenter le numéro de tour
-        if self.current_player_index == 0:
-            self.current_turn += 1
+            # Si on revient au premier joueur, incrémenter le numéro de tour
+            if self.current_player_index == 0:
+                self.current_turn += 1
         
-        # Mettre à jour le contexte global
-        self.context["global"]["current_turn"] = self.current_turn
+            # Mettre à jour le contexte global
+            self.context["global"]["current_turn"] = self.current_turn
         
-        # Réinitialiser les événements du tour
-        self.turn_events = []
+            # Réinitialiser les événements du tour
+            self.turn_events = []
         
-        # Mettre à jour le joueur actuel dans le contexte
-        self._update_current_player()
+            # Mettre à jour le joueur actuel dans le contexte
+            self._update_current_player()
     
     def _update_current_player(self):
         """Met à jour le joueur actuel dans le contexte"""
+        # Les entrées des joueurs sont partagées avec les sections du contexte : elles
+        # sont remplacées par des copies, jamais modifiées sur place
+        players = dict(self.context["players"])
         for i, player in enumerate(self.game.players):
             try:
                 player_key = f"player{i+1}"
-                if player_key in self.context["players"]:
-                    self.context["players"][player_key]["current_player"] = (i == self.current_player_index)
-                    self.context["players"][player_key]["is_current"] = (i == self.current_player_index)
+                if player_key in players:
+                    entry = dict(players[player_key])
+                    entry["current_player"] = (i == self.current_player_index)
+                    entry["is_current"] = (i == self.current_player_index)
+                    players[player_key] = entry
             except Exception as e:
                 print(f"Erreur lors de la mise à jour du joueur actuel: {e}")
+        self.context["players"] = players
         
         # Mettre à jour le joueur actuel dans global
         self.context["global"]["current_player"] = f"player{self.current_player_index + 1}"
     
+    def _persist(self, history: str = None):
+        """Met à jour le contexte et l'ajoute au journal, ou le reporte à la fin du lot en cours"""
+        if self._batch_history is not None:
+            if history:
+                self._batch_history.append(history)
+            return
+        with self._lock:
+            self._update_context()
+            self.journal.record(self.context, history)
+        self._save_context_later()
+    
+    def _on_batch_started(self, size):
+        self._batch_history = []
+    
+    def _on_batch_ended(self, events):
+        """Fin d'un lot d'événements regroupés : une seule mise à jour et une seule ligne de journal"""
+        history, self._batch_history = self._batch_history, None
+        with self._lock:
+            self._update_context()
+            # Ligne nommée d'après les types d'événements du lot
+            self.journal.record(self.context, "+".join(dict.fromkeys(history)) if history else None)
+        self._save_context_later()
+    
     # Callbacks pour les événements
     def _on_player_added(self, player):
         player_name = getattr(player, 'name', 'Unknown')
         self._add_event(player_name, "join_game")
-        self._update_context()
-        self._save_context()
-        self._save_history("player_added")
+        self._persist("player_added")
     
     def _on_player_removed(self, player):
         player_name = getattr(player, 'name', 'Unknown')
         self._add_event(player_name, "leave_game")
-        self._update_context()
-        self._save_context()
-        self._save_history("player_removed")
+        self._persist("player_removed")
     
     def _on_player_money_changed(self, player, new_value, old_value):
         player_name = getattr(player, 'name', 'Unknown')
@@ -804,9 +935,7 @@ class Contexte:
         else:
             self._add_event(player_name, "pay_money", f"{abs(diff)}€ ({reason})")
             
-        self._update_context()
-        self._save_context()
-        self._save_history("player_money_changed")
+        self._persist("player_money_changed")
     
     def _determine_money_change_reason(self, player, diff):
         """Détermine la raison probable d'un changement d'argent"""
@@ -839,9 +968,7 @@ class Contexte:
     
     def _on_player_name_changed(self, player, new_value, old_value):
         self._add_event(old_value, "change_name", new_value)
-        self._update_context()
-        self._save_context()
-        self._save_history("player_name_changed")
+        self._persist("player_name_changed")
     
     def _on_player_dice_changed(self, player, new_value, old_value, ignore):
         player_name = getattr(player, 'name', 'Unknown')
@@ -900,9 +1027,7 @@ class Contexte:
                     self._add_event(player_name, "pay_rent", f"{rent}€ to {owner_name} pour {space_name}")
                     break
         
-        self._update_context()
-        self._save_context()
-        self._save_history("player_dice_changed")
+        self._persist("player_dice_changed")
     
     def _on_player_goto_changed(self, player, new_value, old_value):
         player_name = getattr(player, 'name', 'Unknown')
@@ -941,9 +1066,7 @@ class Contexte:
                 self._add_event(player_name, "pay_rent", f"{rent}€ to {owner_name} pour {space_name}")
                 break
         
-        self._update_context()
-        self._save_context()
-        self._save_history("player_goto_changed")
+        self._persist("player_goto_changed")
     
     def _on_player_position_changed(self, player, new_value, old_value):
         player_name = getattr(player, 'name', 'Unknown')
@@ -978,9 +1101,7 @@ class Contexte:
                     self._add_event(player_name, "pay_rent", f"{rent}€ to {owner_name} pour {space_name}")
                     break
         
-        self._update_context()
-        self._save_context()
-        self._save_history("player_position_changed")
+        self._persist("player_position_changed")
     
     def _on_player_properties_changed(self, player, new_properties, old_properties):
         """Gère les changements de propriétés d'un joueur"""
@@ -1014,18 +1135,24 @@ class Contexte:
                     self._add_event(player_name, "lose_property", prop_info['name'])
         
         # Mettre à jour le contexte
-        self._update_context()
-        self._save_context()
-        self._save_history("player_properties_changed")
+        self._persist("player_properties_changed")
+    
+    def _on_property_mortgage_changed(self, position, name, mortgaged):
+        # Le propriétaire est celui du contexte courant
+        owner = next((prop["owner"] for prop in self.context["global"]["properties"] if prop["id"] == position), None)
+        player = self.game.get_player_by_id(owner) if owner is not None else None
+        player_name = getattr(player, 'name', "System") if player is not None else "System"
+        
+        action = "mortgage_property" if mortgaged else "unmortgage_property"
+        self._add_event(player_name, action, position)
+        self._persist("property_mortgage_changed")
     
     def _on_auction_started(self):
         # Déterminer la propriété mise aux enchères (si possible)
         property_name = "une propriété"
         
         self._add_event("System", "auction_started", property_name)
-        self._update_context()
-        self._save_context()
-        self._save_history("auction_started")
+        self._persist("auction_started")
     
     def _on_auction_ended(self, last_bid):
         detail = "Aucune offre n'a été faite."
@@ -1047,9 +1174,7 @@ class Contexte:
                 self._add_event(player_name, "buy_property", f"{property_name} pour {bid_amount}€ (enchère)")
         
         self._add_event("System", "auction_ended", detail)
-        self._update_context()
-        self._save_context()
-        self._save_history("auction_ended")
+        self._persist("auction_ended")
     
     def _on_auction_bid(self, bid):
         try:
@@ -1070,9 +1195,7 @@ class Contexte:
             print(f"Erreur lors de la gestion d'une enchère: {e}")
             self._add_event("System", "bid_error", str(e))
         
-        self._update_context()
-        self._save_context()
-        self._save_history("auction_bid")
+        self._persist("auction_bid")
     
     def _on_message_added(self, id, message, address, group):
         # Analyser le message pour déterminer son type
@@ -1088,8 +1211,7 @@ class Contexte:
         else:
             self._add_event("System", "message", detail)
         
-        self._update_context()
-        self._save_context()
+        self._persist()
     
     def _analyze_message(self, id, message):
         """Analyse un message pour déterminer son type"""
@@ -1,28 +1,43 @@
 import json
 from src.core.message_finder import MessageFinder
+from src.core.memory_reader import MemoryReader
+from src.core.mortgage_index import MortgageIndex
+from src.core.dme_session import DmeSession
 from src.core.listeners import EventListeners
+from src.core.listener_stats import ListenerStats
+from src.core.tick_scheduler import TickScheduler
 from src.game.monopoly import MonopolyGame
+from src.game.player_state import PlayerStates
 
 import threading
-import time
 
 class MonopolyListeners(EventListeners):
     
     _game: MonopolyGame
     _running: bool
     _thread: threading.Thread
-    tps: int = 1
+    _scheduler: TickScheduler
 
     def __init__(self, game):
         super().__init__()
         self._game = game
         self._running = False
         self._thread = None
+        self._scheduler = TickScheduler()
+        self._message_founds = {}
+        self._players = PlayerStates()
+        # États d'hypothèque du tick précédent (bit n : case n), None avant la première lecture
+        self._mortgages = None
+        self._stats = ListenerStats()
 
     def start(self):
         if not self._running:
             print("[DEBUG Listeners] Starting listeners thread")
             self._running = True
+            # Les intervalles interval_* peuvent avoir été modifiés avant le démarrage
+            for name in MonopolyListeners.HANDLERS:
+                handler = self._stats.wrap(name, getattr(self, name + "_handler"))
+                self._scheduler.add(name, handler, getattr(self, "interval_" + name))
             self._thread = threading.Thread(target=self._run)
             self._thread.daemon = True  # Ensure the thread does not block main thread exit
             self._thread.start()
@@ -33,202 +48,159 @@ class MonopolyListeners(EventListeners):
     def stop(self):
         if self._running:
             self._running = False
+            self._scheduler.wake()
             self._thread.join()
-            
-    # { id, text, address }
-    _message_founds = []
     
-    def message_handler(self):
-        try:
-            messages = MessageFinder.messages(self._game)
-        except RuntimeError as e:
-            if "Could not read memory" in str(e):
-                # Dolphin s'est probablement fermé
-                print("⚠️ Erreur de lecture mémoire - Dolphin semble être fermé")
-                self._running = False
+    def schedule(self, name: str, handler, interval: float):
+        """Exécute handler toutes les interval secondes dans le thread des listeners"""
+        if name in MonopolyListeners.HANDLERS:
+            raise ValueError(f"Handler réservé : {name}")
+        self._scheduler.add(name, self._stats.wrap(name, handler), interval)
+        
+    def unschedule(self, name: str):
+        if name in MonopolyListeners.HANDLERS:
+            raise ValueError(f"Handler réservé : {name}")
+        self._scheduler.remove(name)
+    
+    def set_interval(self, name: str, interval: float):
+        """Change l'intervalle d'un handler (player, message, auction ou ajouté par schedule)"""
+        if name in MonopolyListeners.HANDLERS:
+            if interval <= 0:
+                raise ValueError(f"Intervalle invalide pour {name} : {interval}")
+            setattr(self, "interval_" + name, interval)
+            if name not in self._scheduler.jobs:
+                # Pas encore démarré : pris en compte par start()
                 return
-            else:
-                raise
-        self.emit("message_handling", messages)
-         
-        # remove old messages
-        for message in self._message_founds:
-            index = MonopolyListeners.find_index(
-                messages,
-                lambda x: x["id"] == message["id"]
-            )
-            if index == -1:
-                self._message_founds.remove(message)
-                self.emit("message_removed", message["id"], message["text"], message["address"])
-            else:
-                index = MonopolyListeners.find_index(
-                    messages[index]["data"],
-                    lambda x: x["address"] == message["address"] and x["text"] == message["text"]
-                )
-                if index == -1:
-                    self._message_founds.remove(message)
-                    self.emit("message_removed", message["id"], message["text"], message["address"])
+        self._scheduler.set_interval(name, interval)
     
-        # add new messages 
+    @property
+    def intervals(self) -> dict:
+        intervals = {name: getattr(self, "interval_" + name) for name in MonopolyListeners.HANDLERS}
+        intervals.update(self._scheduler.intervals())
+        return intervals
+    
+    def scheduler_stats(self) -> dict:
+        """Exécutions, dépassements et retards de chaque handler"""
+        return self._scheduler.stats()
+    
+    def emit(self, event_name, *args, **kwargs):
+        self._stats.detected(event_name)
+        super().emit(event_name, *args, **kwargs)
+    
+    def stats(self) -> dict:
+        """
+        Mesures des listeners : par handler, durées (histogramme), lectures dme et
+        octets, âge de la dernière lecture réussie, délai de détection des changements
+        et dépassements d'échéance ; plus l'état de la distribution des événements.
+        """
+        stats = self._stats.to_dict()
+        for name, scheduled in self._scheduler.stats().items():
+            stats["handlers"].setdefault(name, {})["schedule"] = scheduled
+        stats["dispatch"] = self.dispatch_stats()
+        return stats
+            
+    # (id, address, text) -> { id, text, address, group }, dans l'ordre d'apparition
+    _message_founds: dict
+    
+    @staticmethod
+    def message_keys(messages) -> dict:
+        """Messages trouvés par MessageFinder, indexés par (id, address, text) dans l'ordre du scan"""
+        current = {}
         for message in messages:
             for data in message["data"]:
-                index = MonopolyListeners.find_index(
-                    self._message_founds, 
-                    lambda x: x["id"] == message["id"] and x["address"] == data["address"] and x["text"] == data["text"]
-                )
-                if index == -1:
-                    event = {
+                key = (message["id"], data["address"], data["text"])
+                if key not in current:
+                    current[key] = {
                         "id": message["id"],
                         "text": data["text"],
                         "address": data["address"],
                         "group": message.get("group", None)
                     }
-                    self._message_founds.append(event)
-                    self.emit("message_added", event["id"], event["text"], event["address"], event["group"])
+        return current
+    
+    def message_handler(self):
+        try:
+            messages = MessageFinder.messages(self._game)
+        except RuntimeError as e:
+            if self._connection_lost(e, "message_handler"):
+                return
+            raise
+        self.emit("message_handling", messages)
+        
+        current = MonopolyListeners.message_keys(messages)
+        previous = self._message_founds
+        # Les messages restants gardent leur ordre d'ajout, les nouveaux suivent dans l'ordre du scan
+        founds = {key: message for key, message in previous.items() if key in current}
+        
+        # remove old messages (ordre dans lequel ils avaient été ajoutés)
+        for key, message in previous.items():
+            if key not in current:
+                self.emit("message_removed", message["id"], message["text"], message["address"])
+        
+        # add new messages (ordre du scan)
+        for key, event in current.items():
+            if key not in previous:
+                founds[key] = event
+                self.emit("message_added", event["id"], event["text"], event["address"], event["group"])
+        self._message_founds = founds
                    
+    def _connection_lost(self, error: RuntimeError, handler: str) -> bool:
+        """
+        Vrai si error est une perte de connexion à Dolphin : la session partagée se
+        reconnecte et les handlers sont mis en pause, l'état des diffs est conservé
+        """
+        if not DmeSession.is_disconnect_error(error):
+            return False
+        print(f"⚠️ Erreur de lecture mémoire dans {handler} - Dolphin semble être fermé, reconnexion...")
+        # Le passage compte comme une erreur, pas comme une lecture réussie
+        self._stats.failed()
+        self._game.session.lost(error)
+        return True
+    
     @staticmethod
     def find_index(lst, func): 
         return next((i for i, x in enumerate(lst) if func(x)), -1)
     
-    _players = []
-    
-    def player_properties_handler(self):
-        """Gère les changements de propriétés des joueurs"""
-        for player in self._players:
-            game_player = self._game.get_player_by_id(player["id"])
-            if game_player is None:
-                self.emit("warning", "Player not found in player_properties_handler")
-                continue
-            
-            # Récupérer les propriétés actuelles
-            current_properties = []
-            try:
-                for prop in game_player.properties:
-                    prop_data = {
-                        "name": prop.name,
-                        "position": prop.position,
-                        "price": prop.price,
-                        "rents": prop.rents
-                    }
-                    current_properties.append(prop_data)
-            except Exception as e:
-                # Les propriétés peuvent ne pas être encore disponibles
-                pass
-            
-            old_properties = player.get("properties", [])
-            
-            # Vérifier si les propriétés ont changé
-            if old_properties != current_properties:
-                player["properties"] = current_properties
-                self.emit("player_properties_changed", game_player, current_properties, old_properties)
-    
-    def player_money_handler(self):
-        for player in self._players:
-            game_player = self._game.get_player_by_id(player["id"])
-            if game_player is None:
-                self.emit("warning", "Player not found in player_money_handler")
-                continue
-            old,new = player["money"], game_player.money
-            if old != new:
-                player["money"] = new
-                self.emit("player_money_changed", game_player, new, old)
-    
-    def player_name_handler(self):
-        for player in self._players:
-            game_player = self._game.get_player_by_id(player["id"])
-            if game_player is None:
-                self.emit("warning", "Player not found in player_name_handler")
-                continue
-            old,new = player["name"], game_player.name
-            if old != new:
-                player["name"] = new
-                self.emit("player_name_changed", game_player, new, old)
-                
-    def player_dice_handler(self):
-        for player in self._players:
-            game_player = self._game.get_player_by_id(player["id"])
-            if game_player is None:
-                self.emit("warning", "Player not found in player_dice_handler")
-                continue
-            
-            old,new = player["dices"], game_player.dices
-            
-            if old != new:
-                player["dices"] = new
-                if new == [0, 0]:
-                    player["ignore_next_dice"] = True
-                    continue
-                if player["ignore_next_dice"]:
-                    player["ignore_next_dice"] = False
-                    self.emit("player_dice_changed", game_player, new, old, True)
-                    continue
-                player["ignore_next_dice"] = True
-                self.emit("player_dice_changed", game_player, new, old, False)
-                
-    def player_goto_handler(self):
-        for player in self._players:
-            game_player = self._game.get_player_by_id(player["id"])
-            if game_player is None:
-                self.emit("warning", "Player not found in player_goto_handler")
-                continue
-            old,new = player["goto"], game_player.goto
-            if old != new:
-                player["goto"] = new
-                self.emit("player_goto_changed", game_player, new, old)
-    
-    def player_position_handler(self):
-        for player in self._players:
-            game_player = self._game.get_player_by_id(player["id"])
-            if game_player is None:
-                self.emit("warning", "Player not found in player_position_handler")
-                continue
-            old,new = player["position"], game_player.position
-            if old != new:
-                player["position"] = new
-                self.emit("player_position_changed", game_player, new, old)
+    _players: PlayerStates
                 
     def player_handler(self):
-        self.emit("player_handling", self._players)
+        self.emit("player_handling", self._players.values())
         
         try:
-            # remove old players
-            for player in self._players:
-                game_player = self._game.get_player_by_id(player["id"])
-                if game_player is None:
-                    # Créer un objet temporaire avec les informations du joueur pour l'événement
-                    removed_player = type('Player', (), {'id': player["id"], 'name': player["name"]})
-                    self._players.remove(player)
-                    self.emit("player_removed", removed_player)
+            # Un seul snapshot pour l'état des joueurs, puis un second pour les
+            # propriétés dont les pointeurs viennent d'être lus
+            with MemoryReader.snapshot(self._game.snapshot_spans()), \
+                 MemoryReader.snapshot(self._game.property_spans()):
+                # Chaque joueur est lu une fois, puis comparé en une passe au tick précédent
+                removed, added, changes = self._players.update(self._game.players)
+                
+                # Les callbacks reçoivent l'état lu (PlayerState) et non le Player,
+                # dont les attributs relisent la RAM au moment du traitement
+                for state in removed:
+                    self.emit("player_removed", state)
                     
-            # add new players
-            for player in self._game.players:
-                index = MonopolyListeners.find_index(self._players, lambda x: x["id"] == player.id)
-                if index == -1:
-                    self._players.append({
-                        "id": player.id,
-                        "name": player.name,
-                        "money": player.money,
-                        "dices": player.dices,
-                        "ignore_next_dice": False,
-                        "goto": player.goto,
-                        "position": player.position,
-                        "properties": []
-                    })
-                    self.emit("player_added", player)
+                for state in added:
+                    self.emit("player_added", state)
                     
-            self.player_name_handler()
-            self.player_money_handler()
-            self.player_properties_handler()
-            self.player_dice_handler()
-            self.player_goto_handler()
-            self.player_position_handler()
+                for event, state, args in changes:
+                    self.emit(event, state, *args)
+                
+                # Octets d'hypothèque lus dans le même snapshot que les joueurs
+                self.mortgage_handler()
         except RuntimeError as e:
-            if "Could not read memory" in str(e):
-                print("⚠️ Erreur de lecture mémoire dans player_handler - Dolphin semble être fermé")
-                self._running = False
+            if self._connection_lost(e, "player_handler"):
                 return
-            else:
-                raise
+            raise
+
+    def mortgage_handler(self):
+        """Lit les états d'hypothèque de toutes les propriétés en une fois et signale ceux qui ont changé"""
+        index = MortgageIndex.load()
+        mortgages = index.read()
+        previous, self._mortgages = self._mortgages, mortgages
+        if previous is None:
+            return
+        for position, mortgaged in MortgageIndex.changes(previous, mortgages):
+            self.emit("property_mortgage_changed", position, index.names.get(position), mortgaged)
 
     _auction = {
         'active': False,
@@ -261,14 +233,33 @@ class MonopolyListeners(EventListeners):
             self.emit("auction_bid", bid)
 
     def auction_handler(self):
-        self.emit("auction_handling", self._game.auction)
-        
-        self.auction_active_handler()
-        self.auction_bid_handler()
+        try:
+            with MemoryReader.snapshot([self._game.auction.snapshot_span()]):
+                self.emit("auction_handling", self._game.auction)
+                
+                self.auction_active_handler()
+                self.auction_bid_handler()
+        except RuntimeError as e:
+            if self._connection_lost(e, "auction_handler"):
+                return
+            raise
         
-    _last_time_message = 0
-    _last_time_player = 0
-    _last_time_auction = 0
+    # Changements émis en rafale (un lancer de dés : dés, position, goto, argent),
+    # à regrouper avec start_coalescing
+    COALESCED_EVENTS = (
+        "player_added", "player_removed", "player_name_changed", "player_money_changed",
+        "player_properties_changed", "player_dice_changed", "player_goto_changed",
+        "player_position_changed", "property_mortgage_changed", "message_added", "message_removed",
+    )
+    
+    # Attente maximale (secondes) d'une reconnexion avant de revérifier l'arrêt des listeners
+    RECONNECT_POLL = 1.0
+    
+    # Passages des handlers, abandonnés si la file des événements est pleine
+    PERIODIC_EVENTS = ListenerStats.PERIODIC_EVENTS
+    
+    # Handlers intégrés, ordonnancés par start() avec leur intervalle interval_<nom>
+    HANDLERS = ("player", "message", "auction")
     
     interval_message = 1 # 1 second
     interval_player = 1 # 1 second
@@ -278,6 +269,16 @@ class MonopolyListeners(EventListeners):
         # print("[DEBUG Listeners] Listener thread running")
         tick_count = 0
         while self._running:
+            # Handlers en pause pendant une reconnexion à Dolphin
+            if not self._game.session.connected:
+                self._game.session.wait_connected(MonopolyListeners.RECONNECT_POLL)
+                continue
+            
+            # Dort jusqu'à la prochaine échéance d'un handler
+            self._scheduler.wait()
+            if not self._running:
+                break
+            
             self.emit("loop_tick")
             tick_count += 1
             
@@ -285,24 +286,6 @@ class MonopolyListeners(EventListeners):
             if tick_count % 1000 == 0:  # Log every 1000 ticks instead of 100
                 print(f"[DEBUG Listeners] Still running, tick {tick_count}, {len(self._players)} players detected")
             
-            # Vérifier "You owe" à chaque tick
-            from src.core.memory_reader import MemoryReader
-            
-            if time.time() - self._last_time_player >= self.interval_player:
-                self._last_time_player = time.time()
-                self.player_handler()
-                
-            if time.time() - self._last_time_message >= self.interval_message:
-                self._last_time_message = time.time()
-                self.message_handler()
-
-            if time.time() - self._last_time_auction >= self.interval_auction:
-                self._last_time_auction = time.time()
-                self.auction_handler()
-            
-            time.sleep(1 / self.tps)
+            self._scheduler.run_pending()
         
         # print("[DEBUG Listeners] Listener thread stopped")
-
-
-
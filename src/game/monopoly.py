@@ -1,10 +1,14 @@
 from typing import List
-import dolphin_memory_engine as dme
+import zlib
 
+from src.core.dme_session import DmeSession
+from src.core.memory_backend import MemoryBackend
+from src.core.layout import Layouts
 from src.core.memory_reader import MemoryReader
 from src.core.game_loader import GameLoader
 from src.core.player import Player
 from src.core.auction import Auction
+from src.core.mortgage_index import MortgageIndex
 
 class MonopolyGame:
     """Classe principale gérant le jeu Monopoly"""
@@ -14,21 +18,26 @@ class MonopolyGame:
     _auction: Auction
     static_colors = ["blue", "red", "green", "yellow"]
     
-    def __init__(self, data):
-        """Initialise le jeu Monopoly"""
+    def __init__(self, data, backend: MemoryBackend = None):
+        """Initialise le jeu Monopoly (Dolphin par défaut, ou tout autre MemoryBackend)"""
         
         # Initialiser les données pour le jeu
         self._data = data
         
-        # Vérifier la connexion à Dolphin
-        if not dme.is_hooked():
-            dme.hook()
-        if not dme.is_hooked():
+        # Source de la RAM : un dump (DumpBackend) permet de tourner sans émulateur
+        if backend is not None:
+            MemoryReader.set_backend(backend)
+        
+        # Vérifier la connexion à Dolphin (session partagée, reconnectée automatiquement)
+        if not DmeSession.for_backend(MemoryReader.get_backend()).connect():
             raise Exception("Impossible de se connecter à Dolphin Memory Engine")
 
+        # Dispositions mémoire surchargées par la section "layouts" du manifeste
+        Layouts.load_manifest(self._data.manifest)
+        
         # Charger les joueurs
         self._players = []
-        for player in self._data.manifest["players"]:
+        for player in self._data.manifest.players:
             self._players.append(Player(player))
 
         # sort player by color with id
@@ -37,9 +46,22 @@ class MonopolyGame:
         # Charger les cases
         self._squares = []
 
+        # Table des propriétés (voir property_table)
+        self._property_table = None
+        
         # Auction
-        self._auction = Auction(MemoryReader.hex_to_int(self._data.manifest["auction"]))
+        self._auction = Auction(self._data.manifest.auction)
         
+    @property
+    def backend(self) -> MemoryBackend:
+        """Renvoie la source de RAM utilisée par le jeu"""
+        return MemoryReader.get_backend()
+    
+    @property
+    def session(self) -> DmeSession:
+        """Connexion partagée à la RAM (reconnexion automatique après une perte)"""
+        return DmeSession.for_backend(MemoryReader.get_backend())
+    
     @property
     def auction(self) -> Auction:
         """Renvoie l'instance de l'enchère"""
@@ -55,6 +77,23 @@ class MonopolyGame:
         """Définit la liste des joueurs"""
         self._players = value
         
+    def snapshot_spans(self):
+        """Plages RAM à lire en un seul snapshot pour un tick (joueurs, enchère, hypothèques)"""
+        spans = [self._auction.snapshot_span()]
+        for player in self._players:
+            spans.extend(player.snapshot_spans())
+        mortgages = MortgageIndex.load()
+        if mortgages.addresses:
+            spans.append(mortgages.span)
+        return spans
+    
+    def property_spans(self):
+        """Plages RAM des propriétés possédées, à lire une fois les pointeurs connus"""
+        spans = []
+        for player in self._players:
+            spans.extend(player.property_spans())
+        return spans
+        
     def get_player_by_id(self, player_id: str) -> Player:
         """Renvoie un joueur par son ID"""
         for player in self._players:
@@ -79,13 +118,59 @@ class MonopolyGame:
         """Définit les données du jeu"""
         self._data = value
         
+    @property
+    def property_table(self) -> "PropertyTable":
+        """Table des propriétés lue en RAM, analysée à nouveau seulement si son contenu change"""
+        start, end = self._data.manifest.properties_range
+        data = MemoryReader.get_bytes(start, end - start)
+        if self._property_table is None or not self._property_table.matches(data):
+            self._property_table = PropertyTable(data)
+        return self._property_table
+    
     @property
     def properties(self):
-        data = MemoryReader.get_bytes(
-            MemoryReader.hex_to_int(self._data.manifest["properties"]["address_range"][0]),
-            MemoryReader.hex_to_int(self._data.manifest["properties"]["address_range"][1]) - MemoryReader.hex_to_int(self._data.manifest["properties"]["address_range"][0])
-        )
+        """Liste des propriétés de la table ; une copie à chaque appel, modifiable par l'appelant"""
+        return [PropertyTable.copy(row) for row in self.property_table.rows]
+    
+    def get_property_by_id(self, prop_id: int):
+        return PropertyTable.copy(self.property_table.by_id.get(prop_id))
+            
+    def get_property_by_name(self, prop_name: str):
+        return PropertyTable.copy(self.property_table.by_name.get(prop_name))
+    
+    def get_property_by_player_id(self, player_id: str):
+        player = self.get_player_by_id(player_id)
+        if player is None:
+            return None
+        return self.get_property_by_id(player.goto)
+
 
+class PropertyTable:
+    """Table CSV des propriétés (HybridName, Property, Value, ...) analysée et indexée"""
+    
+    def __init__(self, data: bytes):
+        self.digest = zlib.crc32(data)
+        self.size = len(data)
+        self.rows = PropertyTable.parse(data)
+        # Première occurrence gardée, comme l'ancienne recherche linéaire
+        self.by_id = {}
+        self.by_name = {}
+        for row in self.rows:
+            self.by_id.setdefault(row.get("id"), row)
+            self.by_name.setdefault(row.get("name"), row)
+    
+    def matches(self, data: bytes) -> bool:
+        return len(data) == self.size and zlib.crc32(data) == self.digest
+    
+    @staticmethod
+    def copy(row):
+        """Copie d'une ligne de la table (None reste None) : les lignes en cache ne sont jamais exposées"""
+        if row is None:
+            return None
+        return dict(row, rents=list(row["rents"]))
+    
+    @staticmethod
+    def parse(data: bytes):
         lines = str(data)[2:-1].split("\\r\\n")
         cols = []
         for line in lines:
@@ -123,23 +208,3 @@ class MonopolyGame:
             out.append(o)
             
         return out
-    
-    def get_property_by_id(self, prop_id: int):
-        for prop in self.properties:
-            if prop["id"] == prop_id:
-                return prop
-        return None
-            
-    def get_property_by_name(self, prop_name: str):
-        for prop in self.properties:
-            if prop["name"] == prop_name:
-                return prop
-        return None
-    
-    def get_property_by_player_id(self, player_id: str):
-        player = self.get_player_by_id(player_id)
-        if player is None:
-            return None
-        return self.get_property_by_id(player.goto)
-        
-    
\ No newline at end of file
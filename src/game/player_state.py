@@ -0,0 +1,137 @@
+from typing import Dict, List, Tuple
+
+from src.core.player import Player
+
+class PlayerState:
+    """
+    État complet d'un joueur lu une seule fois par tick (dans le snapshot du
+    listener), comparé champ par champ à l'état du tick précédent.
+    """
+    __slots__ = ("id", "name", "money", "dices", "goto", "position", "properties")
+
+    # Champs comparés, dans l'ordre d'émission des événements (comme les anciens sous-handlers)
+    FIELDS = ("name", "money", "properties", "dices", "goto", "position")
+    EVENTS = {
+        "name": "player_name_changed",
+        "money": "player_money_changed",
+        "properties": "player_properties_changed",
+        "dices": "player_dice_changed",
+        "goto": "player_goto_changed",
+        "position": "player_position_changed",
+    }
+
+    def __init__(self, id: str, name: str, money: int, dices: List[int], goto: int, position: int,
+                 properties: List[dict]):
+        self.id = id
+        self.name = name
+        self.money = money
+        self.dices = dices
+        self.goto = goto
+        self.position = position
+        self.properties = properties
+
+    @staticmethod
+    def read(player: Player) -> "PlayerState":
+        record = player.record
+        return PlayerState(
+            player.id,
+            player.name,
+            player.money,
+            [record.dice1, record.dice2],
+            player.goto,
+            player.position,
+            PlayerState.read_properties(player),
+        )
+
+    @staticmethod
+    def read_properties(player: Player) -> List[dict]:
+        """Propriétés du joueur au format des événements player_properties_changed"""
+        try:
+            # Une lecture groupée et un unpack par enregistrement
+            return [
+                {
+                    "name": record.name,
+                    "position": record.position,
+                    "price": record.price,
+                    "rents": record.rents
+                }
+                for record in player.property_records()
+            ]
+        except Exception:
+            # Les propriétés peuvent ne pas être encore disponibles
+            return []
+
+    def joined(self) -> "PlayerState":
+        """État de référence d'un joueur qui vient d'apparaître : seules ses propriétés seront signalées"""
+        return PlayerState(self.id, self.name, self.money, self.dices, self.goto, self.position, [])
+
+    def changes(self, previous: "PlayerState") -> List[Tuple[str, object, object]]:
+        """(champ, nouvelle valeur, ancienne valeur) des champs modifiés depuis previous"""
+        return [
+            (field, getattr(self, field), getattr(previous, field))
+            for field in PlayerState.FIELDS
+            if getattr(self, field) != getattr(previous, field)
+        ]
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in PlayerState.__slots__}
+
+
+class PlayerStates:
+    """États des joueurs du tick précédent et diff en une passe avec le tick courant"""
+
+    def __init__(self):
+        self.states: Dict[str, PlayerState] = {}
+        # Le relevé des dés suivant une remise à zéro est signalé comme ignoré
+        self.ignore_next_dice: Dict[str, bool] = {}
+
+    def __len__(self):
+        return len(self.states)
+
+    def values(self) -> List[PlayerState]:
+        return list(self.states.values())
+
+    def update(self, players: List[Player]):
+        """
+        Lit l'état de chaque joueur et renvoie (retirés, ajoutés, changements) :
+        les états des joueurs disparus, ceux des joueurs apparus, et la liste
+        ordonnée (événement, état du joueur, arguments) des changements de champs.
+        """
+        read = {player.id: PlayerState.read(player) for player in players}
+        previous = self.states
+
+        removed = [state for player_id, state in previous.items() if player_id not in read]
+        for state in removed:
+            self.ignore_next_dice.pop(state.id, None)
+
+        # Les joueurs restants gardent leur ordre d'arrivée, les nouveaux suivent dans l'ordre du jeu
+        current = {player_id: read[player_id] for player_id in previous if player_id in read}
+        added = []
+        for player_id, state in read.items():
+            if player_id not in current:
+                current[player_id] = state
+                added.append(state)
+                self.ignore_next_dice[player_id] = False
+        self.states = current
+
+        changed: Dict[str, list] = {field: [] for field in PlayerState.FIELDS}
+        for player_id, state in current.items():
+            old = previous.get(player_id)
+            if old is None:
+                old = state.joined()
+            for field, new_value, old_value in state.changes(old):
+                changed[field].append((state, new_value, old_value))
+
+        events = []
+        for field in PlayerState.FIELDS:
+            for state, new_value, old_value in changed[field]:
+                if field != "dices":
+                    events.append((PlayerState.EVENTS[field], state, (new_value, old_value)))
+                    continue
+                if new_value == [0, 0]:
+                    self.ignore_next_dice[state.id] = True
+                    continue
+                ignored = self.ignore_next_dice[state.id]
+                self.ignore_next_dice[state.id] = not ignored
+                events.append((PlayerState.EVENTS[field], state, (new_value, old_value, ignored)))
+        return removed, added, events
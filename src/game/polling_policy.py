@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+from .listeners import MonopolyListeners
+
+class PollingPolicy:
+    """
+    Fréquence de lecture adaptée à la phase de jeu pour MonopolyListeners.
+
+    Chaque handler (player, message, auction) a un intervalle "normal" et un
+    intervalle "idle", player et auction aussi un intervalle "fast". Les enchères
+    passent en "fast" tant que Auction.status == 1 (lu dans le snapshot du
+    handler), les joueurs pendant fast_ticks passages après un changement de dés ;
+    un handler dont rien n'a changé pendant idle_ticks passages ralentit à "idle",
+    et revient à "normal" au premier changement. L'intervalle "idle" des enchères
+    reste court pour ne pas manquer leur début. Configuration : section "polling"
+    de monitor_config.json.
+
+    La politique observe les événements avec watch() : elle est appelée dans le
+    thread des handlers, avant la file des événements et les lots regroupés.
+    """
+
+    DEFAULTS = {
+        "enabled": True,
+        "idle_ticks": 20,
+        "player": {"normal": 1, "fast": 0.1, "idle": 2, "fast_ticks": 30},
+        "message": {"normal": 1, "idle": 2},
+        "auction": {"normal": 0.25, "fast": 0.05, "idle": 0.5},
+    }
+
+    # Handlers dont l'intervalle est adapté
+    ADAPTIVE = ("player", "message", "auction")
+
+    # Événements qui signalent un changement pour chaque handler (les *_handling sont émis à chaque passage)
+    CHANGES = {
+        "player": ("player_added", "player_removed", "player_money_changed", "player_name_changed",
+                   "player_dice_changed", "player_goto_changed", "player_position_changed",
+                   "player_properties_changed", "property_mortgage_changed"),
+        "message": ("message_added", "message_removed"),
+        "auction": ("auction_started", "auction_ended", "auction_bid"),
+    }
+
+    def __init__(self, config: Optional[dict] = None):
+        config = config or {}
+        self.enabled = config.get("enabled", PollingPolicy.DEFAULTS["enabled"])
+        self.idle_ticks = int(config.get("idle_ticks", PollingPolicy.DEFAULTS["idle_ticks"]))
+        self.rates: Dict[str, dict] = {
+            name: {**PollingPolicy.DEFAULTS[name], **config.get(name, {})}
+            for name in PollingPolicy.ADAPTIVE
+        }
+        self.listeners: Optional[MonopolyListeners] = None
+        # Mode courant de chaque handler : "normal", "fast" ou "idle"
+        self.modes: Dict[str, str] = {}
+        # Passages consécutifs sans changement
+        self._quiet = dict.fromkeys(PollingPolicy.ADAPTIVE, 0)
+        # Passages restants en mode rapide (joueurs)
+        self._fast_left = 0
+        self._event_handlers = {
+            event: name for name, events in PollingPolicy.CHANGES.items() for event in events
+        }
+        # Les handlers émettent depuis plusieurs threads (AsyncMonopolyListeners)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def load(path: str = "monitor_config.json") -> "PollingPolicy":
+        """Politique définie par la section "polling" du fichier (valeurs par défaut sinon)"""
+        config = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    config = json.load(f).get("polling", {})
+            except Exception as e:
+                print(f"❌ Erreur lors du chargement de {path}: {e}")
+        return PollingPolicy(config)
+
+    def attach(self, listeners: MonopolyListeners) -> "PollingPolicy":
+        """Applique la politique aux listeners (avant ou après start())"""
+        if not self.enabled:
+            return self
+        self.listeners = listeners
+        with self._lock:
+            for name in PollingPolicy.ADAPTIVE:
+                self._set_mode(name, "normal")
+        listeners.watch(self._on_event)
+        return self
+
+    def detach(self) -> None:
+        if self.listeners is not None:
+            self.listeners.unwatch(self._on_event)
+            self.listeners = None
+
+    def _set_mode(self, name: str, mode: str) -> None:
+        if self.modes.get(name) == mode:
+            return
+        self.modes[name] = mode
+        self.listeners.set_interval(name, float(self.rates[name][mode]))
+
+    def _on_event(self, event_name: str, *args, **kwargs) -> None:
+        with self._lock:
+            if event_name == "auction_handling":
+                self._auction_tick(args[0] if args else None)
+            elif event_name.endswith("_handling"):
+                name = event_name[:-len("_handling")]
+                if name in self._quiet:
+                    self._tick(name)
+            else:
+                self._changed(event_name)
+
+    def _changed(self, event_name: str) -> None:
+        name = self._event_handlers.get(event_name)
+        if name is None:
+            return
+        self._quiet[name] = 0
+        if event_name == "player_dice_changed":
+            self._fast_left = int(self.rates["player"].get("fast_ticks", 0))
+            self._set_mode("player", "fast")
+        elif self.modes.get(name) == "idle":
+            self._set_mode(name, "normal")
+
+    def _tick(self, name: str) -> None:
+        """Passage d'un handler, appelé avant les événements de changement qu'il émet"""
+        self._quiet[name] += 1
+        mode = self.modes.get(name)
+        if name == "player" and mode == "fast":
+            self._fast_left -= 1
+            if self._fast_left <= 0:
+                self._set_mode("player", "normal")
+            return
+        if mode != "idle" and self._quiet[name] >= self.idle_ticks:
+            self._set_mode(name, "idle")
+
+    def _auction_tick(self, auction) -> None:
+        """Passage du handler des enchères : mode rapide tant que l'enchère lue est ouverte"""
+        if auction is not None and auction.is_active():
+            self._quiet["auction"] = 0
+            self._set_mode("auction", "fast")
+            return
+        if self.modes.get("auction") == "fast":
+            # Enchère terminée : retour au rythme normal avant de ralentir
+            self._quiet["auction"] = 0
+            self._set_mode("auction", "normal")
+            return
+        self._tick("auction")
@@ -1,91 +1,72 @@
+from src.core.buildings_index import BuildingsIndex
 from src.core.property import Property
 from src.core.memory_reader import MemoryReader
-import dolphin_memory_engine as dme
-import json
-import os
+
+# Octet du joueur actuel (0 -> player2, 1 -> player1)
+CURRENT_PLAYER_ADDRESS = 0x9303A314
 
 def get_all_properties_house_count():
-    """Récupère le nombre de maisons pour toutes les propriétés"""
-    config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'game_files', 'starting_state.jsonc')
+    """Récupère le nombre de maisons pour toutes les propriétés, en une seule lecture de la RAM
     
+    Returns:
+        Un dict libellé -> nombre de maisons, à passer en counts aux fonctions ci-dessous
+        pour les servir toutes depuis le même relevé
+    """
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            # Enlever les commentaires du JSONC
-            content = f.read()
-            lines = content.split('\n')
-            cleaned_lines = []
-            for line in lines:
-                # Enlever les commentaires de type //
-                comment_pos = line.find('//')
-                if comment_pos != -1:
-                    line = line[:comment_pos]
-                cleaned_lines.append(line)
-            
-            cleaned_content = '\n'.join(cleaned_lines)
-            data = json.loads(cleaned_content)
-        
-        # Récupérer toutes les adresses des propriétés
-        house_addresses = data.get('house_number_by_property', [])
-        
-        property_houses = {}
-        for prop in house_addresses:
-            address = prop['address']
-            label = prop['label']
-            # Lire le nombre de maisons à cette adresse
-            house_count = MemoryReader.get_byte(address)
-            property_houses[label] = house_count
-        
-        return property_houses
-        
+        return BuildingsIndex.load().read()
     except Exception as e:
         print(f"Erreur lors de la lecture des nombres de maisons: {e}")
         return {}
 
-def get_property_house_count(property_name):
+def get_property_house_count(property_name, counts=None):
     """Récupère le nombre de maisons pour une propriété spécifique
     
     Args:
         property_name: Le nom de la propriété (ex: "Old Kent Road")
+        counts: Relevé de get_all_properties_house_count (lu en RAM si absent)
     
     Returns:
         Le nombre de maisons (0-5, où 5 = hôtel) ou None si non trouvé
     """
-    return Property.get_house_count_for_property(property_name)
+    return Property.get_house_count_for_property(property_name, counts)
 
-def has_hotel(property_name):
+def has_hotel(property_name, counts=None):
     """Vérifie si une propriété a un hôtel
     
     Args:
         property_name: Le nom de la propriété
+        counts: Relevé de get_all_properties_house_count (lu en RAM si absent)
     
     Returns:
         True si la propriété a un hôtel (5 maisons), False sinon
     """
-    house_count = get_property_house_count(property_name)
-    return house_count == 5 if house_count is not None else False
+    house_count = get_property_house_count(property_name, counts)
+    return house_count == BuildingsIndex.HOTEL if house_count is not None else False
 
-def can_build_house(property_name):
+def can_build_house(property_name, counts=None):
     """Vérifie si on peut construire une maison sur cette propriété
     
     Args:
         property_name: Le nom de la propriété
+        counts: Relevé de get_all_properties_house_count (lu en RAM si absent)
     
     Returns:
         True si on peut construire (moins de 4 maisons), False sinon
     """
-    house_count = get_property_house_count(property_name)
+    house_count = get_property_house_count(property_name, counts)
     return house_count is not None and house_count < 4
 
-def can_build_hotel(property_name):
+def can_build_hotel(property_name, counts=None):
     """Vérifie si on peut construire un hôtel sur cette propriété
     
     Args:
         property_name: Le nom de la propriété
+        counts: Relevé de get_all_properties_house_count (lu en RAM si absent)
     
     Returns:
         True si on peut construire un hôtel (exactement 4 maisons), False sinon
     """
-    house_count = get_property_house_count(property_name)
+    house_count = get_property_house_count(property_name, counts)
     return house_count == 4
 
 def get_current_player_from_ram():
@@ -96,7 +77,7 @@ def get_current_player_from_ram():
              None si la lecture échoue
     """
     try:
-        current_player_byte = dme.read_byte(0x9303A314)
+        current_player_byte = MemoryReader.get_byte(CURRENT_PLAYER_ADDRESS)
         # Si 0 -> player2, si 1 -> player1
         if current_player_byte == 0:
             return 'player2'
@@ -114,12 +95,15 @@ def get_current_player_index_from_ram():
              None si la lecture échoue
     """
     try:
-        current_player_byte = dme.read_byte(0x9303A314)
-        # Si 0 -> player2 (index 1), si 1 -> player1 (index 0)
-        if current_player_byte == 0:
-            return 1  # player2
-        else:
-            return 0  # player1
+        return current_player_index_from_byte(MemoryReader.get_byte(CURRENT_PLAYER_ADDRESS))
     except Exception as e:
         print(f"⚠️ Impossible de lire le current player index depuis la RAM: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def current_player_index_from_byte(current_player_byte):
+    """Convertit l'octet du joueur actuel en index (0 pour player1, 1 pour player2)"""
+    # Si 0 -> player2 (index 1), si 1 -> player1 (index 0)
+    if current_player_byte == 0:
+        return 1  # player2
+    else:
+        return 0  # player1
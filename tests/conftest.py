@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Les tests importent les modules du dépôt (src.core, src.game) depuis la racine
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
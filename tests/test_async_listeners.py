@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+
+from src.game.async_listeners import AsyncMonopolyListeners
+
+
+class FakeSession:
+    connected = True
+
+
+class FakeGame:
+    session = FakeSession()
+
+
+class FakeListeners(AsyncMonopolyListeners):
+    """Handlers remplacés : player échoue toujours, auction bloque sur gate, message compte"""
+    interval_player = 0.01
+    interval_message = 0.01
+    interval_auction = 0.01
+
+    def __init__(self):
+        super().__init__(FakeGame())
+        self.messages = 0
+        self.gate = threading.Event()
+        self.auction_started = threading.Event()
+        self.auction_done = False
+
+    def player_handler(self):
+        raise RuntimeError("lecture impossible")
+
+    def message_handler(self):
+        self.messages += 1
+
+    def auction_handler(self):
+        self.auction_started.set()
+        self.gate.wait(5)
+        time.sleep(0.05)
+        self.auction_done = True
+        self.emit("auction_read")
+
+
+def test_failing_handler_does_not_stop_the_others(capsys):
+    async def scenario():
+        listeners = FakeListeners()
+        listeners.gate.set()
+        listeners.start()
+        await asyncio.sleep(0.2)
+        running = not listeners._task.done()
+        await listeners.stop()
+        return listeners, running
+
+    listeners, running = asyncio.run(scenario())
+    assert running
+    assert listeners.messages > 3
+    assert "lecture impossible" in capsys.readouterr().err
+
+
+def test_stop_waits_for_the_handler_running_in_its_thread():
+    async def scenario():
+        listeners = FakeListeners()
+        listeners.start()
+        await asyncio.to_thread(listeners.auction_started.wait, 5)
+        threading.Timer(0.05, listeners.gate.set).start()
+        await listeners.stop()
+        # Aucun événement ne peut plus être émis après stop()
+        return listeners.auction_done
+
+    assert asyncio.run(scenario())
@@ -0,0 +1,153 @@
+import threading
+import time
+
+from src.core.listeners import EventListeners
+
+
+class PeriodicListeners(EventListeners):
+    PERIODIC_EVENTS = frozenset(("tick",))
+
+
+def blocked_consumer(listeners, event_name="changed"):
+    """Callback bloqué jusqu'à gate.set() ; renvoie (gate, valeurs reçues)"""
+    gate = threading.Event()
+    received = []
+
+    def callback(value):
+        gate.wait(5)
+        received.append(value)
+
+    listeners.on(event_name, callback)
+    return gate, received
+
+
+def test_full_queue_never_blocks_emit_nor_drops_changes():
+    listeners = PeriodicListeners()
+    gate, received = blocked_consumer(listeners)
+    listeners.start_dispatcher(queue_size=2)
+    start = time.perf_counter()
+    for i in range(50):
+        listeners.emit("changed", i)
+        listeners.emit("tick")
+    elapsed = time.perf_counter() - start
+    gate.set()
+    listeners.flush()
+    listeners.stop_dispatcher()
+
+    assert elapsed < 1.0
+    assert received == list(range(50))
+    stats = listeners.dispatch_stats()
+    assert stats["dropped"] > 0
+    assert stats["max_depth"] > 2
+
+
+def test_periodic_events_are_kept_while_queue_has_room():
+    listeners = PeriodicListeners()
+    ticks = []
+    listeners.on("tick", lambda: ticks.append(1))
+    listeners.start_dispatcher(queue_size=100)
+    for _ in range(10):
+        listeners.emit("tick")
+    listeners.flush()
+    listeners.stop_dispatcher()
+    assert len(ticks) == 10
+    assert listeners.dispatch_stats()["dropped"] == 0
+
+
+def test_flush_waits_for_queued_events():
+    listeners = EventListeners()
+    received = []
+
+    def slow(value):
+        time.sleep(0.01)
+        received.append(value)
+
+    listeners.on("changed", slow)
+    listeners.start_dispatcher()
+    for i in range(20):
+        listeners.emit("changed", i)
+    listeners.flush()
+    assert received == list(range(20))
+    listeners.stop_dispatcher()
+
+
+def test_stop_dispatcher_keeps_order_of_events_emitted_while_draining():
+    listeners = EventListeners()
+    gate, received = blocked_consumer(listeners)
+    listeners.start_dispatcher()
+    for i in range(5):
+        listeners.emit("changed", i)
+
+    stopper = threading.Thread(target=listeners.stop_dispatcher)
+    stopper.start()
+    time.sleep(0.05)
+    # Émis pendant l'arrêt : traités après les événements déjà en file
+    for i in range(5, 10):
+        listeners.emit("changed", i)
+    gate.set()
+    stopper.join(5)
+    listeners.emit("changed", 10)
+
+    assert not stopper.is_alive()
+    assert received == list(range(11))
+
+
+def test_events_of_one_type_keep_their_order_across_workers():
+    listeners = EventListeners()
+    received = {"a": [], "b": [], "c": []}
+    for name in received:
+        listeners.on(name, received[name].append)
+    listeners.start_dispatcher(workers=3)
+    for i in range(200):
+        for name in received:
+            listeners.emit(name, i)
+    listeners.flush()
+    listeners.stop_dispatcher()
+    assert all(values == list(range(200)) for values in received.values())
+
+
+def test_batch_ends_even_when_batch_started_callback_fails():
+    listeners = EventListeners()
+    received = []
+
+    def fail(size):
+        raise RuntimeError("batch_started")
+
+    listeners.on("batch_started", fail)
+    listeners.on("changed", received.append)
+    listeners.on("batch_ended", lambda events: received.append(("ended", len(events))))
+    listeners.start_coalescing(60, ["changed"])
+    listeners.emit("changed", 1)
+    listeners.emit("changed", 2)
+    listeners.flush()
+    assert received == [1, 2, ("ended", 2)]
+
+
+def test_batch_is_dispatched_before_a_later_event():
+    for workers in (None, 1):
+        listeners = EventListeners()
+        received = []
+        listeners.on("*", lambda event_name, *args: received.append(event_name))
+        if workers:
+            listeners.start_dispatcher(workers)
+        listeners.start_coalescing(60, ["changed"])
+        listeners.emit("changed")
+        listeners.emit("other")
+        listeners.flush()
+        listeners.stop_dispatcher()
+        assert received == ["batch_started", "changed", "batch_ended", "other"]
+
+
+def test_coalesced_types_keep_their_order_with_several_workers():
+    listeners = EventListeners()
+    received = []
+    listeners.on("changed", received.append)
+    listeners.start_dispatcher(workers=4)
+    listeners.start_coalescing(60, ["changed"])
+    listeners.emit("changed", 0)
+    listeners.stop_coalescing()
+    # Plus regroupé : traité par le même worker que le lot, donc après lui
+    listeners.emit("changed", 1)
+    listeners.flush()
+    listeners.stop_dispatcher()
+    assert received == [0, 1]
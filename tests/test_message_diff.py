@@ -0,0 +1,87 @@
+import random
+
+from src.core.message_finder import MessageFinder
+from src.game.listeners import MonopolyListeners
+
+
+class FakeSession:
+    connected = True
+
+
+class FakeGame:
+    session = FakeSession()
+
+
+class ListDiff:
+    """Référence : l'ancien message_handler et sa liste de messages trouvés"""
+
+    def __init__(self):
+        self.founds = []
+
+    def update(self, messages):
+        events = []
+        for message in list(self.founds):
+            data = next((m["data"] for m in messages if m["id"] == message["id"]), None)
+            if data is None or not any(d["address"] == message["address"] and d["text"] == message["text"]
+                                       for d in data):
+                self.founds.remove(message)
+                events.append(("message_removed", message["id"], message["text"], message["address"]))
+        for message in messages:
+            for data in message["data"]:
+                if not any(f["id"] == message["id"] and f["address"] == data["address"] and f["text"] == data["text"]
+                           for f in self.founds):
+                    event = {"id": message["id"], "text": data["text"], "address": data["address"],
+                             "group": message.get("group", None)}
+                    self.founds.append(event)
+                    events.append(("message_added", event["id"], event["text"], event["address"], event["group"]))
+        return events
+
+
+def scan(*found):
+    """Résultat de MessageFinder.messages : found est une suite de (id, [(adresse, texte), ...])"""
+    return [{"id": id, "group": f"groupe {id}", "data": [{"address": address, "text": text} for address, text in data]}
+            for id, data in found]
+
+
+def compare(monkeypatch, scans):
+    listeners = MonopolyListeners(FakeGame())
+    received = []
+    listeners.on("message_removed", lambda *args: received.append(("message_removed",) + args))
+    listeners.on("message_added", lambda *args: received.append(("message_added",) + args))
+    reference = ListDiff()
+    for messages in scans:
+        monkeypatch.setattr(MessageFinder, "messages", staticmethod(lambda game, messages=messages: messages))
+        received.clear()
+        listeners.message_handler()
+        assert received == reference.update(messages)
+
+
+def test_removed_in_order_of_addition_and_added_in_scan_order(monkeypatch):
+    compare(monkeypatch, [
+        scan(("owe", [(0x10, "You owe 50")])),
+        # Le nouveau message apparaît avant l'ancien dans le scan
+        scan(("rent", [(0x20, "Rent 12")]), ("owe", [(0x10, "You owe 50")])),
+        scan(("rent", [(0x20, "Rent 12"), (0x30, "Rent 14")]), ("owe", [(0x10, "You owe 50")])),
+        # Tous retirés : dans l'ordre où ils avaient été ajoutés
+        scan(),
+        # Même texte à une autre adresse, et même adresse avec un autre texte
+        scan(("owe", [(0x10, "You owe 50"), (0x40, "You owe 50")])),
+        scan(("owe", [(0x10, "You owe 75"), (0x40, "You owe 50")])),
+    ])
+
+
+def test_duplicates_in_a_scan_are_reported_once(monkeypatch):
+    compare(monkeypatch, [
+        scan(("owe", [(0x10, "You owe 50"), (0x10, "You owe 50")])),
+        scan(("owe", [(0x10, "You owe 50")])),
+    ])
+
+
+def test_random_scans_emit_the_same_events(monkeypatch):
+    rng = random.Random(13)
+    pool = [(0x100 * i, text) for i in range(6) for text in ("A", "B")]
+    scans = []
+    for _ in range(300):
+        ids = rng.sample(["owe", "rent", "auction", "trade"], rng.randint(0, 4))
+        scans.append(scan(*((id, rng.sample(pool, rng.randint(1, 3))) for id in ids)))
+    compare(monkeypatch, scans)
@@ -0,0 +1,150 @@
+import random
+
+from src.game.player_state import PlayerStates
+
+
+class FakeRecord:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+class FakePlayer:
+    """Joueur lu par PlayerState.read, figé sur l'état d'un tick enregistré"""
+
+    def __init__(self, id, name, money, dices, goto, position, properties):
+        self.id = id
+        self.name = name
+        self.money = money
+        self.dices = list(dices)
+        self.goto = goto
+        self.position = position
+        self.record = FakeRecord(dice1=dices[0], dice2=dices[1])
+        self._properties = properties
+
+    def property_records(self):
+        return [FakeRecord(name=name, position=position, price=100, rents=[position])
+                for name, position in self._properties]
+
+    @property
+    def property_dicts(self):
+        return [{"name": record.name, "position": record.position, "price": record.price, "rents": record.rents}
+                for record in self.property_records()]
+
+
+class PerAttributeDiff:
+    """
+    Référence : l'ancien player_handler et ses sous-handlers par attribut
+    (player_name_handler, player_money_handler, ...), sur des joueurs en dict.
+    """
+
+    def __init__(self):
+        self.players = []
+
+    def update(self, game_players):
+        by_id = {player.id: player for player in game_players}
+        events = []
+        for player in list(self.players):
+            if player["id"] not in by_id:
+                self.players.remove(player)
+                events.append(("player_removed", player["id"], ()))
+        for player in game_players:
+            if not any(known["id"] == player.id for known in self.players):
+                self.players.append({
+                    "id": player.id, "name": player.name, "money": player.money, "dices": player.dices,
+                    "ignore_next_dice": False, "goto": player.goto, "position": player.position,
+                    "properties": []
+                })
+                events.append(("player_added", player.id, ()))
+        for field, event in (("name", "player_name_changed"), ("money", "player_money_changed"),
+                             ("properties", "player_properties_changed"), ("dices", "player_dice_changed"),
+                             ("goto", "player_goto_changed"), ("position", "player_position_changed")):
+            for player in self.players:
+                game_player = by_id[player["id"]]
+                old = player[field]
+                new = game_player.property_dicts if field == "properties" else getattr(game_player, field)
+                if old == new:
+                    continue
+                player[field] = new
+                if field != "dices":
+                    events.append((event, player["id"], (new, old)))
+                elif new == [0, 0]:
+                    player["ignore_next_dice"] = True
+                elif player["ignore_next_dice"]:
+                    player["ignore_next_dice"] = False
+                    events.append((event, player["id"], (new, old, True)))
+                else:
+                    player["ignore_next_dice"] = True
+                    events.append((event, player["id"], (new, old, False)))
+        return events
+
+
+def state_events(states, players):
+    removed, added, changes = states.update(players)
+    events = [("player_removed", state.id, ()) for state in removed]
+    events += [("player_added", state.id, ()) for state in added]
+    events += [(event, state.id, args) for event, state, args in changes]
+    return events
+
+
+def compare(ticks):
+    reference, states = PerAttributeDiff(), PlayerStates()
+    for players in ticks:
+        expected = reference.update(players)
+        assert state_events(states, players) == expected
+    return reference
+
+
+def player(id, money=1500, dices=(0, 0), goto=0, position=0, properties=(), name=None):
+    return FakePlayer(id, name or f"joueur {id}", money, dices, goto, position, list(properties))
+
+
+def test_recorded_turns_emit_the_same_events():
+    ticks = [
+        [player("a"), player("b")],
+        # Lancer de dés, déplacement puis achat
+        [player("a", dices=(3, 4), goto=7), player("b")],
+        [player("a", dices=(3, 4), goto=7, position=7), player("b")],
+        [player("a", money=1400, dices=(3, 4), goto=7, position=7, properties=[("Chance", 7)]), player("b")],
+        # Remise à zéro des dés : le relevé suivant est ignoré, puis le suivant signalé
+        [player("a", money=1400, goto=7, position=7, properties=[("Chance", 7)]), player("b")],
+        [player("a", money=1400, goto=7, position=7, properties=[("Chance", 7)]), player("b", dices=(6, 6))],
+        [player("a", money=1400, dices=(1, 2), goto=10, position=7, properties=[("Chance", 7)]),
+         player("b", dices=(6, 5))],
+        [player("a", money=1400, dices=(2, 2), goto=10, position=10, properties=[("Chance", 7)]),
+         player("b", dices=(6, 5), name="renommé")],
+        # Départ puis retour d'un joueur, et arrivée d'un joueur déjà propriétaire
+        [player("b", dices=(6, 5), name="renommé")],
+        [player("b", dices=(6, 5), name="renommé"), player("a", money=900, properties=[("Gare", 5)]),
+         player("c", dices=(1, 1), properties=[("Rue", 1), ("Avenue", 3)])],
+        [],
+    ]
+    compare(ticks)
+
+
+def test_random_transitions_emit_the_same_events():
+    rng = random.Random(13)
+    ids = ["a", "b", "c", "d"]
+    current = {id: player(id) for id in ids}
+    ticks = []
+    for _ in range(500):
+        for id in ids:
+            if rng.random() < 0.3:
+                old = current[id]
+                current[id] = player(
+                    id,
+                    money=rng.choice([old.money, old.money - 50, 1500]),
+                    dices=rng.choice([tuple(old.dices), (0, 0), (rng.randint(1, 6), rng.randint(1, 6))]),
+                    goto=rng.choice([old.goto, rng.randint(0, 39)]),
+                    position=rng.choice([old.position, old.goto]),
+                    properties=rng.choice([old._properties, old._properties + [("Rue", rng.randint(0, 39))], []]),
+                    name=rng.choice([old.name, old.name, "autre"]),
+                )
+        present = [current[id] for id in ids if rng.random() < 0.9]
+        ticks.append(present)
+    compare(ticks)
+
+
+def test_joined_player_only_reports_its_properties():
+    states = PlayerStates()
+    events = state_events(states, [player("a", money=10, dices=(2, 3), goto=4, properties=[("Rue", 1)])])
+    assert [event for event, _, _ in events] == ["player_added", "player_properties_changed"]
@@ -0,0 +1,33 @@
+from src.game.monopoly import MonopolyGame, PropertyTable
+
+CSV = (b"HybridName,Property,Value,Mortgage,HouseCost,Rent0,Rent1\r\n"
+       b"Property01,Old Kent Road,60,30,50,2,10\r\n"
+       b"Property03,Whitechapel Road,60,30,50,4,20")
+
+
+def game_with_table(monkeypatch):
+    monkeypatch.setattr(MonopolyGame, "property_table", PropertyTable(CSV))
+    return MonopolyGame.__new__(MonopolyGame)
+
+
+def test_properties_are_copies_of_the_cached_table(monkeypatch):
+    game = game_with_table(monkeypatch)
+    properties = game.properties
+    assert [prop["name"] for prop in properties] == ["Old Kent Road", "Whitechapel Road"]
+
+    properties[0]["name"] = "modifié"
+    properties[0]["rents"].append(99)
+    properties.clear()
+
+    again = game.properties
+    assert again[0] == {"id": 1, "name": "Old Kent Road", "price": 60, "mortgage": 30,
+                        "cost": 50, "rents": [2, 10]}
+    assert len(again) == 2
+
+
+def test_lookups_return_copies(monkeypatch):
+    game = game_with_table(monkeypatch)
+    prop = game.get_property_by_id(3)
+    prop["rents"].clear()
+    assert game.get_property_by_name("Whitechapel Road")["rents"] == [4, 20]
+    assert game.get_property_by_id(42) is None